@@ -0,0 +1,379 @@
+"""
+Regression benchmark of the hot paths of the dashboard
+
+Times the functions every rerun goes through (load_data, apply_filters, prepare_summaries,
+score_distribution, the multi-select counts) and the heavier ones behind the detailed charts
+(generate_wordclouds, the VADER scoring of sentiment_dashboard, predict_emotions_hybrid and the
+summarizer) on synthetic surveys of increasing size. Functions kept in the derived cache are
+timed twice: computed from scratch, and answered by the cache as on the next rerun, which passes
+them a newly filtered frame.
+
+The medians can be saved as a JSON baseline and later runs compared to it: the tool exits with
+status 1 when a benchmark is slower than its baseline by more than --threshold, so it can gate
+a change in CI. Baselines are only comparable between runs on the same machine and library versions.
+The model benchmarks are skipped when transformers or the VADER lexicon are not installed.
+
+Usage:
+    python benchmarks/bench_hot_paths.py --sizes 1000 10000 100000 --save-baseline
+    python benchmarks/bench_hot_paths.py --sizes 1000 10000 100000 --threshold 0.25
+"""
+import os
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import tempfile
+import functools
+import statistics
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from modules import dashboard, nlp_models  # noqa: E402
+from modules.count_cube import CountCube  # noqa: E402
+from modules.out_of_core import aggregate_survey  # noqa: E402
+from modules.sql_backend import DuckDbBackend  # noqa: E402
+from modules.survey_store import SurveyStore  # noqa: E402
+from modules.synthetic_survey import make_survey  # noqa: E402
+
+# Memory budget of the out-of-core aggregation, small enough for the larger sizes to be read in several chunks
+OUT_OF_CORE_BUDGET_MB = 64
+# Waves of the survey store the trend benchmark reads, each a copy of the survey of the benchmarked size
+STORE_WAVES = 4
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "hot_paths.json")
+
+ROLE = 'What is your role at the company ?'
+LOCATION = 'Where are you located ?'
+
+# Columns of the survey the pages pass to the benchmarked functions
+SCORE_COLUMNS = [11, 17]
+MULTISELECT_COLUMNS = {9: 'hr_processes', 18: 'reasons'}
+WORDCLOUD_COLUMNS = (13, 14)
+COMMENT_COLUMN = 14
+EMOTION_COLUMNS = [
+    'What could be improved or what kind of format is missing today ?',
+    'In the context of your job, what are the most valuable activities your current HRIS enable you to do?',
+    'In the context of your job, what do your current HRIS fail to address?',
+    'In 3 words, how would you describe your current user-experience with the HRIS ?',
+]
+COMMUNICATION_STOPWORDS = ["communication", "channels", "HR", "information", "important", "informed", "stay",
+                           "communicated", "employees", "company", "help", "communicates", "need", "everyone"]
+
+
+def memoize_resources():
+    # Outside of a Streamlit runtime st.cache_resource keeps nothing, memoize the loaders as the runtime
+    # would so the benchmarks time the calls rather than loading the models and stores on every call
+    for module, name in [(dashboard, 'get_derived_cache'), (dashboard, 'load_comment_grouper'),
+                         (dashboard, 'load_sentiment_analyzer'), (nlp_models, 'load_emotion_models'),
+                         (nlp_models, 'load_summarizer')]:
+        setattr(module, name, functools.lru_cache(maxsize=None)(inspect.unwrap(getattr(module, name))))
+    # Imported by name from the dashboard module
+    nlp_models.load_comment_grouper = dashboard.load_comment_grouper
+
+
+def measure(fn, repeats, setup=None):
+    """
+    Times fn over repeats runs after an untimed warm-up run
+    :param setup: Called untimed before each run, returns the arguments of fn
+    :return: Median and minimum duration in milliseconds
+    """
+    durations = []
+    for i in range(repeats + 1):
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        fn(*args)
+        if i:
+            durations.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(durations), "min_ms": min(durations)}
+
+
+def vader_missing():
+    import nltk
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        return "the VADER lexicon is not installed, run nltk.download('vader_lexicon')"
+    return None
+
+
+def transformers_missing():
+    missing = [name for name in ("transformers", "torch") if importlib.util.find_spec(name) is None]
+    return f"{' and '.join(missing)} not installed" if missing else None
+
+
+def duckdb_missing():
+    return "duckdb not installed" if importlib.util.find_spec("duckdb") is None else None
+
+
+def write_sources(data, directory, xlsx_max_rows):
+    sources = {"csv": os.path.join(directory, "survey.csv"), "parquet": os.path.join(directory, "survey.parquet")}
+    data.to_csv(sources["csv"], index=False)
+    data.to_parquet(sources["parquet"], index=False)
+    if len(data) <= xlsx_max_rows:
+        sources["xlsx"] = os.path.join(directory, "survey.xlsx")
+        data.to_excel(sources["xlsx"], index=False)
+    return sources
+
+
+def survey_benchmarks(data, sources):
+    """
+    :return: Dict of benchmark name to (function, setup or None)
+    """
+    raw = inspect.unwrap
+    roles = list(data[ROLE].unique()[:2])
+    locations = list(data[LOCATION].unique()[:1])
+
+    def clear_figures():
+        plt.close('all')
+        return ()
+
+    def clear_cache():
+        dashboard.get_derived_cache().clear()
+        return clear_figures()
+
+    def filtered():
+        # Every rerun filters the survey again, the frame is versioned by its filters the way setup_page does
+        frame = raw(dashboard.apply_filters)(data, roles, [], locations)
+        dashboard.get_derived_cache().derive_version(frame, data, sorted(map(str, roles)), [],
+                                                     sorted(map(str, locations)))
+        return (frame,)
+
+    benchmarks = {}
+    for extension, path in sources.items():
+        benchmarks[f"load_data[{extension}]"] = (functools.partial(raw(dashboard.load_data), path), None)
+        if extension != "xlsx":
+            benchmarks[f"aggregate_survey[{extension}]"] = (
+                functools.partial(aggregate_survey, path, OUT_OF_CORE_BUDGET_MB * 2 ** 20), None)
+    benchmarks["apply_filters"] = (lambda: raw(dashboard.apply_filters)(data, roles, [], locations), None)
+    benchmarks["prepare_summaries"] = (lambda: raw(dashboard.prepare_summaries)(data), None)
+    benchmarks["prepare_summaries[cached]"] = (dashboard.prepare_summaries, filtered)
+    for column_index in SCORE_COLUMNS:
+        benchmarks[f"score_distribution[{column_index}]"] = (
+            functools.partial(raw(dashboard.score_distribution), data, column_index), None)
+        benchmarks[f"score_distribution[{column_index}][cached]"] = (
+            lambda frame, column_index=column_index: dashboard.score_distribution(frame, column_index), filtered)
+    cube = CountCube.from_data(data)
+    benchmarks["count_cube[build]"] = (functools.partial(CountCube.from_data, data), None)
+    for column_index in SCORE_COLUMNS:
+        benchmarks[f"count_cube.answers[{column_index}]"] = (
+            functools.partial(cube.answers, column_index, roles, (), locations), None)
+    benchmarks["count_cube.breakdown"] = (
+        functools.partial(cube.breakdown, 'location', SCORE_COLUMNS[0], 5, roles, (), locations), None)
+    benchmarks["count_cube.drilldown"] = (
+        functools.partial(cube.drilldown, SCORE_COLUMNS[0], roles, (), locations), None)
+    for column_index, column in MULTISELECT_COLUMNS.items():
+        benchmarks[f"multiselect_counts[{column_index}]"] = (
+            functools.partial(raw(dashboard.multiselect_counts), data, column_index, column), None)
+        benchmarks[f"multiselect_counts[{column_index}][cached]"] = (
+            lambda frame, column_index=column_index, column=column:
+            dashboard.multiselect_counts(frame, column_index, column), filtered)
+    wordclouds = functools.partial(dashboard.generate_wordclouds, data, *WORDCLOUD_COLUMNS, COMMUNICATION_STOPWORDS)
+    benchmarks["generate_wordclouds"] = (wordclouds, clear_cache)
+    benchmarks["generate_wordclouds[cached]"] = (wordclouds, clear_figures)
+    return benchmarks
+
+
+def sql_benchmarks(data, sources):
+    """
+    Queries of the SQL backend over the Parquet export, the counterparts of the count_cube benchmarks
+    :return: Dict of benchmark name to (function, setup or None), and dict of skipped benchmark to reason
+    """
+    reason = duckdb_missing()
+    if reason:
+        return {}, {"sql": reason}
+    backend = DuckDbBackend.from_source(sources["parquet"])
+    roles = list(data[ROLE].unique()[:2])
+    locations = list(data[LOCATION].unique()[:1])
+    benchmarks = {"sql.respondents": (functools.partial(backend.respondents, roles, (), locations), None)}
+    for column_index in SCORE_COLUMNS:
+        benchmarks[f"sql.answers[{column_index}]"] = (
+            functools.partial(backend.answers, column_index, roles, (), locations), None)
+    benchmarks["sql.drilldown"] = (functools.partial(backend.drilldown, SCORE_COLUMNS[0], roles, (), locations), None)
+    for column_index, column in MULTISELECT_COLUMNS.items():
+        benchmarks[f"sql.multiselect_counts[{column_index}]"] = (
+            functools.partial(backend.multiselect_counts, column_index, column, roles, (), locations), None)
+    return benchmarks, {}
+
+
+def store_benchmarks(data, directory):
+    """
+    Trend of a question across the waves of a survey store, and the ingest of one more wave into it
+    :return: Dict of benchmark name to (function, setup or None)
+    """
+    store = SurveyStore(os.path.join(directory, f"store_{len(data)}"))
+    for wave in range(STORE_WAVES):
+        store.ingest(data, f"wave{wave}", f"2026-{wave + 1:02d}-01")
+    roles = list(data[ROLE].unique()[:2])
+    locations = list(data[LOCATION].unique()[:1])
+    return {
+        "survey_store.score_trend": (
+            functools.partial(store.score_trend, SCORE_COLUMNS[0], roles, (), locations), None),
+        # Ingested again on every run, which costs as much as a new wave whatever the waves already stored
+        "survey_store.ingest": (functools.partial(store.ingest, data, "latest", "2026-12-31"), None),
+    }
+
+
+def model_benchmarks(data, model_rows, summarize):
+    """
+    :return: Dict of benchmark name to (function, setup or None), and dict of skipped benchmark to reason
+    """
+    benchmarks, skipped = {}, {}
+    reason = vader_missing()
+    if reason:
+        skipped["score_sentiments"] = reason
+    else:
+        sentences = data.iloc[:, COMMENT_COLUMN].dropna().tolist()
+        benchmarks["score_sentiments"] = (functools.partial(inspect.unwrap(dashboard.score_sentiments), sentences),
+                                          None)
+
+    reason = transformers_missing()
+    if reason:
+        skipped["predict_emotions_hybrid"] = reason
+        if summarize:
+            skipped["summarize"] = reason
+        return benchmarks, skipped
+    # The emotion models change the frame they are given, each run gets a fresh copy
+    comments = data[EMOTION_COLUMNS].head(model_rows)
+    benchmarks["predict_emotions_hybrid"] = (inspect.unwrap(nlp_models.predict_emotions_hybrid),
+                                             lambda: (comments.copy(), EMOTION_COLUMNS))
+    if summarize:
+        summarizer = nlp_models.load_summarizer()
+        if summarizer is None:
+            skipped["summarize"] = "the summarizer model could not be loaded"
+        else:
+            text = ' '.join(data.iloc[:, COMMENT_COLUMN].dropna().head(20))
+            benchmarks["summarize"] = (functools.partial(nlp_models.summarize, summarizer, text), None)
+    return benchmarks, skipped
+
+
+def run(sizes, repeats, model_rows, xlsx_max_rows, only=None):
+    """
+    :param only: Substrings of the benchmarks to run, all of them when empty
+    :return: Dict of "<benchmark>@<rows>" to its timings, and dict of skipped benchmark to reason
+    """
+    results, skipped = {}, {}
+    with tempfile.TemporaryDirectory() as directory:
+        # Results of the [cached] benchmarks go to a throwaway store rather than the cache of the dashboard
+        os.environ['DERIVED_CACHE_URL'] = os.path.join(directory, "derived")
+        memoize_resources()
+        for rows in sizes:
+            data = make_survey(rows)
+            sources = write_sources(data, directory, xlsx_max_rows)
+            benchmarks = survey_benchmarks(data, sources)
+            benchmarks.update(store_benchmarks(data, directory))
+            # The summarizer reads a fixed number of comments, its duration does not depend on the size
+            models, skipped_models = model_benchmarks(data, model_rows, summarize=rows == sizes[0])
+            benchmarks.update(models)
+            skipped.update(skipped_models)
+            sql, skipped_sql = sql_benchmarks(data, sources)
+            benchmarks.update(sql)
+            skipped.update(skipped_sql)
+            for name, (fn, setup) in benchmarks.items():
+                if not selected(name, only):
+                    continue
+                results[f"{name}@{rows}"] = {"benchmark": name, "rows": rows, **measure(fn, repeats, setup)}
+                print(f"{name:<40}{rows:>9}{results[f'{name}@{rows}']['median_ms']:>12.1f}ms", flush=True)
+    return results, {name: reason for name, reason in skipped.items() if selected(name, only)}
+
+
+def selected(name, only):
+    return not only or any(pattern in name for pattern in only)
+
+
+def environment():
+    """
+    What the timings depend on besides the code, a baseline is meaningless on another environment
+    """
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "duckdb": None if duckdb_missing() else importlib.import_module("duckdb").__version__,
+    }
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """
+    :return: Rows of (key, median_ms, baseline median_ms or None, relative change or None, regressed)
+    """
+    rows = []
+    for key, result in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            rows.append((key, result["median_ms"], None, None, False))
+            continue
+        delta = result["median_ms"] - previous["median_ms"]
+        change = delta / previous["median_ms"] if previous["median_ms"] else 0.0
+        # Sub-millisecond benchmarks swing by more than the threshold from one run to the next
+        rows.append((key, result["median_ms"], previous["median_ms"], change,
+                     change > threshold and delta > min_delta_ms))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="Run the benchmarks whose name contains one of these")
+    parser.add_argument("--model-rows", type=int, default=100,
+                        help="Respondents whose comments are run through the emotion models")
+    parser.add_argument("--xlsx-max-rows", type=int, default=10_000,
+                        help="Largest survey load_data reads from Excel, writing the workbook is slow")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON file of the baseline timings")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the timings of this run as baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown of a median over its baseline that fails the run")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Slowdowns smaller than this many milliseconds never fail the run")
+    parser.add_argument("--output", help="Optional JSON file receiving the results")
+    args = parser.parse_args()
+
+    results, skipped = run(args.sizes, args.repeats, args.model_rows, args.xlsx_max_rows, args.only)
+    for name, reason in skipped.items():
+        print(f"Skipped {name}: {reason}")
+    report = {"environment": environment(), "threshold": args.threshold, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": report["environment"], "results": results}, f, indent=2)
+        print(f"\nSaved the baseline of {len(results)} benchmarks to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline to record one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != report["environment"]:
+        print("\nWarning: the baseline was recorded on another environment, "
+              f"{baseline.get('environment')} instead of {report['environment']}")
+    rows = compare(results, baseline, args.threshold, args.min_delta_ms)
+    print(f"\n{'benchmark':<50}{'median':>12}{'baseline':>12}{'change':>10}")
+    for key, median, previous, change, regressed in rows:
+        previous_text = f"{previous:.1f}ms" if previous is not None else "new"
+        change_text = f"{change:+.0%}" if change is not None else ""
+        print(f"{key:<50}{median:>10.1f}ms{previous_text:>12}{change_text:>10}{'  REGRESSION' if regressed else ''}")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks are more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    print(f"\nNo benchmark is more than {args.threshold:.0%} slower than the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
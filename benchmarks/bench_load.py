@@ -0,0 +1,420 @@
+"""
+Concurrent-session load test of the dashboard
+
+Starts `streamlit run src/Home.py` on a local port with a synthetic survey of the requested
+size, then connects N simulated browser sessions to its websocket. Each session follows
+scripts of an HR analyst: switching between all the sections, changing the Role/Function/Location
+filters, picking satisfaction levels, opening detailed charts and running the summarizer. The tool
+reports the rerun throughput, the latency percentiles of each kind of action and the memory
+the server takes per connected session.
+
+Usage:
+    python benchmarks/bench_load.py --sessions 1 5 10 20 --rows 5000 --duration 60
+    python benchmarks/bench_load.py --url http://localhost:8501 --pid 1234 --sessions 10
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import statistics
+import urllib.request
+
+import numpy as np
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from modules.synthetic_survey import write_survey  # noqa: E402
+
+SUMMARY_TEXT = (
+    "The HR portal is hard to navigate and the answers to payroll questions come late. Employees would like "
+    "a single place to find their documents, clearer communication about changes and faster feedback from HR. "
+    "Managers ask for better reporting on absences and a simpler onboarding checklist for new hires."
+)
+
+# Scripts of the simulated analysts, as (action, target, value) steps. Targets are matched against
+# page names and widget labels, satisfaction and comfort dropdowns have no label and are matched on
+# their first option
+SCRIPTS = {
+    "browse": [
+        ("page", "Home", None),
+        ("multiselect", "Select Role", 1),
+        ("page", "Recruiting", None),
+        ("selectbox", "Select a satisfaction level", None),
+        ("page", "Learning", None),
+        ("multiselect", "Select Location", 2),
+    ],
+    "filter": [
+        ("page", "Compensation", None),
+        ("multiselect", "Select Function", 1),
+        ("multiselect", "Select Location", 1),
+        ("multiselect", "Select Role", 0),
+        ("page", "Performance", None),
+        ("selectbox", "Select a comfort level", None),
+    ],
+    "deep_dive": [
+        ("page", "Recruiting", None),
+        ("checkbox", "Show negative reasons", True),
+        ("checkbox", "Show positive reasons", True),
+        ("selectbox", "Select a satisfaction level", None),
+        ("checkbox", "Load detailed charts on demand", False),
+        ("checkbox", "Load detailed charts on demand", True),
+    ],
+    "summarize": [
+        ("page", "Employee", None),
+        ("checkbox", "Show summarization", True),
+        ("text_area", "Enter text for summarization", SUMMARY_TEXT),
+        ("button", "Summarize", None),
+    ],
+    "payroll_time": [
+        ("page", "Payroll", None),
+        ("selectbox", "Select a satisfaction level", None),
+        ("multiselect", "Select Function", 1),
+        ("page", "Time Management", None),
+        ("selectbox", "Select a satisfaction level", None),
+    ],
+    "experience_trends": [
+        ("page", "User Experience", None),
+        ("multiselect", "Select Role", 1),
+        ("checkbox", "Run emotion analysis", True),
+        ("page", "Trends", None),
+        ("selectbox", "Select a rating question", None),
+    ],
+}
+
+# Widget value of each element type in the WidgetState proto
+WIDGET_FIELDS = {
+    "multiselect": "int_array_value",
+    "selectbox": "int_value",
+    "checkbox": "bool_value",
+    "text_area": "string_value",
+    "button": "trigger_value",
+}
+
+
+def process_rss(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+class SessionClient:
+    """
+    One browser session talking to the Streamlit websocket: sends reruns with the current widget
+    values and reads the forward messages until the script run finishes
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.connection = None
+        self.pages = {}
+        self.page_hash = ""
+        self.widgets = {}
+        self.states = {}
+        self.cached_messages = {}
+        self.errors = []
+
+    async def connect(self):
+        ws_url = self.url.replace("http://", "ws://").replace("https://", "wss://").rstrip("/") + "/_stcore/stream"
+        self.connection = await websocket_connect(ws_url, max_message_size=256 * 1024 * 1024)
+        await self.rerun()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+    def _widget_states(self, trigger=None):
+        back = BackMsg()
+        back.rerun_script.page_script_hash = self.page_hash
+        for widget_id, (kind, value) in self.states.items():
+            state = back.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            field = WIDGET_FIELDS[kind]
+            if field == "int_array_value":
+                state.int_array_value.data.extend(value)
+            elif field == "trigger_value":
+                # Buttons are only true for the rerun they triggered
+                state.trigger_value = widget_id == trigger
+            else:
+                setattr(state, field, value)
+        return back
+
+    def _on_element(self, element):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors.append(f"{element.exception.type}: {element.exception.message}"[:200])
+            return
+        if kind not in WIDGET_FIELDS:
+            return
+        widget = getattr(element, kind)
+        options = list(getattr(widget, "options", []))
+        self.widgets[widget.id] = (kind, widget.label, options)
+        if widget.id in self.states:
+            return
+        if kind == "multiselect":
+            value = list(widget.value if widget.set_value else widget.default)
+        elif kind == "button":
+            value = False
+        else:
+            value = widget.value if widget.set_value else widget.default
+        self.states[widget.id] = (kind, value)
+
+    async def rerun(self, trigger=None):
+        """
+        Reruns the script of the current page and waits for it to finish
+        :return: Duration of the rerun in seconds
+        """
+        started = time.perf_counter()
+        self.widgets = {}
+        await self.connection.write_message(self._widget_states(trigger).SerializeToString(), binary=True)
+        while True:
+            payload = await self.connection.read_message()
+            if payload is None:
+                raise ConnectionError("The server closed the session")
+            message = ForwardMsg()
+            message.ParseFromString(payload)
+            if message.ref_hash:
+                # Message the server already sent to this session, replayed from the local copy
+                message = self.cached_messages[message.ref_hash]
+            elif message.hash and message.metadata.cacheable:
+                self.cached_messages[message.hash] = message
+            kind = message.WhichOneof("type")
+            if kind == "new_session":
+                self.pages = {page.page_name: page.page_script_hash for page in message.new_session.app_pages}
+                self.page_hash = message.new_session.page_script_hash
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                self._on_element(message.delta.new_element)
+            elif kind == "script_finished":
+                # Runs cut short by a newer rerun are followed by the run of the newer one
+                if message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+        # Widgets of other pages are not sent back, like the browser does after a page switch
+        self.states = {widget_id: state for widget_id, state in self.states.items() if widget_id in self.widgets}
+        return time.perf_counter() - started
+
+    def find_widget(self, kind, target):
+        for widget_id, (widget_kind, label, options) in self.widgets.items():
+            if widget_kind != kind:
+                continue
+            if target.lower() in label.lower() or (options and options[0] == target):
+                return widget_id, options
+        return None, None
+
+    async def step(self, action, target, value, rng):
+        """
+        Performs one step of a script
+        :return: Duration of the rerun it triggered, None when the page or widget is not there
+        """
+        if action == "page":
+            # Page names keep the underscores of their file names, the app shows them as spaces
+            page_hash = next((page_hash for name, page_hash in self.pages.items()
+                              if target.lower().replace("_", " ") in name.lower().replace("_", " ")), None)
+            if page_hash is None:
+                return None
+            self.page_hash = page_hash
+            return await self.rerun()
+        widget_id, options = self.find_widget(action, target)
+        if widget_id is None:
+            return None
+        if action == "multiselect":
+            chosen = rng.sample(range(len(options)), min(value, len(options)))
+            self.states[widget_id] = (action, sorted(chosen))
+        elif action == "selectbox":
+            self.states[widget_id] = (action, rng.randrange(1, len(options)) if len(options) > 1 else 0)
+        elif action == "button":
+            return await self.rerun(trigger=widget_id)
+        else:
+            self.states[widget_id] = (action, value)
+        return await self.rerun()
+
+
+async def run_session(url, index, deadline, think, seed, results):
+    rng = random.Random(seed + index)
+    client = SessionClient(url)
+    try:
+        started = time.perf_counter()
+        await client.connect()
+        results["timings"].append(("connect", time.perf_counter() - started))
+        names = list(SCRIPTS)
+        while time.monotonic() < deadline:
+            script = rng.choice(names)
+            for action, target, value in SCRIPTS[script]:
+                if time.monotonic() >= deadline:
+                    break
+                await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+                duration = await client.step(action, target, value, rng)
+                if duration is None:
+                    results["skipped"] += 1
+                else:
+                    results["timings"].append((f"{script}:{action}", duration))
+    except Exception as e:
+        results["failures"].append(f"session {index}: {type(e).__name__}: {e}")
+    finally:
+        results["errors"].extend(client.errors)
+        client.close()
+
+
+async def sample_memory(pid, stop, samples):
+    while not stop.is_set():
+        samples.append(process_rss(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_level(url, pid, sessions, duration, think, seed, ramp):
+    results = {"timings": [], "skipped": 0, "errors": [], "failures": []}
+    baseline = process_rss(pid) if pid else 0
+    stop = asyncio.Event()
+    samples = []
+    sampler = asyncio.ensure_future(sample_memory(pid, stop, samples)) if pid else None
+    started = time.perf_counter()
+    deadline = time.monotonic() + duration
+    tasks = []
+    for index in range(sessions):
+        tasks.append(asyncio.ensure_future(run_session(url, index, deadline, think, seed, results)))
+        # Spread the connections, a burst of connections measures the connection handling only
+        await asyncio.sleep(ramp / max(sessions, 1))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if sampler is not None:
+        await sampler
+    return summarize(results, sessions, elapsed, baseline, max(samples, default=0))
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def summarize(results, sessions, elapsed, baseline, peak):
+    reruns = [duration for name, duration in results["timings"] if name != "connect"]
+    by_action = {}
+    for name, duration in results["timings"]:
+        by_action.setdefault(name, []).append(duration)
+    return {
+        "sessions": sessions,
+        "elapsed_s": elapsed,
+        "reruns": len(reruns),
+        "throughput_rps": len(reruns) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(reruns, 50) * 1000,
+        "p90_ms": percentile(reruns, 90) * 1000,
+        "p95_ms": percentile(reruns, 95) * 1000,
+        "p99_ms": percentile(reruns, 99) * 1000,
+        "max_ms": max(reruns, default=0.0) * 1000,
+        "baseline_mb": baseline / 2 ** 20,
+        "peak_mb": peak / 2 ** 20,
+        "mb_per_session": max(peak - baseline, 0) / 2 ** 20 / sessions if peak else 0.0,
+        "skipped_steps": results["skipped"],
+        "script_errors": len(results["errors"]),
+        "error_messages": sorted(set(results["errors"])),
+        "failures": results["failures"],
+        "actions": {name: {"count": len(values), "median_ms": statistics.median(values) * 1000,
+                           "p95_ms": percentile(values, 95) * 1000}
+                    for name, values in sorted(by_action.items())},
+    }
+
+
+def start_server(port, data_path, extra_env=None):
+    env = dict(os.environ, SURVEY_DATA_PATH=data_path, DASHBOARD_METRICS_PORT="off", **(extra_env or {}))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join("src", "Home.py"), "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError("Streamlit exited before serving the app")
+        try:
+            urllib.request.urlopen(f"{url}/_stcore/health", timeout=1)
+            return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Streamlit did not answer its health check")
+
+
+async def warm_up(url):
+    # First run loads the survey and fills the caches, it is not what a new analyst waits for
+    # and a page failing there would fail for every session of the level
+    client = SessionClient(url)
+    try:
+        await client.connect()
+        for name in list(client.pages):
+            await client.step("page", name, None, random.Random(0))
+    finally:
+        client.close()
+    if client.errors:
+        raise RuntimeError("The warm-up run raised " + "; ".join(sorted(set(client.errors))))
+
+
+def print_level(result):
+    print(f"{result['sessions']:>8} {result['reruns']:>7} {result['throughput_rps']:>9.2f} "
+          f"{result['p50_ms']:>8.0f} {result['p90_ms']:>8.0f} {result['p95_ms']:>8.0f} {result['p99_ms']:>8.0f} "
+          f"{result['max_ms']:>8.0f} {result['peak_mb']:>8.0f} {result['mb_per_session']:>8.1f} "
+          f"{result['skipped_steps']:>7} {result['script_errors']:>6} {len(result['failures']):>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--rows", type=int, default=5_000, help="Rows of the synthetic survey")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds each level runs for")
+    parser.add_argument("--think", type=float, default=1.0, help="Average pause between two steps in seconds")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which the sessions connect")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--url", help="Load an already running app instead of starting one")
+    parser.add_argument("--pid", type=int, help="Process of the app given with --url, to measure its memory")
+    parser.add_argument("--output", help="Optional JSON file receiving the results")
+    args = parser.parse_args()
+
+    data_path = None
+    if not args.url:
+        data_path = os.path.join(tempfile.mkdtemp(prefix="survey_load_"), "survey.parquet")
+        write_survey(data_path, args.rows, args.seed)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'rerun/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'peak MB':>8} {'MB/sess':>8} {'skipped':>7} {'errors':>6} {'failed':>6}")
+    results = []
+    for sessions in args.sessions:
+        process = None
+        url, pid = args.url, args.pid
+        if not url:
+            # A fresh server per level, the memory a process once took is rarely given back
+            process, url = start_server(args.port, data_path)
+            pid = process.pid
+        try:
+            asyncio.run(warm_up(url))
+            result = asyncio.run(run_level(url, pid, sessions, args.duration, args.think, args.seed, args.ramp))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+        results.append(result)
+        print_level(result)
+        for failure in result["failures"][:5] + result["error_messages"][:5]:
+            print(f"    {failure}")
+
+    print("\nRerun latency by script step (median / p95 ms) at the highest level:")
+    for name, stats in results[-1]["actions"].items():
+        print(f"    {name:<32} {stats['count']:>6} {stats['median_ms']:>8.0f} {stats['p95_ms']:>8.0f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "duration": args.duration, "think": args.think, "levels": results}, f,
+                      indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Latency benchmark of the PandasAgent path with a local LLM stand-in
+
+Drives PandasAgent.get_agent_response through a scripted set of questions on synthetic
+tables of increasing size and reports the median duration of each stage, so the
+overhead around the LLM call (serialization, output capture, plotting, chat rendering)
+can be measured without an OpenAI endpoint.
+
+Usage:
+    python benchmarks/bench_pandas_agent.py --sizes 1000 10000 100000 --latency 0.05
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from modules.robby_sheet.llm import LocalLLM  # noqa: E402
+from modules.robby_sheet.chat_history import ChatHistoryStore  # noqa: E402
+from modules.robby_sheet.table_tool import PandasAgent  # noqa: E402
+
+# Scripted questions and the code the stand-in answers for each of them
+QUERIES = {
+    "how many respondents": "df.shape[0]",
+    "average satisfaction by location": "df.groupby('location')['satisfaction'].mean()",
+    "plot the number of respondents by role": "df['role'].value_counts().plot(kind='bar')",
+    "which function has the longest tenure": "df.groupby('function')['tenure'].mean().idxmax()",
+}
+
+
+def make_table(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "role": rng.choice(["Manager", "Employee", "Trainee", "Head of Business Unit"], rows),
+        "function": rng.choice(["Operations", "Finance", "HR", "IT", "Sales"], rows),
+        "location": rng.choice(["Europe", "Asia", "North America", "South America", "Africa", "Oceania"], rows),
+        "satisfaction": rng.integers(1, 6, rows),
+        "tenure": rng.gamma(2.0, 2.0, rows).round(1),
+        "comment": rng.choice(["Good communication", "Too long", "Lack of feedback", "Intuitive", ""], rows),
+    })
+
+
+def run(sizes, latency, repeats):
+    llm = LocalLLM(responses=QUERIES, latency=latency, completion_tokens=50)
+    agent = PandasAgent(llm_factory=lambda **params: llm, timeout=60)
+    # Outside of a Streamlit session the history lives in a plain dict
+    agent.chat_history = ChatHistoryStore(state={})
+    results = []
+    for rows in sizes:
+        df = make_table(rows)
+        for query in QUERIES:
+            timings = {}
+            for _ in range(repeats):
+                agent.response_cache.clear()
+                calls = llm.calls
+                agent.get_agent_response(df, query)
+                for stage, seconds in agent.last_timings.items():
+                    timings.setdefault(stage, []).append(seconds)
+                # Subtract the simulated LLM latency to isolate the local overhead of the agent stage
+                overhead = agent.last_timings["agent"] - latency * (llm.calls - calls)
+                timings.setdefault("agent_overhead", []).append(overhead)
+            # Second call on the same question is answered by the response cache
+            agent.get_agent_response(df, query)
+            timings["cached_total"] = [agent.last_timings["total"]]
+
+            started = time.perf_counter()
+            agent.update_chat_history(query, "answer")
+            agent.display_chat_history()
+            timings["chat_render"] = [time.perf_counter() - started]
+
+            results.append({
+                "rows": rows,
+                "query": query,
+                **{stage: statistics.median(values) for stage, values in timings.items()},
+            })
+    return results, llm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per simulated LLM call")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Optional JSON file receiving the results")
+    args = parser.parse_args()
+
+    results, llm = run(args.sizes, args.latency, args.repeats)
+    stages = ["cache_lookup", "prompt", "agent", "agent_overhead", "plot_capture", "chat_render", "total",
+              "cached_total"]
+    print(f"{'rows':>8}  {'query':<40}" + "".join(f"{stage:>15}" for stage in stages))
+    for result in results:
+        print(f"{result['rows']:>8}  {result['query'][:40]:<40}"
+              + "".join(f"{result.get(stage, 0) * 1000:>13.1f}ms" for stage in stages))
+    print(f"\nLLM calls: {llm.calls}, prompt tokens: {llm.prompt_tokens_used}, "
+          f"completion tokens: {llm.completion_tokens_used}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
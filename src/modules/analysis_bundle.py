@@ -0,0 +1,128 @@
+"""
+Analysis bundle: the survey and everything derived from it, computed offline by modules.precompute
+
+A bundle is a directory holding a manifest and Parquet files: the typed survey, the category codes
+of the sidebar filters, the option matrices of the multi-select questions, the Likert histograms
+per segment, the sentiment, emotion and topic of each comment and the word frequencies of the word
+clouds. The dashboard reads it instead of the survey export when SURVEY_BUNDLE_PATH points to it.
+
+Layout:
+    manifest.json               format version, source, rows and the parts of each component
+    data.parquet                typed survey
+    <component>/<part>.parquet  one file per question or per chunk of respondents
+"""
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+# Bumped when the layout of the bundle changes, older bundles have to be rebuilt
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+DATA_FILE = "data.parquet"
+
+FILTER_COLUMNS = ['What is your role at the company ?', 'What function are you part of ?', 'Where are you located ?']
+
+# Positions of the questions of each kind in the survey export, as the pages index them with iloc
+DATE_COLUMNS = [1, 2, 41, 42]
+LIKERT_COLUMNS = [11, 13, 17, 21, 26, 28, 31, 40, 45, 49, 61]
+MULTISELECT_COLUMNS = [9, 10, 12, 18, 19, 20, 22, 23, 24, 25]
+# Single choice questions, most of them Yes/No
+CHOICE_COLUMNS = [15, 16, 30, 32, 33, 34, 36, 37, 39, 43, 44, 46, 47, 48, 50, 51, 52, 54, 55, 56, 57, 58, 59, 60, 62,
+                  63, 64, 65, 67, 68, 71]
+TEXT_COLUMNS = [14, 27, 29, 35, 38, 53, 66, 69, 70, 72]
+# Ratings and the comments explaining them, drawn as high and low score word clouds by generate_wordclouds
+WORDCLOUD_PAIRS = [(13, 14)]
+
+
+class BundleError(Exception):
+    pass
+
+
+class FilterIndex:
+    """
+    Category codes of the sidebar filter columns, so filtering compares small integers instead of strings
+    """
+
+    def __init__(self, codes):
+        """
+        :param codes: DataFrame of the filter columns as categoricals, with the index of the survey
+        """
+        self.codes = codes
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(pd.DataFrame({column: data[column].astype('category') for column in FILTER_COLUMNS},
+                                index=data.index))
+
+    def mask(self, roles, functions, locations):
+        """
+        :return: Boolean array of the respondents matching the selections, an empty selection matches everyone
+        """
+        mask = np.ones(len(self.codes), dtype=bool)
+        for column, values in zip(FILTER_COLUMNS, (roles, functions, locations)):
+            if not len(values):
+                continue
+            series = self.codes[column]
+            wanted = series.cat.categories.get_indexer(list(values))
+            mask &= np.isin(series.cat.codes.to_numpy(), wanted[wanted >= 0])
+        return mask
+
+
+class AnalysisBundle:
+    """
+    Read side of a bundle, the files are only read when first asked for
+    """
+
+    def __init__(self, path):
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise BundleError(f"No analysis bundle at {path}, build one with python -m modules.precompute")
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+            raise BundleError(f"The bundle at {path} has format {self.manifest.get('format_version')} instead of "
+                              f"{BUNDLE_FORMAT_VERSION}, rebuild it with python -m modules.precompute")
+        self._data = None
+        self._filter_index = None
+
+    @property
+    def bundle_id(self):
+        return self.manifest["bundle_id"]
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = pd.read_parquet(os.path.join(self.path, DATA_FILE))
+        return self._data
+
+    @property
+    def filter_index(self):
+        if self._filter_index is None and self.has("filters"):
+            self._filter_index = FilterIndex(self.read("filters"))
+        return self._filter_index
+
+    def has(self, component, part=None):
+        parts = self.manifest["components"].get(component, {}).get("parts", {})
+        return bool(parts) if part is None else str(part) in parts
+
+    def parts(self, component):
+        return list(self.manifest["components"].get(component, {}).get("parts", {}))
+
+    def read(self, component, part=None):
+        """
+        Reads one part of a component, or all of them concatenated along the axis the component is split on
+        """
+        if not self.has(component, part):
+            raise BundleError(f"The bundle at {self.path} has no {component}{'' if part is None else '/' + str(part)}")
+        entry = self.manifest["components"][component]
+        if part is not None:
+            return pd.read_parquet(os.path.join(self.path, entry["parts"][str(part)]))
+        frames = [pd.read_parquet(os.path.join(self.path, file)) for file in entry["parts"].values()]
+        if len(frames) == 1:
+            return frames[0]
+        if entry.get("axis") is None:
+            raise BundleError(f"The parts of {component} are separate tables, read them one at a time")
+        return pd.concat(frames, axis=entry["axis"])
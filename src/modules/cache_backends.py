@@ -0,0 +1,473 @@
+import os
+import ssl
+import time
+import uuid
+import socket
+import select
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlparse
+
+# Keys of the shared stores are "<name>:<code version>:<content hash>", so entries of an old
+# version of a function can be found and dropped without reading them
+
+
+def split_key(key):
+    """
+    :return: Tuple of (name, code version) of a key
+    """
+    name, version, _ = key.rsplit(":", 2)
+    return name, version
+
+
+class SqliteStore:
+    """
+    Byte values in a single SQLite file, evicting the least recently read entries above a size budget.
+    Shared by the processes of one host, not by replicas on different hosts
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        """
+        :param path: SQLite database file, created with its folder when missing
+        :param max_bytes: Maximum total size of the stored values
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS derived_entries (key TEXT PRIMARY KEY, name TEXT, code_version TEXT, "
+            "value BLOB, size INTEGER, created REAL, accessed REAL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS derived_locks (key TEXT PRIMARY KEY, token TEXT, expires REAL)")
+        self._connection.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM derived_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE derived_entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+            return bytes(row[0])
+
+    def put(self, key, value):
+        name, version = split_key(key)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO derived_entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, name, version, sqlite3.Binary(value), len(value), now, now))
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM derived_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._connection.execute(
+                "SELECT key, size FROM derived_entries ORDER BY accessed").fetchall():
+            self._connection.execute("DELETE FROM derived_entries WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def acquire(self, key, ttl):
+        """
+        Takes the compute lock of a key for ttl seconds
+        :return: Token to release the lock with, None when another process holds it
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._connection.execute("DELETE FROM derived_locks WHERE key = ? AND expires < ?", (key, now))
+            cursor = self._connection.execute("INSERT OR IGNORE INTO derived_locks VALUES (?, ?, ?)",
+                                              (key, token, now + ttl))
+            self._connection.commit()
+        return token if cursor.rowcount == 1 else None
+
+    def release(self, key, token):
+        with self._lock:
+            self._connection.execute("DELETE FROM derived_locks WHERE key = ? AND token = ?", (key, token))
+            self._connection.commit()
+
+    def purge(self, name, keep_code_version):
+        """
+        Drops the entries of a function computed by another version of its code
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM derived_entries WHERE name = ? AND code_version != ?",
+                                     (name, keep_code_version))
+            self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM derived_entries")
+            self._connection.commit()
+
+
+class FileStore:
+    """
+    Byte values as files of a directory, meant to be a volume mounted by every replica.
+    Files are written to a temporary name then renamed so readers never see a partial value,
+    and the least recently read files are evicted above a size budget
+    """
+
+    def __init__(self, path, max_bytes=1024 * 1024 * 1024, scan_interval=300):
+        """
+        :param path: Shared directory, created when missing
+        :param max_bytes: Maximum total size of the stored values
+        :param scan_interval: Seconds between two scans of the directory size, other replicas write to it as well
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.scan_interval = scan_interval
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._written = 0
+        self._last_scan = 0.0
+        os.makedirs(os.path.join(self.path, "locks"), exist_ok=True)
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _name_dir(self, name):
+        # Qualified names may hold characters that are not valid in file names
+        return os.path.join(self.path, "entries", self._digest(name)[:24])
+
+    def _file_path(self, key):
+        name, version = split_key(key)
+        return os.path.join(self._name_dir(name), version, f"{self._digest(key)}.bin")
+
+    def _lock_path(self, key):
+        return os.path.join(self.path, "locks", f"{self._digest(key)}.lock")
+
+    def get(self, key):
+        file_path = self._file_path(key)
+        try:
+            with open(file_path, "rb") as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            # The modification time orders the eviction, reading an entry marks it as recently used
+            os.utime(file_path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        file_path = self._file_path(key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(value)
+        os.replace(temp_path, file_path)
+        with self._lock:
+            self._written += len(value)
+            due = (self._written > self.max_bytes // 20
+                   or time.time() - self._last_scan > self.scan_interval)
+            if due:
+                self._written = 0
+                self._last_scan = time.time()
+        if due:
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        for directory, _, file_names in os.walk(os.path.join(self.path, "entries")):
+            for file_name in file_names:
+                if not file_name.endswith(".bin"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(directory, file_name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(directory, file_name)))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, file_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(file_path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def acquire(self, key, ttl):
+        """
+        Takes the compute lock of a key for ttl seconds by creating its lock file exclusively
+        :return: Token to release the lock with, None when another replica holds it
+        """
+        lock_path = self._lock_path(key)
+        token = uuid.uuid4().hex
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    expired = time.time() - os.path.getmtime(lock_path) > ttl
+                except FileNotFoundError:
+                    continue
+                if not expired:
+                    return None
+                # The replica holding the lock died or hung, take over its lock
+                try:
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(token)
+            return token
+        return None
+
+    def release(self, key, token):
+        lock_path = self._lock_path(key)
+        try:
+            with open(lock_path) as f:
+                owned = f.read() == token
+            if owned:
+                os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+    def purge(self, name, keep_code_version):
+        """
+        Drops the entries of a function computed by another version of its code
+        """
+        name_dir = self._name_dir(name)
+        if not os.path.isdir(name_dir):
+            return
+        for version in os.listdir(name_dir):
+            if version == keep_code_version:
+                continue
+            version_dir = os.path.join(name_dir, version)
+            for file_name in os.listdir(version_dir):
+                try:
+                    os.remove(os.path.join(version_dir, file_name))
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(version_dir)
+            except OSError:
+                # Another replica is still writing an entry of that version
+                pass
+
+    def clear(self):
+        for _, _, file_path in self._entries():
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+
+class RespError(Exception):
+    """
+    Error reply of a Redis-protocol server
+    """
+
+
+class RespClient:
+    """
+    Minimal client of the Redis serialization protocol (RESP2), enough for the commands of RedisStore
+    """
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=5.0, ssl_context=None):
+        """
+        :param ssl_context: SSL context of a server expecting TLS, None for a plain connection
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._socket = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        if self.ssl_context is not None:
+            # The handshake happens before AUTH, neither the password nor the entries travel in clear
+            self._socket = self.ssl_context.wrap_socket(self._socket, server_hostname=self.host)
+        self._reader = self._socket.makefile("rb")
+        if self.password:
+            self._call("AUTH", self.password)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def close(self):
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+        self._socket = None
+        self._reader = None
+
+    @staticmethod
+    def _encode(args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(f"${len(arg)}\r\n".encode() + arg + b"\r\n")
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise RespError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply from the cache server: {line!r}")
+
+    def _call(self, *args):
+        self._socket.sendall(self._encode(args))
+        return self._read_reply()
+
+    def _stale(self):
+        # A server closing an idle connection leaves it readable while no reply is expected
+        return bool(select.select([self._socket], [], [], 0)[0])
+
+    def execute(self, *args):
+        """
+        Sends one command and returns its reply. The connection is opened again once when it fails before
+        the command is sent, a command sent in part or in full may have been applied and is never sent twice
+        """
+        with self._lock:
+            for attempt in range(2):
+                sending = False
+                try:
+                    if self._socket is not None and self._stale():
+                        self.close()
+                    if self._socket is None:
+                        self._connect()
+                    sending = True
+                    return self._call(*args)
+                except (ConnectionError, socket.timeout, OSError):
+                    self.close()
+                    if attempt or sending:
+                        raise
+
+
+class RedisStore:
+    """
+    Byte values in a Redis-protocol server shared by every replica. Eviction is left to the
+    server (maxmemory-policy allkeys-lru), entries can also be given a time to live
+    """
+
+    def __init__(self, client, prefix="survey:", ttl=None):
+        """
+        :param client: RespClient connected to the server
+        :param prefix: Prefix of every key, so several dashboards can share a server
+        :param ttl: Seconds an entry is kept, None to keep it until the server evicts it
+        """
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """
+        :param url: redis://[:password@]host[:port][/db], or rediss:// for a server expecting TLS
+        """
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        ssl_context = ssl.create_default_context() if parsed.scheme == "rediss" else None
+        client = RespClient(parsed.hostname or "localhost", parsed.port or 6379, db=db, password=parsed.password,
+                            ssl_context=ssl_context)
+        return cls(client, **kwargs)
+
+    def get(self, key):
+        return self.client.execute("GET", f"{self.prefix}entry:{key}")
+
+    def put(self, key, value):
+        if self.ttl:
+            self.client.execute("SET", f"{self.prefix}entry:{key}", value, "PX", int(self.ttl * 1000))
+        else:
+            self.client.execute("SET", f"{self.prefix}entry:{key}", value)
+
+    def acquire(self, key, ttl):
+        """
+        Takes the compute lock of a key for ttl seconds with SET NX
+        :return: Token to release the lock with, None when another replica holds it
+        """
+        token = uuid.uuid4().hex
+        reply = self.client.execute("SET", f"{self.prefix}lock:{key}", token, "NX", "PX", int(ttl * 1000))
+        return token if reply == "OK" else None
+
+    def release(self, key, token):
+        # Only the holder deletes the lock, an expired lock may have been taken by another replica since
+        if self.client.execute("GET", f"{self.prefix}lock:{key}") == token.encode():
+            self.client.execute("DEL", f"{self.prefix}lock:{key}")
+
+    def _scan(self, pattern):
+        cursor = "0"
+        while True:
+            cursor, keys = self.client.execute("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+            yield from keys
+            if cursor == "0":
+                break
+
+    def purge(self, name, keep_code_version):
+        """
+        Drops the entries of a function computed by another version of its code
+        """
+        keep = f"{self.prefix}entry:{name}:{keep_code_version}:".encode()
+        stale = [key for key in self._scan(f"{self.prefix}entry:{name}:*") if not key.startswith(keep)]
+        for start in range(0, len(stale), 500):
+            self.client.execute("DEL", *stale[start:start + 500])
+
+    def clear(self):
+        keys = list(self._scan(f"{self.prefix}entry:*"))
+        for start in range(0, len(keys), 500):
+            self.client.execute("DEL", *keys[start:start + 500])
+
+
+def store_from_url(url):
+    """
+    Creates the store of a cache location:
+    redis://host:port/db for a Redis-protocol server, rediss:// over TLS, file:///path or a directory for a shared volume,
+    sqlite:///path or a path ending in .sqlite for a local SQLite file
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisStore.from_url(url)
+    if parsed.scheme == "file":
+        return FileStore(parsed.path)
+    if parsed.scheme == "sqlite":
+        return SqliteStore(url[len("sqlite:///"):])
+    if url.endswith((".sqlite", ".db")):
+        return SqliteStore(url)
+    return FileStore(url)
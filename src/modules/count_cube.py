@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+from modules.analysis_bundle import FILTER_COLUMNS, LIKERT_COLUMNS, CHOICE_COLUMNS
+
+DIMENSIONS = ('role', 'function', 'location')
+LIKERT_SCORES = [1, 2, 3, 4, 5]
+
+
+class CountCube:
+    """
+    Dense counts of respondents by role × function × location × question × answer code, built once
+    when the survey is loaded. The counts of any sidebar filter combination are then a sum over a
+    slice of the cube, whatever the number of respondents.
+
+    Each filter dimension has one more slot than it has values, for the respondents who left it
+    empty: they are counted when the dimension is not filtered on, like apply_filters does.
+    """
+
+    def __init__(self, categories, questions, counts, respondents):
+        """
+        :param categories: Dict of dimension name to the pd.Index of its values
+        :param questions: Dict of column position to the list of its answers, in answer code order
+        :param counts: Array of shape (roles + 1, functions + 1, locations + 1, questions, answers)
+        :param respondents: Array of shape (roles + 1, functions + 1, locations + 1)
+        """
+        self.categories = categories
+        self.questions = questions
+        self._question_codes = {position: i for i, position in enumerate(questions)}
+        self.counts = counts
+        self.respondents_counts = respondents
+
+    @classmethod
+    def from_data(cls, data, likert_columns=LIKERT_COLUMNS, choice_columns=CHOICE_COLUMNS):
+        categories, codes = {}, []
+        for dimension, column in zip(DIMENSIONS, FILTER_COLUMNS):
+            values = pd.Categorical(data[column])
+            categories[dimension] = values.categories
+            # Respondents without a value go to the extra slot at the end of the dimension
+            codes.append(np.where(values.codes < 0, len(values.categories), values.codes))
+        shape = tuple(len(values) + 1 for values in categories.values())
+        segment = np.ravel_multi_index(codes, shape)
+        respondents = np.bincount(segment, minlength=np.prod(shape)).reshape(shape)
+
+        questions = {position: LIKERT_SCORES for position in likert_columns}
+        for position in choice_columns:
+            questions[position] = sorted(data.iloc[:, position].dropna().unique().tolist())
+        answers = max(len(values) for values in questions.values())
+        counts = np.zeros(shape + (len(questions), answers), dtype=np.int64)
+        for i, (position, values) in enumerate(questions.items()):
+            answer = pd.Categorical(data.iloc[:, position], categories=values).codes
+            answered = answer >= 0
+            counts[..., i, :] = np.bincount(segment[answered] * answers + answer[answered],
+                                            minlength=np.prod(shape) * answers).reshape(shape + (answers,))
+        return cls(categories, questions, counts, respondents)
+
+    @classmethod
+    def from_counts(cls, respondents, answers, likert_columns=LIKERT_COLUMNS):
+        """
+        Cube of counts aggregated beforehand, e.g. chunk by chunk by modules.out_of_core
+        :param respondents: Series of the respondents of each role, function and location, missing values included
+        :param answers: Dict of column position to a Series of the respondents of each role, function, location
+                        and answer
+        """
+        categories, codes = {}, []
+        for level, dimension in enumerate(DIMENSIONS):
+            values = respondents.index.get_level_values(level)
+            categories[dimension] = pd.Index(sorted(values.dropna().unique()))
+            codes.append(categories[dimension].get_indexer(values))
+        shape = tuple(len(values) + 1 for values in categories.values())
+        segment = np.ravel_multi_index([np.where(code < 0, size - 1, code) for code, size in zip(codes, shape)], shape)
+        counts_of_segments = np.bincount(segment, weights=respondents.to_numpy(), minlength=np.prod(shape))
+
+        questions = {}
+        for position, counts in answers.items():
+            given = counts.index.get_level_values(3)
+            questions[position] = LIKERT_SCORES if position in likert_columns else sorted(given.dropna().unique())
+        width = max(len(values) for values in questions.values())
+        cube = np.zeros(shape + (len(questions), width), dtype=np.int64)
+        for i, (position, counts) in enumerate(answers.items()):
+            answer = pd.Index(questions[position]).get_indexer(counts.index.get_level_values(3))
+            answered = answer >= 0
+            dimension_codes = []
+            for level, dimension in enumerate(DIMENSIONS):
+                code = categories[dimension].get_indexer(counts.index.get_level_values(level))
+                dimension_codes.append(np.where(code < 0, shape[level] - 1, code)[answered])
+            flat = np.ravel_multi_index(dimension_codes, shape) * width + answer[answered]
+            cube[..., i, :] = np.bincount(flat, weights=counts.to_numpy()[answered],
+                                          minlength=np.prod(shape) * width).reshape(shape + (width,))
+        return cls(categories, questions, cube, counts_of_segments.astype(np.int64).reshape(shape))
+
+    def _masks(self, roles, functions, locations):
+        masks = []
+        for dimension, values in zip(DIMENSIONS, (roles, functions, locations)):
+            if not len(values):
+                masks.append(slice(None))
+            else:
+                # The slot of the respondents without a value never matches a selection
+                masks.append(np.append(self.categories[dimension].isin(list(values)), False))
+        return masks
+
+    def _slice(self, cube, roles, functions, locations):
+        role_mask, function_mask, location_mask = self._masks(roles, functions, locations)
+        return cube[role_mask][:, function_mask][:, :, location_mask]
+
+    def _question(self, column_index):
+        if column_index not in self._question_codes:
+            raise KeyError(f"Column {column_index} is not a rating or single choice question of the count cube")
+        return self._question_codes[column_index]
+
+    def respondents(self, roles=(), functions=(), locations=()):
+        return int(self._slice(self.respondents_counts, roles, functions, locations).sum())
+
+    def answers(self, column_index, roles=(), functions=(), locations=()):
+        """
+        :return: Series of the number of respondents giving each answer to the question, unanswered excluded
+        """
+        question = self._question(column_index)
+        values = self.questions[column_index]
+        counts = self._slice(self.counts, roles, functions, locations)[..., question, :]
+        return pd.Series(counts.sum(axis=(0, 1, 2))[:len(values)], index=values)
+
+    def breakdown(self, dimension, column_index=None, answer=None, roles=(), functions=(), locations=()):
+        """
+        Respondents by value of a filter dimension, like value_counts of the column on the filtered survey
+        :param dimension: 'role', 'function' or 'location'
+        :param column_index: Question the respondents are restricted to, with answer, all respondents when None
+        :return: Series of the counts in descending order, values without respondents left out
+        """
+        cube = self._slice(self.respondents_counts, roles, functions, locations)
+        if column_index is not None:
+            question = self._question(column_index)
+            values = self.questions[column_index]
+            if answer in values:
+                cube = self._slice(self.counts, roles, functions, locations)[..., question, values.index(answer)]
+            else:
+                # Nobody gave this answer, every value is left out below
+                cube = np.zeros_like(cube)
+        axis = DIMENSIONS.index(dimension)
+        counts = cube.sum(axis=tuple(i for i in range(3) if i != axis))
+        mask = self._masks(roles, functions, locations)[axis]
+        values = self.categories[dimension].append(pd.Index([np.nan]))[mask]
+        counts = pd.Series(counts, index=values)
+        # value_counts leaves out the respondents without a value
+        counts = counts[counts.index.notna() & (counts > 0)]
+        return counts.sort_values(ascending=False, kind='stable')
+
+    def drilldown(self, column_index, roles=(), functions=(), locations=()):
+        """
+        Breakdowns of every answer of a question at once, from a single slice of the cube
+        :return: Dict of answer, and None for all respondents, to a dict of dimension to its breakdown
+        """
+        question = self._question(column_index)
+        values = self.questions[column_index]
+        respondents = self._slice(self.respondents_counts, roles, functions, locations)
+        answered = self._slice(self.counts, roles, functions, locations)[..., question, :len(values)]
+        masks = self._masks(roles, functions, locations)
+        drilldown = {answer: {} for answer in [None] + list(values)}
+        for axis, dimension in enumerate(DIMENSIONS):
+            others = tuple(i for i in range(3) if i != axis)
+            index = self.categories[dimension].append(pd.Index([np.nan]))[masks[axis]]
+            # Columns are all respondents then each answer, as value_counts leaves out the respondents without a value
+            counts = np.column_stack([respondents.sum(axis=others), answered.sum(axis=others)])
+            counts = pd.DataFrame(counts, index=index, columns=range(len(values) + 1))[index.notna()]
+            for column, answer in enumerate(drilldown):
+                breakdown = counts[column]
+                drilldown[answer][dimension] = breakdown[breakdown > 0].sort_values(ascending=False, kind='stable')
+        return drilldown
+
+
+def median_of_counts(counts):
+    """
+    Median of the answers counted in a Series of counts indexed by the answer, as np.median of the answers
+    """
+    total = counts.sum()
+    if not total:
+        return np.nan
+    cumulative = counts.cumsum().to_numpy()
+    lower = counts.index[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+    upper = counts.index[np.searchsorted(cumulative, total // 2, side='right')]
+    return (lower + upper) / 2
@@ -0,0 +1,231 @@
+import os
+import hashlib
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Distinct values tracked per text column before the count is reported as a lower bound
+MAX_TRACKED_DISTINCT = 1000
+
+
+class ColumnCastError(ValueError):
+    """
+    Values of a later chunk don't fit the dtypes inferred from the first rows
+    """
+
+    def __init__(self, columns):
+        super().__init__(f"Columns {', '.join(map(str, columns))} don't fit their inferred dtype")
+        self.columns = list(columns)
+
+
+def cast_column(series, dtype):
+    """
+    Casts a column read as text to its inferred dtype
+    :raise ColumnCastError: When a value can't be cast
+    """
+    try:
+        if dtype == "boolean":
+            values = series.str.lower().map({"true": True, "false": False})
+            if values.isna().sum() != series.isna().sum():
+                raise ValueError("Not a boolean")
+            return values.astype("boolean")
+        if dtype == "Int64":
+            return pd.to_numeric(series).astype("Int64")
+        if dtype == "float64":
+            return pd.to_numeric(series).astype("float64")
+    except (ValueError, TypeError) as e:
+        raise ColumnCastError([series.name]) from e
+    return series.astype("string")
+
+
+class CsvIngestor:
+    """
+    Reads large CSV uploads chunk by chunk into a Parquet cache, computing the
+    preview head and per-column statistics in the same streaming pass
+    """
+
+    def __init__(self, cache_dir=None, chunksize=100_000, sample_rows=10_000, head_rows=100):
+        """
+        :param cache_dir: Directory of the Parquet files, defaults to a folder in the system temp directory
+        :param chunksize: Number of rows parsed at a time
+        :param sample_rows: Number of rows used to infer the column dtypes
+        :param head_rows: Number of rows kept for the preview
+        """
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "csv_ingest_cache")
+        self.chunksize = chunksize
+        self.sample_rows = sample_rows
+        self.head_rows = head_rows
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def file_hash(uploaded_file):
+        uploaded_file.seek(0)
+        digest = hashlib.sha256()
+        for block in iter(lambda: uploaded_file.read(1024 * 1024), b""):
+            digest.update(block)
+        uploaded_file.seek(0)
+        return digest.hexdigest()
+
+    def infer_dtypes(self, uploaded_file):
+        """
+        Infers the column dtypes from the first rows of the file
+        """
+        uploaded_file.seek(0)
+        sample = pd.read_csv(uploaded_file, nrows=self.sample_rows)
+        uploaded_file.seek(0)
+        dtypes = {}
+        for column, dtype in sample.dtypes.items():
+            if pd.api.types.is_bool_dtype(dtype):
+                dtypes[column] = "boolean"
+            elif pd.api.types.is_integer_dtype(dtype):
+                # Nullable integers so a missing value in a later chunk doesn't break the cast
+                dtypes[column] = "Int64"
+            elif pd.api.types.is_float_dtype(dtype):
+                dtypes[column] = "float64"
+            else:
+                dtypes[column] = "string"
+        return dtypes
+
+    def ingest(self, uploaded_file):
+        """
+        Converts the uploaded CSV to Parquet, reusing the cached file when the same content was seen before
+        :return: Tuple of (parquet path, preview head DataFrame, per-column statistics DataFrame)
+        """
+        parquet_path = os.path.join(self.cache_dir, f"{self.file_hash(uploaded_file)}.parquet")
+        stats_path = f"{parquet_path}.stats.pkl"
+        head_path = f"{parquet_path}.head.pkl"
+        if os.path.isfile(parquet_path) and os.path.isfile(stats_path) and os.path.isfile(head_path):
+            return parquet_path, pd.read_pickle(head_path), pd.read_pickle(stats_path)
+
+        dtypes = self.infer_dtypes(uploaded_file)
+        # The ingestor is shared by the sessions, two of them may convert the same upload at once
+        tmp_suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_paths = [f"{path}.{tmp_suffix}" for path in (parquet_path, head_path, stats_path)]
+        try:
+            try:
+                head, stats = self._write_parquet(uploaded_file, dtypes, tmp_paths[0])
+            except ColumnCastError as e:
+                # The first rows looked numeric or boolean but a later chunk doesn't, these columns are
+                # read as text and the file converted again. Text never fails to cast, a second pass is the last
+                dtypes.update(dict.fromkeys(e.columns, "string"))
+                head, stats = self._write_parquet(uploaded_file, dtypes, tmp_paths[0])
+            summary = stats.summary()
+            head.to_pickle(tmp_paths[1])
+            summary.to_pickle(tmp_paths[2])
+            # The Parquet file goes last, its preview and statistics are in place once it is
+            for tmp_path, path in zip(tmp_paths[::-1], (stats_path, head_path, parquet_path)):
+                os.replace(tmp_path, path)
+        finally:
+            uploaded_file.seek(0)
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return parquet_path, head, summary
+
+    def _write_parquet(self, uploaded_file, dtypes, tmp_path):
+        """
+        Converts the CSV to the Parquet file tmp_path, the chunks are read as text and cast to dtypes
+        :return: Tuple of (preview head DataFrame, ColumnStats)
+        :raise ColumnCastError: With every column that doesn't fit its dtype, once the whole file was read
+        """
+        uploaded_file.seek(0)
+        stats = ColumnStats()
+        head = None
+        writer = None
+        failed = []
+        try:
+            # Closed as a context manager, a reader dropped midway would close the upload along with it
+            with pd.read_csv(uploaded_file, dtype=str, chunksize=self.chunksize) as reader:
+                for chunk in reader:
+                    columns = {}
+                    for column in chunk.columns:
+                        if column in failed:
+                            continue
+                        try:
+                            columns[column] = cast_column(chunk[column], dtypes[column])
+                        except ColumnCastError:
+                            failed.append(column)
+                    if failed:
+                        # The file is converted again, the rest of it is only read to find the other failing columns
+                        continue
+                    chunk = pd.DataFrame(columns)
+                    if head is None:
+                        head = chunk.head(self.head_rows)
+                    stats.update(chunk)
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, table.schema)
+                    writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+        if failed:
+            raise ColumnCastError(failed)
+        if writer is None:
+            # Header-only file, there is no chunk to build a schema from
+            head = pd.DataFrame(columns=list(dtypes)).astype(dtypes)
+            head.to_parquet(tmp_path, index=False)
+        return head, stats
+
+    @staticmethod
+    def load(parquet_path, columns=None):
+        """
+        Loads the ingested table, optionally restricted to some columns
+        """
+        return pd.read_parquet(parquet_path, columns=columns)
+
+
+class ColumnStats:
+    """
+    Per-column statistics that can be updated one chunk at a time
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for column in chunk.columns:
+            series = chunk[column]
+            entry = self.columns.setdefault(column, {
+                "dtype": str(series.dtype), "non_null": 0, "min": None, "max": None,
+                "sum": 0.0, "sum_sq": 0.0, "distinct": set(), "distinct_overflow": False,
+            })
+            values = series.dropna()
+            entry["non_null"] += len(values)
+            if len(values) == 0:
+                continue
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                numbers = values.to_numpy(dtype="float64")
+                entry["min"] = numbers.min() if entry["min"] is None else min(entry["min"], numbers.min())
+                entry["max"] = numbers.max() if entry["max"] is None else max(entry["max"], numbers.max())
+                entry["sum"] += numbers.sum()
+                entry["sum_sq"] += np.square(numbers).sum()
+            elif not entry["distinct_overflow"]:
+                entry["distinct"].update(values.unique())
+                if len(entry["distinct"]) > MAX_TRACKED_DISTINCT:
+                    entry["distinct"] = set()
+                    entry["distinct_overflow"] = True
+
+    def summary(self):
+        rows = []
+        for column, entry in self.columns.items():
+            count = entry["non_null"]
+            row = {"column": column, "dtype": entry["dtype"], "non_null": count, "missing": self.rows - count}
+            if entry["min"] is not None:
+                mean = entry["sum"] / count
+                row.update({
+                    "min": entry["min"], "max": entry["max"], "mean": mean,
+                    "std": np.sqrt(max(entry["sum_sq"] / count - mean ** 2, 0.0)),
+                })
+            elif entry["distinct_overflow"]:
+                row["distinct"] = f">{MAX_TRACKED_DISTINCT}"
+            else:
+                row["distinct"] = str(len(entry["distinct"]))
+            rows.append(row)
+        return pd.DataFrame(rows)
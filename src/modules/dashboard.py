@@ -0,0 +1,952 @@
+import os
+import functools
+import threading
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import numpy as np
+import seaborn as sns
+import matplotlib.pyplot as plt
+import plotly.graph_objects as go
+from wordcloud import WordCloud, STOPWORDS
+from modules.near_duplicates import NearDuplicateGrouper
+from modules.figure_cache import FigureCache
+from modules.analysis_bundle import AnalysisBundle, WORDCLOUD_PAIRS
+from modules.count_cube import CountCube, DIMENSIONS, median_of_counts
+from modules.out_of_core import (
+    DEFAULT_MEMORY_BUDGET_MB, memory_budget, aggregate_survey, sample_size, fold_word_counts
+)
+from modules.sql_backend import DuckDbBackend, sql_engine, sql_min_rows
+from modules.survey_store import SurveyStore
+from modules.derived_cache import DerivedCache
+from modules.cache_backends import store_from_url
+from modules.metrics import REGISTRY, RERUN_SECONDS, MODEL_INFERENCE_SECONDS, CacheStats, serve_metrics
+from modules.profiler import start_profile, current_profiler, stage, timed
+
+
+score_to_category = {
+    1: 'Very Dissatisfied',
+    2: 'Dissatisfied',
+    3: 'Neutral',
+    4: 'Satisfied',
+    5: 'Very Satisfied'
+}
+
+
+def initialize_state():
+    # Initialize session states with default values if not already present
+    keys = ['previous_dashboard', 'selected_role', 'selected_function', 'selected_location', 'uploaded_file',
+            'lazy_rendering', 'open_blocks', 'selected_wave']
+    defaults = [None, [], [], [], None, True, {}, None]
+    for key, default in zip(keys, defaults):
+        if key not in st.session_state:
+            st.session_state[key] = default
+
+
+def reset_filters():
+    st.session_state['selected_role'] = []
+    st.session_state['selected_function'] = []
+    st.session_state['selected_location'] = []
+
+
+def lazy_block(key, label):
+    # Streamlit runs the body of an expander or a tab even when it is collapsed, so heavy question blocks
+    # sit behind a toggle instead and only aggregate and draw once opened. The open blocks are kept in
+    # session state apart from the toggle widgets, which Streamlit forgets when another dashboard is shown
+    if not st.session_state['lazy_rendering']:
+        return True
+    open_blocks = st.session_state['open_blocks']
+    opened = st.checkbox(label, value=open_blocks.get(key, False), key=f'open_block_{key}')
+    open_blocks[key] = opened
+    return opened
+
+
+satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                        'Satisfied', 'Very Satisfied']
+comfort_options = ['Select a comfort level', 'Very Uncomfortable', 'Uncomfortable', 'Hesitant',
+                   'Comfortable', 'Very Comfortable']
+
+
+# The body of load_data only runs on a miss of st.cache_data, it flags the thread building the survey context
+_load_data_calls = threading.local()
+load_data_stats = CacheStats()
+REGISTRY.track_cache('load_data', load_data_stats)
+
+
+SURVEY_DATA_URL = 'https://github.com/001202ZHENG/V1_Chatbot_Streamlit/raw/main/data/Voice%20of%20Customer_Second%20data%20set.xlsx'
+
+
+# Load and clean data
+@st.cache_data(persist=True)
+def load_data(source=SURVEY_DATA_URL, modified=None):
+    # Load data and cache the DataFrame to avoid reloads on each user interaction
+    # modified is the modification time of a local file, so a rewritten file is not served from the cache
+    _load_data_calls.missed = True
+    if source.endswith('.parquet'):
+        data = pd.read_parquet(source)
+    elif source.endswith('.csv'):
+        data = pd.read_csv(source)
+    else:
+        data = pd.read_excel(source)
+    return data
+
+
+def survey_data_source():
+    # SURVEY_DATA_PATH replaces the published survey by a local Excel, CSV or Parquet file, e.g. synthetic data
+    path = os.environ.get('SURVEY_DATA_PATH')
+    if not path:
+        return SURVEY_DATA_URL, None
+    return path, os.path.getmtime(path)
+
+
+class SurveyContext:
+    """
+    Survey data shared by every page and every session of the process, with the values
+    the sidebar filters offer computed once instead of on each rerun
+    """
+
+    def __init__(self, data, bundle=None, aggregates=None, sql=None, cube=None):
+        self.data = data
+        # Analysis bundle the data was read from, None when it was loaded from the survey export
+        self.bundle = bundle
+        self.filter_index = bundle.filter_index if bundle is not None else None
+        # Aggregates of the whole export in out-of-core mode, data is then a sample of its respondents
+        self.aggregates = aggregates
+        # SQL backend querying the whole export, data is then a sample of its respondents as well
+        self.sql = sql
+        # Counts behind the rating, Yes/No and by-Role/by-Function charts of every filter combination,
+        # answered by the SQL backend when there is one
+        self.cube = None
+        if cube is not None:
+            # Counted when the data was stored, e.g. by the survey store for each wave
+            self.cube = cube
+        elif sql is None:
+            self.cube = aggregates.cube if aggregates is not None else CountCube.from_data(data)
+        self.counts = sql if sql is not None else self.cube
+        if sql is not None:
+            self.roles, self.functions, self.locations = (sql.values(dimension) for dimension in DIMENSIONS)
+        elif aggregates is not None:
+            self.roles, self.functions, self.locations = (self.cube.categories[dimension].to_numpy()
+                                                          for dimension in DIMENSIONS)
+        else:
+            self.roles = data['What is your role at the company ?'].unique()
+            self.functions = data['What function are you part of ?'].unique()
+            self.locations = data['Where are you located ?'].unique()
+
+
+@st.cache_resource
+def get_survey_store():
+    # SURVEY_STORE_PATH points to a store of several waves of the survey, filled by python -m modules.ingest_wave
+    path = os.environ.get('SURVEY_STORE_PATH')
+    return SurveyStore(path) if path else None
+
+
+def selected_wave():
+    # Wave picked in the sidebar, the latest one until another is picked. None without a survey store
+    store = get_survey_store()
+    if store is None or not store.wave_ids():
+        return None
+    wave_id = st.session_state.get('selected_wave')
+    return wave_id if wave_id in store.wave_ids() else store.latest()
+
+
+@st.cache_resource(show_spinner=False)
+def get_wave_context(wave_id, ingested):
+    # ingested is the ingest time of the wave, so a wave ingested again is not served from the cache
+    store = get_survey_store()
+    return SurveyContext(store.load_wave(wave_id), cube=store.cube(wave_id))
+
+
+def get_survey_context():
+    # The wave picked in the sidebar when SURVEY_STORE_PATH points to a survey store, else the survey export
+    wave_id = selected_wave()
+    if wave_id is not None:
+        return get_wave_context(wave_id, get_survey_store().wave(wave_id)['ingested'])
+    return load_survey_context()
+
+
+@st.cache_resource(show_spinner=False)
+def load_survey_context():
+    # SURVEY_BUNDLE_PATH points to a bundle built offline by python -m modules.precompute
+    path = os.environ.get('SURVEY_BUNDLE_PATH')
+    if path:
+        bundle = AnalysisBundle(path)
+        return SurveyContext(bundle.data, bundle)
+    # SURVEY_SQL_ENGINE=duckdb queries a large CSV or Parquet export with SQL instead of loading it
+    if sql_engine():
+        source = survey_data_source()[0]
+        backend = DuckDbBackend.from_source(source)
+        if backend.rows() >= sql_min_rows():
+            rows = sample_size(source, memory_budget() or DEFAULT_MEMORY_BUDGET_MB * 2 ** 20)
+            return SurveyContext(backend.sample(rows), sql=backend)
+    # SURVEY_MEMORY_BUDGET_MB aggregates a CSV or Parquet export larger than memory chunk by chunk
+    budget = memory_budget()
+    if budget:
+        aggregates = aggregate_survey(survey_data_source()[0], budget)
+        return SurveyContext(aggregates.sample, aggregates=aggregates)
+    _load_data_calls.missed = False
+    data = load_data(*survey_data_source())
+    # Recorded when the context is built, the reruns reuse the context without calling load_data
+    load_data_stats.record(hit=not _load_data_calls.missed)
+    return SurveyContext(data)
+
+
+@st.cache_resource
+def get_derived_cache():
+    # DERIVED_CACHE_URL points the replicas to a shared store: redis://host:port/db or a directory on a shared volume
+    url = os.environ.get('DERIVED_CACHE_URL') or os.environ.get('DERIVED_CACHE_PATH', 'cache/derived.sqlite')
+    cache = DerivedCache(store_from_url(url))
+    REGISTRY.track_cache('derived', cache)
+    REGISTRY.track_cache('derived_store', cache.store)
+    return cache
+
+
+def persistent(fn):
+    # Keeps the results of fn in the derived cache so they survive restarts. The results are shared
+    # between reruns and sessions, callers must not modify them
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return get_derived_cache().get_or_compute(fn, *args, **kwargs)
+    return wrapper
+
+
+def inject_page_style():
+    # General Page Layout
+    st.markdown(
+        '''
+        <style>
+            .main .block-container {
+                padding-top: 0.25rem;
+                padding-right: 0.25rem;
+                padding-left: 0.25rem;
+                padding-bottom: 0.25rem;
+            }
+            h1 {
+                margin-top: 0rem;
+                margin-bottom: 0rem;
+            }
+            h3 {
+                margin-top: 0rem;
+                margin-bottom: 0rem;
+            }
+        </style>
+        ''',
+        unsafe_allow_html=True
+    )
+
+
+# Header Function
+def render_header(title, subtitle=None):
+    style = style = """
+    <style>
+        h1.header, h3.subheader {
+            background-color: #336699; /* Steel blue background */
+            color: white; /* White text color */
+            text-align: center;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            margin: 0;
+            padding: 15px 0;
+            height: auto
+        }
+        h1.header {
+            margin-bottom: 0;
+            font-size: 30px;
+        }
+        h3.subheader {
+            font-size: 20px;
+            font-weight: normal;
+            margin-top: 0;
+        }
+    </style>
+    """
+    st.markdown(style, unsafe_allow_html=True)
+    st.markdown(f'<h1 class="header">{title}</h1>', unsafe_allow_html=True)
+    if subtitle:
+        st.markdown(f'<h3 class="subheader">{subtitle}</h3>', unsafe_allow_html=True)
+
+
+@timed()
+def apply_filters(data, roles, functions, locations, index=None):
+    # index is the FilterIndex of data when it comes from an analysis bundle
+    if index is not None:
+        return data[index.mask(roles, functions, locations)]
+    filtered = data
+    if roles:
+        filtered = filtered[filtered['What is your role at the company ?'].isin(roles)]
+    if functions:
+        filtered = filtered[filtered['What function are you part of ?'].isin(functions)]
+    if locations:
+        filtered = filtered[filtered['Where are you located ?'].isin(locations)]
+    return filtered
+
+
+def wave_selector(store):
+    # Waves of the survey store, newest first. The filters are reset when another wave is picked,
+    # its roles, functions and locations may differ from the previous one
+    waves = {wave['wave_id']: wave for wave in reversed(store.waves())}
+    wave_id = selected_wave()
+    if st.session_state.get('wave_selector') not in waves:
+        # The wave picked before is no longer in the store
+        st.session_state.pop('wave_selector', None)
+    picked = st.sidebar.selectbox('Select Wave', options=list(waves), index=list(waves).index(wave_id),
+                                  format_func=lambda option: f"{option} ({waves[option]['date']})",
+                                  key='wave_selector')
+    if picked != st.session_state['selected_wave']:
+        if st.session_state['selected_wave'] is not None:
+            reset_filters()
+        st.session_state['selected_wave'] = picked
+
+
+def setup_page(page, title, subtitle=None):
+    """
+    Common top of every page: page config, session state, profiler, sidebar filters and header
+    :param page: Name of the page, the filters are reset when the user comes from another page
+    :return: Tuple of (all responses, responses matching the sidebar filters)
+    """
+    st.set_page_config(layout="wide")
+    initialize_state()
+    # Prometheus metrics of the process on /metrics when DASHBOARD_METRICS_PORT is set, see modules.metrics
+    serve_metrics()
+    # Opt-in timing of the stages and charts of this rerun, enabled with ?profile=1 or DASHBOARD_PROFILE=1,
+    # their allocations are measured too when the server sets DASHBOARD_PROFILE_MEMORY=1
+    start_profile()
+    store = get_survey_store()
+    if store is not None and store.wave_ids():
+        wave_selector(store)
+    with stage('load_data'):
+        context = get_survey_context()
+    inject_page_style()
+
+    if page != st.session_state['previous_dashboard']:
+        reset_filters()  # Reset filters if dashboard changed
+        st.session_state['previous_dashboard'] = page
+
+    st.sidebar.multiselect('Select Role', options=context.roles, default=st.session_state['selected_role'],
+                           key='selected_role')
+    st.sidebar.multiselect('Select Function', options=context.functions,
+                           default=st.session_state['selected_function'], key='selected_function')
+    st.sidebar.multiselect('Select Location', options=context.locations,
+                           default=st.session_state['selected_location'], key='selected_location')
+    st.sidebar.checkbox('Load detailed charts on demand', key='lazy_rendering')
+
+    render_header(title, subtitle)
+    filtered_data = apply_filters(context.data, st.session_state['selected_role'],
+                                  st.session_state['selected_function'], st.session_state['selected_location'],
+                                  index=context.filter_index)
+    # Versioned by the filters picked, the derived cache then never hashes the filtered respondents
+    get_derived_cache().derive_version(filtered_data, context.data,
+                                       *(sorted(map(str, st.session_state[key])) for key in
+                                         ('selected_role', 'selected_function', 'selected_location')))
+    return context.data, filtered_data
+
+
+def finish_page():
+    profiler = current_profiler()
+    RERUN_SECONDS.observe(profiler.total_ms() / 1000, dashboard=st.session_state['previous_dashboard'])
+    profiler.finish(st.session_state['previous_dashboard'])
+
+
+@timed()
+@persistent
+def prepare_summaries(data):
+    return summaries_from_counts(data['Where are you located ?'].value_counts(),
+                                 data['What is your role at the company ?'].value_counts(),
+                                 data['What function are you part of ?'].value_counts())
+
+
+def summaries_from_counts(location_counts, role_counts, function_counts):
+    # Tables of the location map and of the by-Role and by-Function bars, from the respondents of each value
+    continent_to_country_code = {
+        'Asia': 'KAZ',
+        'Oceania': 'AUS',
+        'North America': 'CAN',
+        'South America': 'BRA',
+        'Europe': 'DEU',
+        'Africa': 'TCD'
+    }
+    country_code_to_continent = {v: k for k, v in continent_to_country_code.items()}
+    location_summary = pd.DataFrame(location_counts).reset_index()
+    location_summary.columns = ['Continent', 'Count']
+    location_summary['Country_Code'] = location_summary['Continent'].map(continent_to_country_code)
+    location_summary['Label'] = (location_summary['Continent'].astype(str) + ': '
+                                 + location_summary['Count'].astype(str))
+
+    role_summary = pd.DataFrame(role_counts).reset_index()
+    role_summary.columns = ['Role', 'Count']
+    function_summary = pd.DataFrame(function_counts).reset_index()
+    function_summary.columns = ['Function', 'Count']
+    return location_summary, role_summary, function_summary
+
+
+@timed()
+@persistent
+def multiselect_counts(data, column_index, column):
+    # Counts the options of a semicolon separated multi-select question and their share of the respondents
+    answers = pd.DataFrame({column: data.iloc[:, column_index]})
+    answers[column] = answers[column].str.rstrip(';').str.split(';')
+    answers = answers.explode(column)
+    answers.dropna(inplace=True)
+
+    counts = answers[column].value_counts().reset_index()
+    counts.columns = [column, 'count']
+    counts['percentage'] = counts['count'] / len(data) * 100
+    return counts
+
+
+############ CHART BUILDERS ############
+# Each builder draws a figure from an aggregated table and its keyword arguments only,
+# so plotly_chart_cached can reuse the serialized figure when the same chart is drawn again
+@st.cache_resource
+def get_figure_cache():
+    cache = FigureCache(store=get_derived_cache().store)
+    REGISTRY.track_cache('figures', cache)
+    return cache
+
+
+def plotly_chart_cached(build_fn, data, use_container_width=False, **spec):
+    with stage(build_fn.__name__, kind='chart'):
+        get_figure_cache().plotly_chart(build_fn, data, use_container_width=use_container_width, **spec)
+
+
+satisfaction_colors = {
+    'Very Dissatisfied': '#440154',  # Dark purple
+    'Dissatisfied': '#3b528b',  # Dark blue
+    'Neutral': '#21918c',  # Cyan
+    'Satisfied': '#5ec962',  # Light green
+    'Very Satisfied': '#fde725'  # Bright yellow
+}
+comfort_colors = {
+    'Very Uncomfortable': '#440154',  # Dark purple
+    'Uncomfortable': '#3b528b',  # Dark blue
+    'Hesitant': '#21918c',  # Cyan
+    'Comfortable': '#5ec962',  # Light green
+    'Very Comfortable': '#fde725'  # Bright yellow
+}
+learning_format_colors = {
+    'E-Learning': '#440154',  # Dark purple
+    'On site': '#3b528b',  # Dark blue
+    'Micro-Learning': '#21918c',  # Cyan
+    'Coaching': '#5ec962',  # Light green
+}
+campaign_colors = {
+    'National Campaign': '#440154',  # Dark purple
+    'International Campaign': '#3b528b',  # Dark blue
+    'Regional Campaign': '#21918c',  # Cyan
+}
+
+
+def build_location_map(location_summary, color):
+    fig = px.scatter_geo(location_summary,
+                         locations="Country_Code",
+                         size="Count",
+                         hover_name="Continent",
+                         text="Label",  # The text labels with continent names and counts
+                         color_discrete_sequence=[color])
+
+    fig.update_geos(
+        projection_type="natural earth",
+        showcountries=True, countrycolor="lightgrey",
+        showcoastlines=False, coastlinecolor="lightgrey",
+        showland=True, landcolor="#F0F0F0",
+        showocean=True, oceancolor="white",
+        lataxis_showgrid=True,
+        lonaxis_showgrid=True,
+        lataxis_range=[-90, 90],
+        lonaxis_range=[-180, 180]
+    )
+
+    # Update the layout for title and margins
+    fig.update_layout(
+        title='by Continent',
+        margin=dict(l=0, r=0, t=50, b=0),
+        geo=dict(bgcolor='white')  # Set the background color of the geo part of the map
+    )
+
+    fig.update_traces(
+        marker=dict(size=location_summary['Count'] * 2, line=dict(width=0)),
+        # Remove the white border by setting the line width to 0
+        textposition='top center',
+        textfont=dict(color='#333333', size=14)  # Set label font color and size
+    )
+
+    fig.update_layout(hovermode=False)
+    return fig
+
+
+def build_summary_bar(summary, category, title, left_margin, height, color='#336699'):
+    # Horizontal bar chart of the respondent counts by role or function
+    fig = px.bar(summary, y=category, x='Count', orientation='h')
+    fig.update_layout(title=title, margin=dict(l=left_margin, r=0, t=50, b=0), height=height, showlegend=False)
+    fig.update_traces(marker_color=color, text=summary['Count'], textposition='outside')
+    fig.update_yaxes(showticklabels=True, title='')
+    fig.update_xaxes(showticklabels=False, title='')
+    return fig
+
+
+def build_percentage_bar(counts, category, value, color_map):
+    # Horizontal bar chart of the share of each answer
+    fig = px.bar(counts, y=category, x=value, text=value, orientation='h', color=category,
+                 color_discrete_map=color_map)
+
+    # Remove legend and axes titles
+    fig.update_layout(showlegend=False, xaxis_visible=False, xaxis_title=None, yaxis_title=None, autosize=True,
+                      height=300, margin=dict(l=20, r=20, t=30, b=20))
+
+    # Format text on bars
+    fig.update_traces(texttemplate='%{x:.1f}%', textposition='outside')
+    fig.update_xaxes(range=[0, max(counts[value]) * 1.1])
+
+    # Improve layout aesthetics
+    fig.update_layout(uniformtext_minsize=8, uniformtext_mode='hide')
+    return fig
+
+
+def build_trend_chart(trend, value, title, text_format='%{y:.1f}', color='#336699'):
+    # Line chart of a value in each wave of the survey store, labelled with its value
+    fig = px.line(trend, x='wave', y=value, text=value, markers=True, color_discrete_sequence=[color],
+                  hover_data=['date'])
+    fig.update_traces(texttemplate=text_format, textposition='top center')
+    fig.update_layout(title=title, height=300, margin=dict(l=20, r=20, t=50, b=20), xaxis_title=None,
+                      yaxis_title=None)
+    # Waves are labels in date order, not numbers
+    fig.update_xaxes(type='category')
+    return fig
+
+
+def build_answer_trend(trend, category, color_map):
+    # Stacked bars of the share of each answer in each wave of the survey store
+    fig = px.bar(trend, x='wave', y='percentage', color=category, color_discrete_map=color_map,
+                 category_orders={category: list(color_map)})
+    fig.update_traces(texttemplate='%{y:.0f}%', textposition='inside')
+    fig.update_layout(height=350, margin=dict(l=20, r=20, t=30, b=20), xaxis_title=None, yaxis_title=None,
+                      legend_title_text=None, uniformtext_minsize=8, uniformtext_mode='hide')
+    fig.update_xaxes(type='category')
+    return fig
+
+
+def build_reason_bar(counts, category, color):
+    # Vertical bar chart of the reasons, labelled with their counts
+    return px.bar(counts, x=category, y='percentage', text='count', color=category, color_discrete_sequence=[color])
+
+
+def build_reason_treemap(counts, category):
+    return px.treemap(counts, path=[category], values='count', color='count', color_continuous_scale='RdBu')
+
+
+def build_hr_process_chart(df_tidy):
+    fig = go.Figure(data=[
+        go.Bar(
+        name='Improvement Areas',
+        y=df_tidy[df_tidy['Type'] == 'Improvement_Areas']['HR Function'],#make it horizontal bar chart to show texts completely
+        x=df_tidy[df_tidy['Type'] == 'Improvement_Areas']['Count'], #make it horizontal bar chart to show texts completely
+        marker_color='#3b528b',
+        orientation='h' #make it horizontal bar chart to show texts completely
+        ),
+        go.Bar(
+        name='Employee Interaction',
+        y=df_tidy[df_tidy['Type'] == 'HR_Process_Interacted']['HR Function'],#make it horizontal bar chart to show texts completely
+        x=df_tidy[df_tidy['Type'] == 'HR_Process_Interacted']['Count'], #make it horizontal bar chart to show texts completely
+        marker_color='#5ec962',
+        orientation='h' #make it horizontal bar chart to show texts completely
+        )
+    ])
+    fig.update_layout(
+        title='HR Processes: Employee Interaction vs Improvement Areas',
+        title_font=dict(size=17, family="Arial", color='#333333'),
+        xaxis_title='HR Process',
+        yaxis_title='Number of Respondents',
+        barmode='group',
+        annotations=[
+            dict(
+                xref='paper', yref='paper', x=0, y=1.1,
+                xanchor='left', yanchor='top',
+                text="<i>Each respondent is able to select more than one HR process</i>",
+                font=dict(family='Arial', size=12, color='#707070'),
+                showarrow=False)
+        ],
+        legend=dict(
+            orientation="h",
+            x=0.5,
+            xanchor="center",
+            y=-0.2,
+            yanchor="top"
+        ),
+        margin=dict(l=22, r=20, t=70, b=70)
+    )
+    return fig
+
+
+def build_device_chart(device_counts, colors):
+    fig = px.bar(device_counts, x='percentage', y='device', text='percentage', orientation='h', color='device',
+                 color_discrete_map=colors)
+    fig.update_layout(
+        title='Devices Used to Access HR Information',
+        title_font=dict(size=17, family="Arial", color='#333333'),
+        xaxis={'visible': False, 'showticklabels': False},
+        yaxis_title=None,
+        showlegend=False
+    )
+    fig.update_traces(texttemplate='%{text:.0f}%', textposition='outside')
+    return fig
+
+
+##### THIS SECTION FOR SATISFACTION SCORES START ####
+# MARIAS SCORE DISTRIBUTION FUNCTION
+@timed()
+@persistent
+def score_distribution(data, column_index):
+    # Extract the data series based on the column index
+    data_series = data.iloc[:, column_index]
+
+    # Calculate the percentage of each response
+    value_counts = data_series.value_counts(normalize=True).sort_index() * 100
+
+    # Ensure the value_counts includes all categories with zero counts for missing categories
+    value_counts = value_counts.reindex(range(1, 6), fill_value=0)
+
+    # Create the DataFrame
+
+    # Calculate the median score
+    raw_counts = data_series.value_counts().sort_index()
+    scores = np.repeat(raw_counts.index, raw_counts.values)
+    median_score = np.median(scores)
+
+    return value_counts, median_score
+
+
+#### Function to plot satisfaction proportions -- OLD
+def plot_satisfaction_proportions(data_series, title):
+    # Calculate satisfaction proportions
+    score_counts = data_series.value_counts().sort_index().astype(int)
+    total_satisfied = score_counts.get(4, 0) + score_counts.get(5, 0)
+    total_dissatisfied = score_counts.get(1, 0) + score_counts.get(2, 0) + score_counts.get(3, 0)
+
+    # Calculate proportions
+    dissatisfied_proportions = [score_counts.get(i, 0) / total_dissatisfied if total_dissatisfied > 0 else 0 for i in
+                                range(1, 4)]
+    satisfied_proportions = [score_counts.get(i, 0) / total_satisfied if total_satisfied > 0 else 0 for i in
+                             range(4, 6)]
+
+    # Create the plotly figure for stacked bar chart
+    fig = go.Figure()
+
+    # Add 'Dissatisfied' segments
+    cumulative_size = 0
+    colors_dissatisfied = sns.color_palette("Blues_d", n_colors=3)
+    for i, prop in enumerate(dissatisfied_proportions):
+        fig.add_trace(go.Bar(
+            x=[prop],
+            y=['Dissatisfied'],
+            orientation='h',
+            name=f'{i + 1}',
+            marker=dict(
+                color=f'rgb({colors_dissatisfied[i][0] * 255},{colors_dissatisfied[i][1] * 255},{colors_dissatisfied[i][2] * 255})'),
+            base=cumulative_size
+        ))
+        cumulative_size += prop
+
+    # Add 'Satisfied' segments
+    cumulative_size = 0
+    colors_satisfied = sns.color_palette("Greens_d", n_colors=2)
+    for i, prop in enumerate(satisfied_proportions):
+        fig.add_trace(go.Bar(
+            x=[prop],
+            y=['Satisfied'],
+            orientation='h',
+            name=f'{i + 4}',
+            marker=dict(
+                color=f'rgb({colors_satisfied[i][0] * 255},{colors_satisfied[i][1] * 255},{colors_satisfied[i][2] * 255})'),
+            base=cumulative_size
+        ))
+        cumulative_size += prop
+
+    # Update layout and display in Streamlit
+    fig.update_layout(
+        title=title,
+        barmode='stack',
+        annotations=[
+            dict(x=1.05, y=0, text=f'Total: {total_dissatisfied}', showarrow=False),
+            dict(x=1.05, y=1, text=f'Total: {total_satisfied}', showarrow=False)
+        ]
+    )
+    fig.update_xaxes(title_text="", visible=True, showticklabels=False)
+    fig.update_yaxes(title_text="")
+
+    st.plotly_chart(fig)  # Display the plot in Streamlit
+
+
+def filter_by_satisfaction(data, satisfaction_level, column_index):
+    if satisfaction_level != 'Select a satisfaction level':
+        data = data[data.iloc[:, column_index] == satisfaction_options.index(satisfaction_level)]
+    return data
+
+def filter_by_comfort(data, comfort_level, column_index):
+    if comfort_level != 'Select a comfort level':
+        data = data[data.iloc[:, column_index] == comfort_options.index(comfort_level)]
+    return data
+
+
+# The segment functions answer from the count cube of the survey for the respondents matching the
+# sidebar filters, without touching the rows. Their results match the functions above applied to
+# filtered_data, or to data with filtered=False
+def selected_filters(filtered=True):
+    if not filtered:
+        return (), (), ()
+    return (st.session_state['selected_role'], st.session_state['selected_function'],
+            st.session_state['selected_location'])
+
+
+@timed()
+def segment_score_distribution(column_index, filtered=True):
+    # score_distribution of the segment
+    counts = get_survey_context().counts.answers(column_index, *selected_filters(filtered))
+    total = counts.sum()
+    value_counts = counts / total * 100 if total else counts.astype(float)
+    return value_counts, median_of_counts(counts)
+
+
+@timed()
+def segment_summaries(column_index=None, answer=None):
+    # prepare_summaries of the respondents of the segment who gave answer to the question, or of all of them
+    counts = get_survey_context().counts
+    return summaries_from_counts(*(counts.breakdown(dimension, column_index, answer, *selected_filters())
+                                   for dimension in ('location', 'role', 'function')))
+
+
+@timed()
+def segment_drilldown(column_index):
+    # prepare_summaries of the segment for every answer of the question, None for all respondents. They are
+    # computed together the first time a dropdown of the question is drawn and kept in the session until the
+    # sidebar selections change, switching the dropdown then only looks them up
+    filters = selected_filters()
+    if st.session_state.get('drilldown_filters') != (selected_wave(), filters):
+        st.session_state['drilldown_filters'] = (selected_wave(), filters)
+        st.session_state['drilldowns'] = {}
+    drilldowns = st.session_state['drilldowns']
+    if column_index not in drilldowns:
+        breakdowns = get_survey_context().counts.drilldown(column_index, *filters)
+        drilldowns[column_index] = {
+            answer: summaries_from_counts(counts['location'], counts['role'], counts['function'])
+            for answer, counts in breakdowns.items()}
+    return drilldowns[column_index]
+
+
+def satisfaction_summaries(column_index, satisfaction_level):
+    # prepare_summaries of filter_by_satisfaction
+    if satisfaction_level == 'Select a satisfaction level':
+        return segment_drilldown(column_index)[None]
+    return segment_drilldown(column_index)[satisfaction_options.index(satisfaction_level)]
+
+
+def comfort_summaries(column_index, comfort_level):
+    # prepare_summaries of filter_by_comfort
+    if comfort_level == 'Select a comfort level':
+        return segment_drilldown(column_index)[None]
+    return segment_drilldown(column_index)[comfort_options.index(comfort_level)]
+
+
+def segment_answer_count(column_index, answer, filtered=True):
+    # Respondents of the segment who gave answer to a single choice question, e.g. 'Yes'
+    return get_survey_context().counts.answers(column_index, *selected_filters(filtered)).get(answer, 0)
+
+
+def segment_respondents(filtered=True):
+    # Respondents of the segment, of the whole export in out-of-core and SQL modes
+    return get_survey_context().counts.respondents(*selected_filters(filtered))
+
+
+def segment_multiselect_counts(filtered_data, column_index, column):
+    # multiselect_counts of the segment, from the options counted over the whole export in out-of-core and SQL modes
+    context = get_survey_context()
+    source = context.sql if context.sql is not None else context.aggregates
+    if source is None:
+        return multiselect_counts(filtered_data, column_index, column)
+    return source.multiselect_counts(column_index, column, *selected_filters())
+
+
+@timed()
+def segment_score_trend(column_index):
+    # Median, mean and share of scores 4 and 5 of a rating question in each wave of the survey store, for the
+    # respondents matching the sidebar filters, from the counts of each wave
+    return get_survey_store().score_trend(column_index, *selected_filters())
+
+
+@timed()
+def segment_answer_trend(column_index):
+    # Share of each answer to a question in each wave of the survey store, for the respondents of the segment
+    return get_survey_store().trend(column_index, *selected_filters())
+
+##### THIS SECTION FOR SATISFACTION SCORES ENDS ####
+
+
+##### THIS SECTION FOR SIDEBAR AND SENTIMENT ANALYSIS CHARTS START START START START ####
+# Near-duplicate comments are scored once per group and the result is shared with every member
+@st.cache_resource
+def load_comment_grouper():
+    return NearDuplicateGrouper()
+
+
+# VADER sentiment analyzer, the lexicon is downloaded on first use
+@st.cache_resource
+def load_sentiment_analyzer():
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon', quiet=True)
+    return SentimentIntensityAnalyzer()
+
+
+@timed()
+def score_sentiments(sentences):
+    # Compound VADER score of every sentence, computed once per group of near-duplicates
+    sentiment_analyzer = load_sentiment_analyzer()
+
+    def score_texts(texts):
+        with MODEL_INFERENCE_SECONDS.time(model='sentiment'):
+            return [sentiment_analyzer.polarity_scores(text)['compound'] for text in texts]
+
+    return load_comment_grouper().apply(sentences, score_texts)
+
+############ SENTIMENT ANALYSIS FUNCTION STARTS ############
+@persistent
+def wordcloud_image(text, stopwords):
+    # Pixels of the word cloud, cached as an array since drawing the layout is the slow part
+    return WordCloud(width=800, height=400, background_color='white', stopwords=set(stopwords),
+                     collocations=False).generate(text).to_array()
+
+
+@persistent
+def wordcloud_counts_image(word_counts, stopwords):
+    # wordcloud_image of a text given by the counts of its words, see modules.out_of_core
+    return WordCloud(width=800, height=400, background_color='white', collocations=False).generate_from_frequencies(
+        fold_word_counts(word_counts, stopwords)).to_array()
+
+
+@timed()
+def generate_wordclouds(df, score_col_idx, reasons_col_idx, custom_stopwords):
+    # Custom stopwords
+    stopwords_set = set(STOPWORDS)
+    stopwords_set.update(custom_stopwords)
+
+    # Filter the DataFrame for scores 4 and 5
+    df_high_scores = df[df.iloc[:, score_col_idx].isin([4, 5])]
+
+    # Filter the DataFrame for scores 1, 2, and 3
+    df_low_scores = df[df.iloc[:, score_col_idx].isin([1, 2, 3])]
+
+    # Generate the text for word clouds
+    text_high_scores = ' '.join(df_high_scores.iloc[:, reasons_col_idx].astype(str))
+    text_low_scores = ' '.join(df_low_scores.iloc[:, reasons_col_idx].astype(str))
+
+    # Generate the word clouds
+    wordcloud_high_scores = wordcloud_image(text_high_scores, sorted(stopwords_set))
+    wordcloud_low_scores = wordcloud_image(text_low_scores, sorted(stopwords_set))
+    draw_wordclouds(wordcloud_high_scores, wordcloud_low_scores)
+
+
+def segment_wordclouds(filtered_data, score_col_idx, reasons_col_idx, custom_stopwords):
+    # generate_wordclouds of the segment, from the words counted over the whole export in out-of-core mode
+    aggregates = get_survey_context().aggregates
+    if aggregates is None or (score_col_idx, reasons_col_idx) not in WORDCLOUD_PAIRS:
+        return generate_wordclouds(filtered_data, score_col_idx, reasons_col_idx, custom_stopwords)
+    stopwords = sorted(set(STOPWORDS) | set(custom_stopwords))
+    draw_wordclouds(*(wordcloud_counts_image(aggregates.word_counts(score_col_idx, reasons_col_idx, band,
+                                                                    *selected_filters()), stopwords)
+                      for band in ('high', 'low')))
+
+
+def draw_wordclouds(wordcloud_high_scores, wordcloud_low_scores):
+    # Create columns for displaying the word clouds side by side
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("<h3 style='text-align: center; font-size: 20px; font-weight: normal;'>Word Cloud for High Scores</h3>", unsafe_allow_html=True)
+        fig_high_scores, ax_high_scores = plt.subplots(figsize=(10, 5))
+        ax_high_scores.imshow(wordcloud_high_scores, interpolation='bilinear')
+        ax_high_scores.axis('off')
+        st.pyplot(fig_high_scores)
+
+    with col2:
+        st.markdown("<h3 style='text-align: center; font-size: 20px; font-weight: normal;'>Word Cloud for Low Scores</h3>", unsafe_allow_html=True)
+        fig_low_scores, ax_low_scores = plt.subplots(figsize=(10, 5))
+        ax_low_scores.imshow(wordcloud_low_scores, interpolation='bilinear')
+        ax_low_scores.axis('off')
+        st.pyplot(fig_low_scores)
+
+
+############ SENTIMENT ANALYSIS FUNCTION ENDS ############
+
+# Function for sentiment analysis dashboard
+
+def sentiment_dashboard(data_series, title):
+    # Sidebar for control
+    st.sidebar.markdown("### Filter Options")
+    show_wordcloud = st.sidebar.checkbox("Show Word Cloud", value=True)
+    filter_negative = st.sidebar.checkbox("Show Negative Comments", value=False)
+    filter_positive = st.sidebar.checkbox("Show Positive Comments", value=False)
+
+    # Initialize sentiment results and comment lists
+    sentiment_results = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
+    negative_comments = []
+    positive_comments = []
+
+    # Analyze sentiment once per group of near-duplicate comments and collect results
+    sentences = data_series.dropna().tolist()
+    compound_scores = score_sentiments(sentences)
+    for sentence, compound_score in zip(sentences, compound_scores):
+        if compound_score <= -0.05:
+            sentiment_results['Negative'] += 1
+            negative_comments.append((sentence, compound_score))
+        elif compound_score >= 0.05:
+            sentiment_results['Positive'] += 1
+            positive_comments.append((sentence, compound_score))
+        else:
+            sentiment_results['Neutral'] += 1
+
+    # Display word cloud
+    if show_wordcloud:
+        wordcloud = WordCloud(width=400, height=200, background_color='white').generate(' '.join(data_series.dropna()))
+        plt.imshow(wordcloud, interpolation='bilinear')
+        plt.axis("off")
+        st.pyplot(plt)  # Display word cloud in Streamlit
+
+    # Display top negative and positive comments
+    if filter_negative:
+        st.markdown("### Top 5 Negative Comments")
+        for comment, score in sorted(negative_comments, key=lambda x: x[1], reverse=True)[:5]:
+            st.write(f"{comment} (Score: {score:.4f})")
+
+    if filter_positive:
+        st.markdown("### Top 5 Positive Comments")
+        for comment, score in sorted(positive_comments, key=lambda x: x[1], reverse=True)[:5]:
+            st.write(f"{comment} (Score: {score:.4f})")
+
+    # Create stacked bar chart for sentiment distribution
+    total = sum(sentiment_results.values())
+    proportions = {k: v / total for k, v in sentiment_results.items()}
+
+    fig = go.Figure()
+    cumulative_size = 0
+    for sentiment, proportion in proportions.items():
+        color = 'lightgreen' if sentiment == 'Positive' else 'lightcoral' if sentiment == 'Negative' else 'lightgrey'
+        fig.add_trace(go.Bar(x=[proportion], y=['Sentiment'], orientation='h', name=sentiment, base=cumulative_size,
+                             marker=dict(color=color)))
+        cumulative_size += proportion
+
+    # Update layout and display chart in Streamlit
+    fig.update_layout(
+        title="Sentiment Distribution",
+        barmode='stack',
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False),
+    )
+
+    st.plotly_chart(fig)  # Display the stacked bar chart
+
+
+##### THIS SECTION FOR SIDEBAR AND SENTIMENT ANALYSIS CHARTS END END END END ####
@@ -0,0 +1,327 @@
+import json
+import time
+import zlib
+import pickle
+import hashlib
+import inspect
+import logging
+import functools
+import weakref
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the layout of the stored values changes, invalidates every entry
+FORMAT_VERSION = 2
+
+# First byte of a stored value, telling whether the pickle was compressed
+_RAW = b"p"
+_COMPRESSED = b"z"
+
+
+def frame_fingerprint(df):
+    """
+    Hashes the schema and the content of a DataFrame or a Series
+    """
+    frame = df.to_frame() if isinstance(df, pd.Series) else df
+    digest = hashlib.sha256()
+    digest.update(json.dumps([(str(column), str(dtype)) for column, dtype in frame.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def _source(code):
+    try:
+        return inspect.getsource(code)
+    except (OSError, TypeError):
+        return f"{code.__module__}.{code.__qualname__}"
+
+
+def _callees(fn):
+    """
+    Functions and classes of the package of fn that it refers to by a global name, or as an attribute of a module
+    """
+    if not inspect.isfunction(fn):
+        return []
+    names, codes = set(), [fn.__code__]
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        # Nested functions, lambdas and comprehensions have code objects of their own
+        codes.extend(constant for constant in code.co_consts if inspect.iscode(constant))
+    package = fn.__module__.split(".")[0]
+    callees = []
+    for name in sorted(names):
+        value = fn.__globals__.get(name)
+        for candidate in ([getattr(value, attribute, None) for attribute in sorted(names)]
+                          if inspect.ismodule(value) else [value]):
+            if callable(candidate):
+                candidate = inspect.unwrap(candidate)
+            if ((inspect.isfunction(candidate) or inspect.isclass(candidate))
+                    and candidate.__module__.split(".")[0] == package):
+                callees.append(candidate)
+    return callees
+
+
+@functools.lru_cache(maxsize=1024)
+def code_version(fn):
+    """
+    Hashes the source of a function and of the functions and classes of its package it calls by name, directly
+    or through their own callees, so its cached results are dropped as soon as any of them is edited.
+
+    Code reached any other way is not covered: methods called on objects, the callees of a class, functions
+    passed as arguments, constants and other packages. Bump FORMAT_VERSION after editing such code
+    """
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode("utf-8"))
+    seen, pending = {fn}, [fn]
+    while pending:
+        code = pending.pop(0)
+        digest.update(f"{code.__module__}.{code.__qualname__}:{_source(code)}".encode("utf-8"))
+        for callee in _callees(code):
+            if callee not in seen:
+                seen.add(callee)
+                pending.append(callee)
+    return digest.hexdigest()[:16]
+
+
+def pack(value, compress_min_bytes=64 * 1024):
+    """
+    Pickles a value, compressing it with zlib when the pickle is larger than compress_min_bytes
+    """
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(payload) < compress_min_bytes:
+        return _RAW + payload
+    compressed = zlib.compress(payload, 6)
+    # Arrays of images or floats barely compress, storing them raw saves the decompression
+    if len(compressed) > 0.9 * len(payload):
+        return _RAW + payload
+    return _COMPRESSED + compressed
+
+
+def unpack(payload):
+    if payload[:1] == _COMPRESSED:
+        return pickle.loads(zlib.decompress(payload[1:]))
+    if payload[:1] == _RAW:
+        return pickle.loads(payload[1:])
+    raise ValueError("Unknown cache payload format")
+
+
+class DerivedCache:
+    """
+    Results of the aggregations, scores and images derived from the survey, kept in a store
+    so they survive restarts and can be shared by several replicas. Entries are keyed by a hash
+    of the input tables, the version of the function code and the other parameters, and a
+    missing entry is computed by a single replica while the others wait for its result
+    """
+
+    def __init__(self, store, memory_entries=128, compress_min_bytes=64 * 1024, lock_ttl=300, wait_timeout=120,
+                 retry_after=30):
+        """
+        :param store: Backend holding the pickled results, see modules.cache_backends
+        :param memory_entries: Number of results also kept unpickled in memory
+        :param compress_min_bytes: Size of a pickle above which it is compressed before being stored
+        :param lock_ttl: Seconds after which the compute lock of a crashed replica expires
+        :param wait_timeout: Seconds to wait for another replica before computing the entry anyway
+        :param retry_after: Seconds the store is left alone after it failed, results are computed meanwhile
+        """
+        self.store = store
+        self.memory_entries = memory_entries
+        self.compress_min_bytes = compress_min_bytes
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # Version of each table still alive, by id, so a table is hashed once however many functions it is passed to
+        self._versions = {}
+        self._purged = set()
+        # Circuit breaker: a store that is down would add its connection timeouts to every call
+        self._store_down_until = 0.0
+        self.store_skips = 0
+
+    def dataset_version(self, value):
+        """
+        Fingerprint of a table, hashed the first time the table is seen unless derive_version gave it a version
+        """
+        known = self._versions.get(id(value))
+        if known is not None and known[0]() is value:
+            return known[1]
+        version = frame_fingerprint(value)
+        self._set_version(value, version)
+        return version
+
+    def derive_version(self, value, parent, *params):
+        """
+        Versions a table from the version of the table it was derived from and the parameters of the derivation,
+        e.g. the filters picked, instead of hashing its content. The table must not be modified afterwards
+        """
+        if value is parent:
+            return
+        payload = json.dumps([self.dataset_version(parent), params], sort_keys=True, default=repr)
+        self._set_version(value, hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+    def _set_version(self, value, version):
+        key = id(value)
+
+        def forget(reference):
+            # The id of a collected table is reused by the next object
+            if self._versions.get(key, (None,))[0] is reference:
+                self._versions.pop(key, None)
+
+        self._versions[key] = (weakref.ref(value, forget), version)
+
+    def make_key(self, fn, args, kwargs):
+        """
+        :return: Tuple of (key, code version), the key being "<qualified name>:<code version>:<content hash>"
+        """
+        tables = []
+        params = []
+        for value in list(args) + [kwargs[name] for name in sorted(kwargs)]:
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                tables.append(self.dataset_version(value))
+                params.append(None)
+            else:
+                params.append(value)
+        version = code_version(fn)
+        payload = json.dumps([fn.__module__, fn.__qualname__, tables, sorted(kwargs), params], sort_keys=True,
+                             default=repr)
+        content_hash = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{fn.__qualname__}:{version}:{content_hash}", version
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _store_up(self):
+        if time.monotonic() >= self._store_down_until:
+            return True
+        with self._lock:
+            self.store_skips += 1
+        return False
+
+    def _store_failed(self):
+        self._store_down_until = time.monotonic() + self.retry_after
+
+    def _load(self, key):
+        """
+        Reads an entry from the store, None when it is missing, unreadable or the store is down
+        """
+        if not self._store_up():
+            return None
+        try:
+            payload = self.store.get(key)
+        except Exception:
+            logger.warning("Cache store unavailable, reading %s failed, retrying in %ss", key, self.retry_after,
+                           exc_info=True)
+            self._store_failed()
+            return None
+        if payload is None:
+            return None
+        try:
+            return (unpack(payload),)
+        except Exception:
+            logger.warning("Dropping unreadable cache entry %s", key)
+            return None
+
+    def _save(self, fn, key, version, value):
+        try:
+            payload = pack(value, self.compress_min_bytes)
+        except Exception:
+            logger.warning("Result of %s cannot be pickled and is not persisted", fn.__qualname__)
+            return
+        if not self._store_up():
+            return
+        try:
+            if fn.__qualname__ not in self._purged:
+                # Results of older versions of the function can never be read again
+                self.store.purge(fn.__qualname__, version)
+                self._purged.add(fn.__qualname__)
+            self.store.put(key, payload)
+        except Exception:
+            logger.warning("Cache store unavailable, %s is not persisted", key, exc_info=True)
+            self._store_failed()
+
+    def _acquire(self, key):
+        if not self._store_up():
+            return ""
+        try:
+            return self.store.acquire(key, self.lock_ttl)
+        except Exception:
+            logger.warning("Cache store unavailable, computing %s without a lock", key, exc_info=True)
+            self._store_failed()
+            return ""
+
+    def _release(self, key, token):
+        if not token or not self._store_up():
+            return
+        try:
+            self.store.release(key, token)
+        except Exception:
+            logger.warning("Cache store unavailable, the lock of %s expires on its own", key, exc_info=True)
+            self._store_failed()
+
+    def get_or_compute(self, fn, *args, **kwargs):
+        """
+        Returns fn(*args, **kwargs) from the cache. On a miss, the replica taking the compute lock
+        of the entry computes and stores it while the others poll the store for its result
+        """
+        key, version = self.make_key(fn, args, kwargs)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        loaded = self._load(key)
+        token = None
+        if loaded is None:
+            token = self._acquire(key)
+            deadline = time.monotonic() + self.wait_timeout
+            delay = 0.02
+            while token is None:
+                with self._lock:
+                    self.waits += 1
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+                loaded = self._load(key)
+                if loaded is not None:
+                    break
+                token = self._acquire(key)
+                if token is None and time.monotonic() > deadline:
+                    logger.warning("Gave up waiting for another replica to compute %s", key)
+                    token = ""
+            else:
+                # The entry may have been stored between the first read and taking the lock
+                loaded = self._load(key)
+        if loaded is not None:
+            self._release(key, token)
+            with self._lock:
+                self.hits += 1
+                self._remember(key, loaded[0])
+            return loaded[0]
+
+        try:
+            with self._lock:
+                self.misses += 1
+            value = fn(*args, **kwargs)
+            self._save(fn, key, version, value)
+        finally:
+            self._release(key, token)
+        with self._lock:
+            self._remember(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        self.store.clear()
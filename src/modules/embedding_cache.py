@@ -0,0 +1,126 @@
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Model of the OpenAIEmbeddings of LangChain when none is given
+DEFAULT_EMBEDDING_MODEL = "text-embedding-ada-002"
+
+
+def embedding_model_id(embedder):
+    """
+    Identifier of the model an embedder runs, part of the cache key so that switching models never
+    serves the vectors of the previous one
+    :param embedder: Embedder instance, its model or model_name attribute or that of the LangChain
+                     embeddings it holds is used. An embedder exposing none builds the default
+                     OpenAIEmbeddings on each call and is identified by its class and that model
+    """
+    for source in (embedder, getattr(embedder, "embeddings", None)):
+        for attribute in ("model", "model_name"):
+            model = getattr(source, attribute, None)
+            if isinstance(model, str) and model:
+                return model
+    return f"{type(embedder).__module__}.{type(embedder).__qualname__}:{DEFAULT_EMBEDDING_MODEL}"
+
+
+class EmbeddingCache:
+    """
+    Persistent cache of document vectors keyed by the SHA-256 of the uploaded bytes
+    and the embedding model, with a small in-memory layer in front of the pickles on disk
+    """
+
+    def __init__(self, path="embeddings/cache", max_bytes=512 * 1024 * 1024, max_entries=200, memory_entries=8):
+        """
+        :param path: Directory where the pickled vectors are stored
+        :param max_bytes: Maximum total size of the pickles on disk before the least recently used are evicted
+        :param max_entries: Maximum number of documents kept on disk
+        :param memory_entries: Number of documents whose vectors are kept in memory
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def make_key(file_bytes, model_id=DEFAULT_EMBEDDING_MODEL):
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        model = hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:12]
+        return f"{digest}_{model}"
+
+    def _file_path(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def _remember(self, key, vectors):
+        self._memory[key] = vectors
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """
+        Returns the cached vectors for key, or None when the document was never embedded
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            file_path = self._file_path(key)
+            if not os.path.isfile(file_path):
+                return None
+            try:
+                with open(file_path, "rb") as f:
+                    vectors = pickle.load(f)
+            except Exception:
+                # A truncated pickle, or a stale one referring to classes that changed since, is treated
+                # as a miss and rebuilt. Unpickling raises about any exception on corrupt data
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+                return None
+            # The modification time doubles as the last access time for eviction
+            os.utime(file_path)
+            self._remember(key, vectors)
+            return vectors
+
+    def put(self, key, vectors):
+        with self._lock:
+            file_path = self._file_path(key)
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(vectors, f)
+            os.replace(tmp_path, file_path)
+            self._remember(key, vectors)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.path, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (total_bytes > self.max_bytes or len(entries) > self.max_entries):
+            _, size, name = entries.pop(0)
+            os.remove(os.path.join(self.path, name))
+            self._memory.pop(name[:-len(".pkl")], None)
+            total_bytes -= size
+
+    def get_or_create(self, file_bytes, create_fn, model_id=DEFAULT_EMBEDDING_MODEL):
+        """
+        Returns the vectors of a document, calling create_fn only when they are not cached yet
+        :param file_bytes: Raw content of the uploaded file
+        :param create_fn: Callable with no arguments computing the vectors
+        :param model_id: Identifier of the embedding model, part of the cache key
+        """
+        key = self.make_key(file_bytes, model_id)
+        vectors = self.get(key)
+        if vectors is None:
+            vectors = create_fn()
+            self.put(key, vectors)
+        return vectors
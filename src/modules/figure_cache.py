@@ -0,0 +1,150 @@
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.utils
+import streamlit as st
+
+from modules.derived_cache import code_version, pack, unpack
+
+# The fast path of plotly_chart_json fills the PlotlyChart message of the pinned Streamlit 1.22 itself,
+# whose figure field holds the spec and config. Other versions fall back to st.plotly_chart
+try:
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+except ImportError:
+    PlotlyChartProto = None
+
+logger = logging.getLogger(__name__)
+
+# Same config st.plotly_chart sends when no config is given
+_DEFAULT_CONFIG = json.dumps({"showLink": False, "linkText": False})
+
+
+def figure_to_json(fig):
+    """
+    Serializes a Plotly figure the way st.plotly_chart does
+    """
+    return json.dumps(fig.to_dict(), cls=plotly.utils.PlotlyJSONEncoder)
+
+
+def plotly_chart_json(spec, use_container_width=False, theme="streamlit"):
+    """
+    Displays a serialized Plotly figure without rebuilding, validating or encoding it again
+    """
+    if PlotlyChartProto is not None:
+        try:
+            # Message layout and private enqueue of Streamlit 1.22, see requirements.txt
+            proto = PlotlyChartProto()
+            proto.use_container_width = use_container_width
+            proto.figure.spec = spec
+            proto.figure.config = _DEFAULT_CONFIG
+            proto.theme = theme or ""
+            # The main delta generator writes to the container of the enclosing `with` block, like st.plotly_chart
+            enqueue = st._main._enqueue
+        except (AttributeError, TypeError, ValueError):
+            logger.warning("Unexpected PlotlyChart message in Streamlit %s, falling back to st.plotly_chart",
+                           st.__version__, exc_info=True)
+        else:
+            return enqueue("plotly_chart", proto)
+    # Public API, which parses and encodes the figure again
+    return st.plotly_chart(json.loads(spec), use_container_width=use_container_width, theme=theme)
+
+
+class FigureCache:
+    """
+    Serialized Plotly figures keyed by the aggregated table they are drawn from and the chart spec,
+    so a rerun with the same filters skips building the figure altogether. With a shared store,
+    a figure built by one replica is reused by the others
+    """
+
+    def __init__(self, max_entries=256, store=None):
+        """
+        :param max_entries: Number of figures kept before the least recently used one is dropped
+        :param store: Optional backend of modules.cache_backends shared with other processes
+        """
+        self.max_entries = max_entries
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def data_hash(data):
+        """
+        Hashes the aggregated input of a chart: a DataFrame, a Series or plain JSON-like values
+        """
+        digest = hashlib.sha256()
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            frame = data.to_frame() if isinstance(data, pd.Series) else data
+            digest.update(repr([(str(column), str(dtype)) for column, dtype in frame.dtypes.items()]).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+        else:
+            digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def make_key(self, build_fn, data, spec):
+        spec_text = json.dumps(spec, sort_keys=True, default=str)
+        return f"{build_fn.__module__}.{build_fn.__qualname__}:{self.data_hash(data)}:{spec_text}"
+
+    @staticmethod
+    def store_key(build_fn, key):
+        # Keys of the shared store carry the version of the builder, an edited builder never reads old figures
+        return f"figure.{build_fn.__qualname__}:{code_version(build_fn)}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def _load_shared(self, build_fn, key):
+        try:
+            payload = self.store.get(self.store_key(build_fn, key))
+            return unpack(payload) if payload is not None else None
+        except Exception:
+            logger.warning("Shared figure cache unavailable", exc_info=True)
+            return None
+
+    def _save_shared(self, build_fn, key, figure_json):
+        try:
+            self.store.put(self.store_key(build_fn, key), pack(figure_json))
+        except Exception:
+            logger.warning("Shared figure cache unavailable", exc_info=True)
+
+    def get_or_build(self, build_fn, data, **spec):
+        """
+        Returns the JSON of build_fn(data, **spec), building the figure only on a cache miss.
+        build_fn must depend on nothing but its arguments
+        """
+        key = self.make_key(build_fn, data, spec)
+        with self._lock:
+            figure_json = self._figures.get(key)
+            if figure_json is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return figure_json
+        figure_json = self._load_shared(build_fn, key) if self.store is not None else None
+        with self._lock:
+            if figure_json is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if figure_json is None:
+            figure_json = figure_to_json(build_fn(data, **spec))
+            if self.store is not None:
+                self._save_shared(build_fn, key, figure_json)
+        with self._lock:
+            self._figures[key] = figure_json
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+                self.evictions += 1
+        return figure_json
+
+    def plotly_chart(self, build_fn, data, use_container_width=False, **spec):
+        """
+        Displays build_fn(data, **spec) like st.plotly_chart, from the cache when the same chart was drawn before
+        """
+        return plotly_chart_json(self.get_or_build(build_fn, data, **spec), use_container_width=use_container_width)
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
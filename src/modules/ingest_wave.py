@@ -0,0 +1,53 @@
+"""
+Ingests the export of a survey wave into a survey store, see modules.survey_store
+
+Only the partition and the counts of this wave are written, the waves already in the store are
+neither read nor rewritten. Ingesting a wave id again replaces that wave.
+
+Usage:
+    python -m modules.ingest_wave --source "../data/Voice of Customer_Second data set.xlsx" --wave 2026Q2 \\
+        --date 2026-06-30 --store surveys
+"""
+import os
+import sys
+import time
+import inspect
+import argparse
+
+from modules.dashboard import load_data
+from modules.derived_cache import frame_fingerprint
+from modules.precompute import typed_survey
+from modules.survey_store import SurveyStore, StoreError
+
+
+def ingest_wave(source, wave_id, date, store):
+    """
+    :param source: Excel, CSV or Parquet export of the wave
+    :param store: Directory of the survey store, created with the first wave
+    :return: Catalog entry of the wave
+    """
+    data = typed_survey(inspect.unwrap(load_data)(source))
+    return SurveyStore(store).ingest(data, wave_id, date, os.path.abspath(source) if os.path.exists(source) else source,
+                                     frame_fingerprint(data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", required=True, help="Excel, CSV or Parquet export of the wave")
+    parser.add_argument("--wave", required=True, help="Id of the wave, e.g. 2026Q3")
+    parser.add_argument("--date", required=True, help="Date the wave closed, e.g. 2026-09-30")
+    parser.add_argument("--store", default="surveys", help="Directory of the survey store")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    try:
+        entry = ingest_wave(args.source, args.wave, args.date, args.store)
+    except StoreError as e:
+        print(e)
+        return 1
+    print(f"Ingested wave {entry['wave_id']} of {entry['date']} with {entry['rows']} respondents into {args.store} "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
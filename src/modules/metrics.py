@@ -0,0 +1,265 @@
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+METRICS_PORT_ENV = "DASHBOARD_METRICS_PORT"
+METRICS_ADDR_ENV = "DASHBOARD_METRICS_ADDR"
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base of the metric families, holding one value per combination of label values
+    """
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects the labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """
+        :return: List of (sample name, labels, value)
+        """
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observes the duration of the enclosed block in seconds, also when it raises
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                labels = dict(zip(self.labelnames, key))
+                for bound, count in zip(self.buckets, counts):
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, count))
+                samples.append((f"{self.name}_count", labels, counts[-1]))
+                samples.append((f"{self.name}_sum", labels, total))
+        return samples
+
+
+class CacheStats:
+    """
+    Hit, miss and eviction counts of a cache that does not count them itself
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def record(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+
+class MetricsRegistry:
+    """
+    Metric families of the process, plus the caches and gauges read only when the metrics are scraped
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def track_cache(self, name, cache):
+        """
+        Reports the hits, misses and evictions attributes of a cache under the given name,
+        a cache registered again under the same name replaces the previous one
+        """
+        with self._lock:
+            self._caches[name] = cache
+
+    def _cache_families(self):
+        with self._lock:
+            caches = dict(self._caches)
+        for attribute in ("hits", "misses", "evictions"):
+            yield (f"dashboard_cache_{attribute}_total", "counter", f"Cache {attribute} by cache",
+                   [(f"dashboard_cache_{attribute}_total", {"cache": name}, getattr(cache, attribute, 0))
+                    for name, cache in caches.items()])
+
+    def render(self):
+        """
+        :return: All the metrics in the Prometheus text exposition format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = [(metric.name, metric.kind, metric.documentation, metric.samples()) for metric in metrics]
+        families.extend(self._cache_families())
+        sessions = active_sessions()
+        if sessions is not None:
+            families.append(("dashboard_active_sessions", "gauge", "Browser sessions connected to the process",
+                             [("dashboard_active_sessions", {}, sessions)]))
+        families.append(("process_resident_memory_bytes", "gauge", "Resident memory size of the process",
+                         [("process_resident_memory_bytes", {}, resident_memory_bytes())]))
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{sample}{_format_labels(labels)} {_format_value(value)}" for sample, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+def active_sessions():
+    # The session manager is not public in Streamlit, None drops the gauge rather than failing the scrape
+    # when another version of Streamlit has no such attribute
+    try:
+        from streamlit.runtime import Runtime
+    except ImportError:
+        return None
+    if not Runtime.exists():
+        return 0
+    session_manager = getattr(Runtime.instance(), "_session_mgr", None)
+    count = getattr(session_manager, "num_active_sessions", None)
+    return count() if callable(count) else None
+
+
+def resident_memory_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current resident size where /proc is not available, macOS reports it in bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+REGISTRY = MetricsRegistry()
+
+RERUN_SECONDS = REGISTRY.register(Histogram(
+    "dashboard_rerun_duration_seconds", "Duration of a rerun of a dashboard page", ["dashboard"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)))
+MODEL_LOAD_SECONDS = REGISTRY.register(Histogram(
+    "dashboard_model_load_seconds", "Duration of loading a model", ["model"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)))
+MODEL_INFERENCE_SECONDS = REGISTRY.register(Histogram(
+    "dashboard_model_inference_seconds", "Duration of a batch of model predictions", ["model"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)))
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the Streamlit logs
+        pass
+
+
+def serve_metrics():
+    """
+    Starts the /metrics endpoint once per process when DASHBOARD_METRICS_PORT is set, e.g. to 9464,
+    on DASHBOARD_METRICS_ADDR (127.0.0.1 by default)
+    """
+    global _server
+    port = os.environ.get(METRICS_PORT_ENV, "")
+    if _server is not None or port.lower() in ("", "off", "false", "no"):
+        return _server or None
+    with _server_lock:
+        if _server is None:
+            address = os.environ.get(METRICS_ADDR_ENV, "127.0.0.1")
+            try:
+                _server = ThreadingHTTPServer((address, int(port)), MetricsHandler)
+            except OSError as e:
+                # Usually another replica of the same host, which has to be given its own port
+                logger.warning("Metrics endpoint not started on %s:%s: %s", address, port, e)
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, daemon=True, name="metrics").start()
+            logger.info("Serving metrics on http://%s:%s/metrics", address, _server.server_address[1])
+    return _server or None
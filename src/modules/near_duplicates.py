@@ -0,0 +1,153 @@
+import re
+import zlib
+import numpy as np
+
+# Prime modulus of the universal hash family (a * x + b) mod p
+_MERSENNE_PRIME = (1 << 31) - 1
+# Words flipping the meaning of a comment, "n't" is normalized to a separate t
+_NEGATIONS = frozenset({"not", "no", "never", "nor", "neither", "none", "nothing", "nobody", "nowhere", "without",
+                        "cannot", "t", "dont", "doesnt", "didnt", "isnt", "arent", "wasnt", "werent", "cant", "couldnt",
+                        "wont", "wouldnt", "shouldnt", "hasnt", "havent", "hadnt"})
+
+
+class NearDuplicateGrouper:
+    """
+    Groups near-identical free-text answers with MinHash signatures and LSH banding,
+    so the NLP models only have to score one canonical representative per group.
+
+    Every member gets the score of its representative, so the grouping errs on the side of not
+    merging: LSH candidates are checked against their exact shingle similarity, every comment of a
+    group is checked against the representative itself rather than chained through other members,
+    and comments with different negation words are never merged
+    """
+
+    def __init__(self, threshold=0.9, num_perm=128, bands=32, shingle_size=3, seed=42):
+        """
+        :param threshold: Minimum Jaccard similarity of the shingles of two comments for them to be merged
+        :param num_perm: Number of hash permutations in each MinHash signature
+        :param bands: Number of LSH bands, num_perm must be divisible by it
+        :param shingle_size: Length of the character shingles
+        :param seed: Seed of the random hash permutations
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+    @staticmethod
+    def normalize(text):
+        """
+        Lower-cases the text and strips punctuation and repeated whitespace
+        """
+        text = re.sub(r"[^\w\s]", " ", str(text).lower())
+        return re.sub(r"\s+", " ", text).strip()
+
+    def shingles(self, text):
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    @staticmethod
+    def negations(text):
+        """
+        Returns the negation words of an already normalized text, repeated as often as they occur
+        """
+        return sorted(word for word in text.split() if word in _NEGATIONS)
+
+    def similar(self, shingles_a, negations_a, shingles_b, negations_b):
+        """
+        Exact check of a pair of comments: same negation words and Jaccard similarity of their shingles
+        at least the threshold
+        """
+        if negations_a != negations_b:
+            return False
+        return len(shingles_a & shingles_b) / len(shingles_a | shingles_b) >= self.threshold
+
+    def signature(self, text):
+        """
+        Returns the MinHash signature of an already normalized text
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _MERSENNE_PRIME for s in self.shingles(text)),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def group(self, texts):
+        """
+        Assigns each text the position of its canonical representative
+        :param texts: Iterable of comments, missing values are never merged
+        :return: List where item i is the index of the representative of texts[i]
+        """
+        texts = list(texts)
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Exact duplicates after normalization share a signature, so hash them only once
+        first_seen = {}
+        signatures, shingles, negations = {}, {}, {}
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            normalized = self.normalize(text)
+            if normalized in first_seen:
+                parent[i] = first_seen[normalized]
+                continue
+            first_seen[normalized] = i
+            shingles[i] = self.shingles(normalized)
+            negations[i] = self.negations(normalized)
+            signatures[i] = self.signature(normalized)
+        # Distinct comments of each group, by the position of its representative
+        distinct = {i: [i] for i in signatures}
+
+        def merge(root_i, root_j):
+            # The group of the later representative joins the earlier one only when each of its distinct
+            # comments is similar to that representative, so groups never chain through their members
+            root_i, root_j = min(root_i, root_j), max(root_i, root_j)
+            if all(self.similar(shingles[root_i], negations[root_i], shingles[k], negations[k])
+                   for k in distinct[root_j]):
+                parent[root_j] = root_i
+                distinct[root_i].extend(distinct.pop(root_j))
+
+        buckets = {}
+        for i, sig in signatures.items():
+            for band in range(self.bands):
+                key = (band, sig[band * self.rows:(band + 1) * self.rows].tobytes())
+                buckets.setdefault(key, []).append(i)
+
+        # LSH candidates whose estimated similarity reaches the threshold are checked exactly before merging
+        for members in buckets.values():
+            for pos, i in enumerate(members):
+                for j in members[pos + 1:]:
+                    if find(i) == find(j):
+                        continue
+                    if np.mean(signatures[i] == signatures[j]) >= self.threshold:
+                        merge(find(i), find(j))
+
+        return [find(i) for i in range(len(texts))]
+
+    def apply(self, texts, score_fn):
+        """
+        Runs score_fn once per group of near-duplicates and fans the results out to every member
+        :param texts: Iterable of comments
+        :param score_fn: Callable taking a list of representative texts and returning one result per text
+        :return: List of results aligned with texts
+        """
+        texts = list(texts)
+        representatives = self.group(texts)
+        unique_positions = sorted(set(representatives))
+        results = score_fn([texts[i] for i in unique_positions])
+        by_position = dict(zip(unique_positions, results))
+        return [by_position[rep] for rep in representatives]
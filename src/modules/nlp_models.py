@@ -0,0 +1,105 @@
+import streamlit as st
+
+from modules.dashboard import load_comment_grouper, persistent
+from modules.metrics import MODEL_LOAD_SECONDS, MODEL_INFERENCE_SECONDS
+from modules.profiler import timed
+
+# transformers and torch are imported when a model is first used, so the pages render without them
+# until the analysis that needs them is opened
+
+SUMMARIZATION_MODEL = "csebuetnlp/mT5_multilingual_XLSum"
+EMOTION_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+EMOTION_MODEL_2 = "mrm8488/t5-base-finetuned-emotion"
+
+# Comments of the User Experience section run through the emotion models
+EMOTION_COLUMNS = [
+    'What could be improved or what kind of format is missing today ?',
+    'In the context of your job, what are the most valuable activities your current HRIS enable you to do?',
+    'In the context of your job, what do your current HRIS fail to address?',
+    'In 3 words, how would you describe your current user-experience with the HRIS\xa0?'
+]
+
+
+@st.cache_resource(show_spinner=False)
+def load_summarizer():
+    try:
+        from transformers import pipeline
+        with MODEL_LOAD_SECONDS.time(model='summarization'):
+            model = pipeline("summarization", model=SUMMARIZATION_MODEL)
+        return model
+    except Exception as e:
+        st.error(f"Error loading the summarizer model: {e}")
+        return None
+
+
+def summarize(summarizer, text):
+    with MODEL_INFERENCE_SECONDS.time(model='summarization'):
+        summary = summarizer(text, max_length=100, min_length=25, do_sample=False)
+    return summary[0]['summary_text']
+
+
+@st.cache_resource(show_spinner=False)
+def load_emotion_models():
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification, AutoModelForSeq2SeqLM
+
+    # Load the tokenizers and models
+    with MODEL_LOAD_SECONDS.time(model='emotion'):
+        tokenizer_1 = AutoTokenizer.from_pretrained(EMOTION_MODEL)
+        model_1 = AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL)
+
+        tokenizer_2 = AutoTokenizer.from_pretrained(EMOTION_MODEL_2)
+        model_2 = AutoModelForSeq2SeqLM.from_pretrained(EMOTION_MODEL_2)
+
+    return tokenizer_1, model_1, tokenizer_2, model_2
+
+
+@timed()
+@persistent
+def predict_emotions_hybrid(df, text_columns):
+    import torch
+
+    tokenizer_1, model_1, tokenizer_2, model_2 = load_emotion_models()
+
+    emotion_labels_1 = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+    emotion_labels_2 = ["anger", "joy", "optimism", "sadness"]
+
+    for column in text_columns:
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' does not exist in DataFrame")
+        df[column] = df[column].fillna("")
+
+    def predict_texts(texts):
+        with MODEL_INFERENCE_SECONDS.time(model='emotion'):
+            return predict_batch(texts)
+
+    def predict_batch(texts):
+        # Predictions from the first model
+        encoded_texts_1 = tokenizer_1(texts, padding=True, truncation=True, return_tensors='pt')
+        with torch.no_grad():
+            outputs_1 = model_1(**encoded_texts_1)
+            probabilities_1 = torch.nn.functional.softmax(outputs_1.logits, dim=-1)
+
+        # Predictions from the second model
+        encoded_texts_2 = tokenizer_2(texts, padding=True, truncation=True, return_tensors='pt')
+        with torch.no_grad():
+            outputs_2 = model_2.generate(input_ids=encoded_texts_2['input_ids'],
+                                         attention_mask=encoded_texts_2['attention_mask'])
+            predicted_labels_2 = [tokenizer_2.decode(output, skip_special_tokens=True) for output in outputs_2]
+            probabilities_2 = torch.tensor(
+                [[1 if label == emotion else 0 for emotion in emotion_labels_2] for label in predicted_labels_2])
+
+        # Adjust probabilities_2 to match the length of emotion_labels_1 by filling missing labels with zero probabilities
+        adjusted_probabilities_2 = torch.zeros(probabilities_2.size(0), len(emotion_labels_1))
+        for i, emotion in enumerate(emotion_labels_2):
+            if emotion in emotion_labels_1:
+                adjusted_probabilities_2[:, emotion_labels_1.index(emotion)] = probabilities_2[:, i]
+
+        # Average the probabilities
+        averaged_probabilities = (probabilities_1 + adjusted_probabilities_2) / 2
+        return [emotion_labels_1[probability.argmax()] for probability in averaged_probabilities]
+
+    for column in text_columns:
+        # Run both models only on the canonical comment of each near-duplicate group
+        df[f'{column}_predicted_emotion'] = load_comment_grouper().apply(df[column].tolist(), predict_texts)
+
+    return df
@@ -0,0 +1,274 @@
+"""
+Out-of-core aggregation of survey exports that do not fit in memory
+
+Reads a CSV or Parquet export chunk by chunk, with chunks sized to a memory budget, and merges the
+partial aggregates of every chunk: the counts behind the count cube, the options picked in the
+multi-select questions and the words of the word cloud comments, each by role, function and location.
+A uniform sample of the respondents, bounded by the same budget, is kept for the views that need rows.
+
+The dashboard aggregates its survey this way when SURVEY_MEMORY_BUDGET_MB is set, e.g.
+    SURVEY_DATA_PATH=data/survey_all_waves.parquet SURVEY_MEMORY_BUDGET_MB=2048 streamlit run Home.py
+"""
+import os
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from modules.analysis_bundle import FILTER_COLUMNS, LIKERT_COLUMNS, CHOICE_COLUMNS, MULTISELECT_COLUMNS, WORDCLOUD_PAIRS
+from modules.count_cube import CountCube
+
+DEFAULT_MEMORY_BUDGET_MB = 1024
+# Share of the budget kept for the sample of respondents, the rest bounds the chunk being aggregated
+SAMPLE_SHARE = 0.25
+# A chunk takes several times its own size while it is aggregated: split answers, exploded words and group keys
+CHUNK_OVERHEAD = 4
+PROBE_ROWS = 1000
+# Entries of partial counts kept apart before they are regrouped with the merged counts
+MERGE_ENTRIES = 100_000
+# Words as WordCloud.process_text finds them
+_WORD = r"\w[\w']*"
+
+
+def memory_budget():
+    """
+    :return: Memory budget in bytes from SURVEY_MEMORY_BUDGET_MB, None when out-of-core mode is off
+    """
+    budget = os.environ.get('SURVEY_MEMORY_BUDGET_MB')
+    return int(float(budget) * 2 ** 20) if budget else None
+
+
+def _unsupported(source):
+    return ValueError(f"{source} can't be read chunk by chunk, only CSV and Parquet exports can. "
+                      f"Export the survey as CSV or Parquet to aggregate it out of core")
+
+
+def _probe(source):
+    # First rows of the export, to measure the memory a respondent takes once parsed
+    if source.endswith('.parquet'):
+        return next(pq.ParquetFile(source).iter_batches(batch_size=PROBE_ROWS)).to_pandas()
+    if source.endswith('.csv'):
+        return pd.read_csv(source, nrows=PROBE_ROWS)
+    raise _unsupported(source)
+
+
+def row_bytes(source):
+    probe = _probe(source)
+    return max(1, int(probe.memory_usage(index=True, deep=True).sum() / max(len(probe), 1)))
+
+
+def sample_size(source, budget):
+    """
+    :return: Respondents of the sample kept in memory, SAMPLE_SHARE of the budget
+    """
+    return max(1, int(budget * SAMPLE_SHARE / row_bytes(source)))
+
+
+def iter_chunks(source, chunk_rows):
+    """
+    Yields the export as DataFrames of at most chunk_rows respondents
+    """
+    if source.endswith('.parquet'):
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif source.endswith('.csv'):
+        yield from pd.read_csv(source, chunksize=chunk_rows)
+    else:
+        raise _unsupported(source)
+
+
+def _count(segments, codes, keys, names):
+    """
+    Rows of each role, function and location and combination of the keys, missing values counted as values
+    :param segments: DataFrame of the distinct combinations of the filter columns in the chunk
+    :param codes: Array of the row of segments of each row of the chunk
+    :param keys: Arrays of the other keys, as long as codes
+    """
+    # The keys are packed with the segment in a single integer, the values are only looked up for the groups
+    combined = np.asarray(codes, dtype=np.int64)
+    values = []
+    for key in keys:
+        key_codes, key_values = pd.factorize(key, use_na_sentinel=False)
+        combined = combined * max(len(key_values), 1) + key_codes
+        values.append(np.asarray(key_values, dtype=object))
+    groups, counts = np.unique(combined, return_counts=True)
+    levels = []
+    for key_values in reversed(values):
+        size = max(len(key_values), 1)
+        levels.insert(0, key_values[groups % size] if len(key_values) else key_values)
+        groups = groups // size
+    index = pd.MultiIndex.from_arrays([segments[column].to_numpy()[groups] for column in FILTER_COLUMNS] + levels,
+                                      names=FILTER_COLUMNS + names)
+    return pd.Series(counts, index=index)
+
+
+class PartialCounts:
+    """
+    Counts of the chunks seen so far. The counts of new chunks are regrouped with the merged ones
+    only once they hold as many entries, or MERGE_ENTRIES, so each entry is regrouped a bounded
+    number of times
+    """
+
+    def __init__(self):
+        self._merged = None
+        self._pending = []
+        self._pending_size = 0
+
+    def add(self, counts):
+        self._pending.append(counts)
+        self._pending_size += len(counts)
+        if self._pending_size >= max(MERGE_ENTRIES, len(self._merged) if self._merged is not None else 0):
+            self._merge()
+
+    def _merge(self):
+        parts = self._pending if self._merged is None else [self._merged] + self._pending
+        # The respondents without a filter value or an answer are kept as a group of their own
+        self._merged = pd.concat(parts).groupby(level=list(range(parts[0].index.nlevels)), dropna=False).sum()
+        self._pending, self._pending_size = [], 0
+
+    @property
+    def counts(self):
+        if self._pending:
+            self._merge()
+        return self._merged
+
+
+def fold_word_counts(counts, stopwords):
+    """
+    Word frequencies as WordCloud.process_text computes them from the counts of the words found in the text:
+    stopwords removed, each word under its most common case and plurals merged into their singular
+    :param counts: Series of counts indexed by word, as found in the text
+    """
+    stopwords = {word.lower() for word in stopwords}
+    cases = defaultdict(dict)
+    for word, count in counts.items():
+        if word.lower() not in stopwords:
+            cases[word.lower()][word] = cases[word.lower()].get(word, 0) + count
+    for key in list(cases):
+        if key.endswith('s') and not key.endswith('ss') and key[:-1] in cases:
+            singular = cases[key[:-1]]
+            for word, count in cases.pop(key).items():
+                singular[word[:-1]] = singular.get(word[:-1], 0) + count
+    return {max(words.items(), key=lambda item: item[1])[0]: sum(words.values()) for words in cases.values()}
+
+
+class SurveyAggregates:
+    """
+    Aggregates of a whole survey export, merged chunk by chunk by add
+    """
+
+    def __init__(self, sample_rows, seed=0):
+        """
+        :param sample_rows: Respondents kept in the uniform sample
+        """
+        self.sample_rows = sample_rows
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self.columns = None
+        self._respondents = PartialCounts()
+        self._answers = defaultdict(PartialCounts)
+        self._options = defaultdict(PartialCounts)
+        self._words = defaultdict(PartialCounts)
+        self._sample = None
+        self._sample_keys = None
+        self._cube = None
+
+    def add(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        chunk = chunk.reset_index(drop=True)
+        # Role, function and location of the respondents as the position of their combination in segments
+        filters = chunk[FILTER_COLUMNS]
+        codes = filters.groupby(FILTER_COLUMNS, dropna=False, sort=False).ngroup().to_numpy()
+        segments = filters.drop_duplicates().reset_index(drop=True)
+        counts = pd.Series(np.bincount(codes), index=pd.MultiIndex.from_frame(segments))
+        self._respondents.add(counts)
+        for position in LIKERT_COLUMNS + CHOICE_COLUMNS:
+            self._answers[position].add(_count(segments, codes, [chunk.iloc[:, position].to_numpy()], ['answer']))
+        for position in MULTISELECT_COLUMNS:
+            # One row per option picked, repeating the position of the respondent in the index. As text, a CSV
+            # chunk where nobody answered the question reads the column as float
+            options = chunk.iloc[:, position].astype('string').str.rstrip(';').str.split(';').explode().dropna()
+            self._options[position].add(_count(segments, codes[options.index], [options.to_numpy(object)],
+                                               ['option']))
+        for score_position, comments_position in WORDCLOUD_PAIRS:
+            self._words[score_position, comments_position].add(
+                self._chunk_words(chunk, segments, codes, score_position, comments_position))
+        self._add_sample(chunk)
+        self.rows += len(chunk)
+        self._cube = None
+
+    @staticmethod
+    def _chunk_words(chunk, segments, codes, score_position, comments_position):
+        # Words of the comments of high and low scores, as generate_wordclouds joins them
+        scores = chunk.iloc[:, score_position]
+        band = np.select([scores.isin([4, 5]), scores.isin([1, 2, 3])], ['high', 'low'], '')
+        words = chunk.iloc[:, comments_position][band != ''].astype(str).str.findall(_WORD).explode().dropna()
+        counts = _count(segments, codes[words.index], [band[words.index], words.to_numpy()], ['band', 'word'])
+        # WordCloud drops the 's of possessives and the numbers, done once per distinct word
+        words = counts.index.get_level_values('word').astype(str)
+        stripped = pd.Index(np.where(words.str.lower().str.endswith("'s"), words.str[:-2], words))
+        levels = [counts.index.get_level_values(level) for level in range(counts.index.nlevels - 1)]
+        counts.index = pd.MultiIndex.from_arrays(levels + [stripped], names=counts.index.names)
+        counts = counts[~stripped.str.isdigit()]
+        return counts.groupby(level=list(range(counts.index.nlevels)), dropna=False).sum()
+
+    def _add_sample(self, chunk):
+        # Reservoir of the respondents with the smallest random keys, a uniform sample of all chunks seen
+        keys = pd.Series(self.rng.random(len(chunk)), index=np.arange(self.rows, self.rows + len(chunk)))
+        chunk = chunk.set_axis(keys.index)
+        if self._sample is not None:
+            keys = pd.concat([self._sample_keys, keys])
+            chunk = pd.concat([self._sample, chunk])
+        self._sample_keys = keys.nsmallest(self.sample_rows).sort_index()
+        self._sample = chunk.loc[self._sample_keys.index]
+
+    @property
+    def sample(self):
+        return self._sample.reset_index(drop=True)
+
+    @property
+    def cube(self):
+        if self._cube is None:
+            answers = {position: counts.counts for position, counts in self._answers.items()}
+            self._cube = CountCube.from_counts(self._respondents.counts, answers)
+        return self._cube
+
+    def _segment(self, counts, roles, functions, locations):
+        for level, values in enumerate((roles, functions, locations)):
+            if len(values):
+                counts = counts[counts.index.get_level_values(level).isin(list(values))]
+        return counts
+
+    def multiselect_counts(self, column_index, column, roles=(), functions=(), locations=()):
+        """
+        multiselect_counts of the respondents of the segment
+        """
+        options = self._segment(self._options[column_index].counts, roles, functions, locations)
+        counts = options.groupby(level='option').sum().sort_values(ascending=False, kind='stable')
+        counts = counts[counts > 0].reset_index()
+        counts.columns = [column, 'count']
+        counts['percentage'] = counts['count'] / self.cube.respondents(roles, functions, locations) * 100
+        return counts
+
+    def word_counts(self, score_position, comments_position, band, roles=(), functions=(), locations=()):
+        """
+        :param band: 'high' for the comments of scores 4 and 5, 'low' for scores 1 to 3
+        :return: Series of the counts of the words found in the comments of the segment, before fold_word_counts
+        """
+        words = self._segment(self._words[score_position, comments_position].counts, roles, functions, locations)
+        words = words[words.index.get_level_values('band') == band]
+        return words.groupby(level='word').sum().sort_index()
+
+
+def aggregate_survey(source, budget):
+    """
+    Aggregates a CSV or Parquet export chunk by chunk
+    :param budget: Memory budget in bytes of the sample and of the chunk being aggregated
+    """
+    chunk_rows = max(PROBE_ROWS, int(budget * (1 - SAMPLE_SHARE) / (row_bytes(source) * CHUNK_OVERHEAD)))
+    aggregates = SurveyAggregates(sample_size(source, budget))
+    for chunk in iter_chunks(source, chunk_rows):
+        aggregates.add(chunk)
+    return aggregates
@@ -0,0 +1,159 @@
+import io
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+
+def _extract_range(pdf_path, start, stop):
+    # Runs in a worker process, each worker opens its own handle on the document
+    with pdfplumber.open(pdf_path) as pdf:
+        return [(pdf.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+class PdfExtractor:
+    """
+    Extracts the text of a PDF page by page, parsing page ranges in a process pool
+    and caching every page on disk by the hash of the file. The least recently used
+    documents are evicted once the cache exceeds its size or document budget
+    """
+
+    def __init__(self, cache_dir="embeddings/pages", pages_per_task=16, max_workers=None,
+                 max_bytes=256 * 1024 * 1024, max_documents=100):
+        """
+        :param cache_dir: Directory where the extracted pages are stored, one sub-directory per file hash
+        :param pages_per_task: Number of pages parsed by a worker in one go
+        :param max_workers: Size of the process pool, defaults to the number of CPUs
+        :param max_bytes: Maximum total size of the cached pages before the least recently used documents are evicted
+        :param max_documents: Maximum number of documents whose pages are kept
+        """
+        self.cache_dir = cache_dir
+        self.pages_per_task = pages_per_task
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.max_documents = max_documents
+        # Documents being read or extracted by a session of this process, never evicted
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def _document_dir(self, file_bytes):
+        document_dir = os.path.join(self.cache_dir, hashlib.sha256(file_bytes).hexdigest())
+        os.makedirs(document_dir, exist_ok=True)
+        # The modification time doubles as the last access time for eviction
+        os.utime(document_dir)
+        return document_dir
+
+    @staticmethod
+    def _write_source(document_dir, file_bytes):
+        # Copy of the PDF the workers open, one per extraction and deleted once it is done
+        fd, pdf_path = tempfile.mkstemp(prefix="source.", suffix=".pdf", dir=document_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_bytes)
+        return pdf_path
+
+    @staticmethod
+    def _page_path(document_dir, page_number):
+        return os.path.join(document_dir, f"{page_number:05d}.txt")
+
+    def _read_cached(self, document_dir, start, stop):
+        pages = []
+        for i in range(start, stop):
+            page_path = self._page_path(document_dir, i)
+            if not os.path.isfile(page_path):
+                return None
+            with open(page_path, encoding="utf-8") as f:
+                pages.append(f.read())
+        return pages
+
+    def _write_cached(self, document_dir, start, pages):
+        # Written next to the page and renamed over it, a crash never leaves a partial page read as a hit
+        for offset, text in enumerate(pages):
+            page_path = self._page_path(document_dir, start + offset)
+            tmp_path = f"{page_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, page_path)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            document_dir = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(document_dir):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(document_dir) if entry.is_file())
+            entries.append((os.stat(document_dir).st_mtime, size, document_dir))
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        documents = len(entries)
+        for _, size, document_dir in entries:
+            if total_bytes <= self.max_bytes and documents <= self.max_documents:
+                break
+            if document_dir in self._active:
+                continue
+            shutil.rmtree(document_dir, ignore_errors=True)
+            total_bytes -= size
+            documents -= 1
+
+    @staticmethod
+    def page_count(pdf):
+        """
+        :param pdf: Path or raw content of the PDF
+        """
+        with pdfplumber.open(io.BytesIO(pdf) if isinstance(pdf, bytes) else pdf) as document:
+            return len(document.pages)
+
+    def iter_pages(self, file_bytes, max_pages=None):
+        """
+        Yields (page_number, text) in page order as soon as each range of pages is parsed
+        :param file_bytes: Raw content of the PDF
+        :param max_pages: Stop after this many pages, e.g. for a preview
+        """
+        with self._lock:
+            document_dir = self._document_dir(file_bytes)
+            self._active[document_dir] = self._active.get(document_dir, 0) + 1
+        pdf_path, executor, written = None, None, False
+        try:
+            total_pages = self.page_count(file_bytes)
+            if max_pages is not None:
+                total_pages = min(total_pages, max_pages)
+            ranges = [(start, min(start + self.pages_per_task, total_pages))
+                      for start in range(0, total_pages, self.pages_per_task)]
+
+            cached = {start: self._read_cached(document_dir, start, stop) for start, stop in ranges}
+            missing = [(start, stop) for start, stop in ranges if cached[start] is None]
+            if missing:
+                pdf_path = self._write_source(document_dir, file_bytes)
+                executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            futures = {start: executor.submit(_extract_range, pdf_path, start, stop) for start, stop in missing}
+            for start, _ in ranges:
+                pages = cached[start]
+                if pages is None:
+                    pages = futures[start].result()
+                    self._write_cached(document_dir, start, pages)
+                    written = True
+                for offset, text in enumerate(pages):
+                    yield start + offset, text
+        finally:
+            # Closing the generator early, e.g. after a preview, drops the ranges not started yet and waits
+            # for the running ones, which read the copy of the PDF deleted next
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if pdf_path is not None:
+                os.remove(pdf_path)
+            with self._lock:
+                self._active[document_dir] -= 1
+                if not self._active[document_dir]:
+                    del self._active[document_dir]
+                # Only new pages can take the cache over its budget, a cached read doesn't scan the directory
+                if written:
+                    self._evict()
+
+    def extract_text(self, file_bytes):
+        """
+        Returns the whole text of the PDF, pages separated by a blank line
+        """
+        return "\n\n".join(text for _, text in self.iter_pages(file_bytes))
@@ -0,0 +1,276 @@
+"""
+Offline precompute of the analysis bundle read by the dashboard, see modules.analysis_bundle
+
+Loads a survey export, writes its typed copy, then builds the components of the bundle in parallel
+worker processes: one task per question, and per chunk of respondents for the emotion models. The
+bundle is assembled next to its destination and only moved there once complete, so a scheduled run
+never leaves a half-written bundle behind.
+
+Usage:
+    python -m modules.precompute --source "../data/Voice of Customer_Second data set.xlsx" --output bundles/survey
+    python -m modules.precompute --source data/synthetic_1m.parquet --output bundles/survey --workers 8 \\
+        --components filters multiselect likert wordclouds sentiment topics
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import argparse
+import datetime
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from wordcloud import WordCloud, STOPWORDS
+
+from modules.analysis_bundle import (
+    BUNDLE_FORMAT_VERSION, MANIFEST, DATA_FILE, FILTER_COLUMNS, DATE_COLUMNS, LIKERT_COLUMNS, MULTISELECT_COLUMNS,
+    TEXT_COLUMNS, WORDCLOUD_PAIRS, FilterIndex
+)
+from modules.dashboard import load_data, score_sentiments
+from modules.derived_cache import code_version, frame_fingerprint
+from modules.nlp_models import EMOTION_COLUMNS, predict_emotions_hybrid
+from modules.topic_clusters import TopicClusterer
+
+COMPONENTS = ["filters", "multiselect", "likert", "wordclouds", "sentiment", "topics", "emotions"]
+
+# Axis the parts of each component are concatenated on when read together, None for separate tables
+AXES = {"filters": None, "multiselect": None, "likert": 0, "wordclouds": 0, "sentiment": 1, "topics": 1,
+        "topic_terms": 0, "emotions": 0}
+
+
+def typed_survey(data):
+    # CSV exports read the dates back as text
+    data = data.reset_index(drop=True)
+    for position in DATE_COLUMNS:
+        column = data.columns[position]
+        if data[column].dtype == object:
+            data[column] = pd.to_datetime(data[column], errors='coerce')
+    return data
+
+
+############ COMPONENT BUILDERS ############
+# Each builder receives the columns of its task in the order the task lists them and returns
+# a dict of component name to the DataFrame of its part
+
+def build_filters(data):
+    return {"filters": FilterIndex.from_data(data).codes}
+
+
+def build_multiselect(data):
+    # One boolean column per option of the semicolon separated answers
+    answers = data.iloc[:, 0]
+    return {"multiselect": answers.str.rstrip(';').str.get_dummies(';').astype(bool)}
+
+
+def build_likert(data):
+    # Respondents of each role, function and location giving each score, data holds the filters then the question
+    question = data.columns[-1]
+    counts = data.groupby(FILTER_COLUMNS + [question], dropna=False).size().rename('count').reset_index()
+    counts = counts.rename(columns={question: 'score'}).dropna(subset=['score'])
+    counts.insert(len(FILTER_COLUMNS), 'question', question)
+    return {"likert": counts}
+
+
+def build_wordclouds(data):
+    # Word counts as WordCloud draws them, of all the comments and, when data holds the rating they
+    # explain after them, of the comments of high and low scores as in generate_wordclouds
+    comments = data.iloc[:, 0]
+    bands = {'all': comments}
+    if data.shape[1] > 1:
+        scores = data.iloc[:, 1]
+        bands['high'] = comments[scores.isin([4, 5])]
+        bands['low'] = comments[scores.isin([1, 2, 3])]
+    wordcloud = WordCloud(stopwords=STOPWORDS, collocations=False)
+    rows = [(comments.name, band, word, count) for band, texts in bands.items()
+            for word, count in wordcloud.process_text(' '.join(texts.dropna().astype(str))).items()]
+    return {"wordclouds": pd.DataFrame(rows, columns=['question', 'band', 'word', 'count'])}
+
+
+def build_sentiment(data):
+    # Compound VADER score of each comment, missing for respondents who left none
+    comments = data.iloc[:, 0].dropna().astype(str)
+    scores = pd.Series(score_sentiments(comments.tolist()), index=comments.index, dtype=float)
+    return {"sentiment": scores.reindex(data.index).to_frame(data.columns[0])}
+
+
+def build_topics(data, topics=8):
+    question = data.columns[0]
+    labels, terms = TopicClusterer(topics=topics).fit(data[question].tolist())
+    return {
+        "topics": pd.DataFrame({question: labels}, index=data.index),
+        "topic_terms": pd.DataFrame({'question': question, 'topic': range(len(terms)),
+                                     'terms': [', '.join(topic_terms) for topic_terms in terms]}),
+    }
+
+
+def build_emotions(data):
+    # data holds the comments of one chunk of respondents. Outside of Streamlit the models are
+    # loaded again by every call, which is why the chunks are large
+    predicted = inspect.unwrap(predict_emotions_hybrid)(data.copy(), list(data.columns))
+    return {"emotions": predicted[[f'{column}_predicted_emotion' for column in data.columns]]}
+
+
+# Code each component depends on, a change of any of them changes the version of the bundle
+COMPONENT_CODE = {
+    "filters": [build_filters, FilterIndex],
+    "multiselect": [build_multiselect],
+    "likert": [build_likert],
+    "wordclouds": [build_wordclouds],
+    "sentiment": [build_sentiment, score_sentiments],
+    "topics": [build_topics, TopicClusterer],
+    "emotions": [build_emotions, predict_emotions_hybrid],
+}
+
+
+def plan_tasks(data, components, emotion_chunk_rows=2000, topics=8):
+    """
+    :return: List of tasks (component, part, builder, column names, rows range or None, builder parameters)
+    """
+    names = list(data.columns)
+    scores = {comments: score for score, comments in WORDCLOUD_PAIRS}
+    tasks = []
+    if "filters" in components:
+        tasks.append(("filters", "all", build_filters, FILTER_COLUMNS, None, {}))
+    if "multiselect" in components:
+        tasks.extend(("multiselect", str(i), build_multiselect, [names[i]], None, {}) for i in MULTISELECT_COLUMNS)
+    if "likert" in components:
+        tasks.extend(("likert", str(i), build_likert, FILTER_COLUMNS + [names[i]], None, {}) for i in LIKERT_COLUMNS)
+    if "wordclouds" in components:
+        tasks.extend(("wordclouds", str(i), build_wordclouds,
+                      [names[i]] + ([names[scores[i]]] if i in scores else []), None, {}) for i in TEXT_COLUMNS)
+    if "sentiment" in components:
+        tasks.extend(("sentiment", str(i), build_sentiment, [names[i]], None, {}) for i in TEXT_COLUMNS)
+    if "topics" in components:
+        tasks.extend(("topics", str(i), build_topics, [names[i]], None, {"topics": topics}) for i in TEXT_COLUMNS)
+    if "emotions" in components:
+        # Zero padded so the part files list in the order of the respondents
+        tasks.extend(("emotions", f"{start // emotion_chunk_rows:05d}", build_emotions, EMOTION_COLUMNS,
+                      (start, start + emotion_chunk_rows), {}) for start in range(0, len(data), emotion_chunk_rows))
+    return tasks
+
+
+def run_task(data_path, task):
+    """
+    Builds the parts of one task in a worker process, which reads only the columns it needs
+    """
+    component, part, builder, columns, rows, params = task
+    started = time.perf_counter()
+    data = pd.read_parquet(data_path, columns=columns)[columns]
+    if rows is not None:
+        data = data.iloc[rows[0]:rows[1]]
+    return builder(data, **params), time.perf_counter() - started
+
+
+def _versions(components):
+    versions = {}
+    for component in components:
+        digest = hashlib.sha256()
+        for code in COMPONENT_CODE[component]:
+            digest.update(code_version(inspect.unwrap(code)).encode("utf-8"))
+        versions[component] = digest.hexdigest()[:16]
+    return versions
+
+
+def _swap(staging, output):
+    # The previous bundle is moved aside before the new one takes its place, and deleted last
+    previous = None
+    if os.path.exists(output):
+        previous = f"{staging}.previous"
+        os.rename(output, previous)
+    os.rename(staging, output)
+    if previous is not None:
+        shutil.rmtree(previous)
+
+
+def build_bundle(source, output, workers=None, components=COMPONENTS, emotion_chunk_rows=2000, topics=8):
+    """
+    Builds the analysis bundle of a survey export
+    :param source: Excel, CSV or Parquet export of the survey
+    :param output: Directory of the bundle, replaced once the new one is complete
+    :param workers: Number of worker processes, the number of CPUs by default
+    :return: The manifest of the bundle, its "failed" entry lists the parts that could not be built
+    """
+    started = time.perf_counter()
+    data = typed_survey(inspect.unwrap(load_data)(source))
+    parent = os.path.dirname(os.path.abspath(output))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".bundle-", dir=parent)
+    try:
+        data_path = os.path.join(staging, DATA_FILE)
+        data.to_parquet(data_path, index=False)
+        tasks = plan_tasks(data, components, emotion_chunk_rows, topics)
+        written, failed, seconds = {}, {}, {}
+        # Spawned rather than forked, torch does not support being forked after it was initialized
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(run_task, data_path, task): task for task in tasks}
+            for future in as_completed(futures):
+                component, part = futures[future][:2]
+                try:
+                    results, seconds[f"{component}/{part}"] = future.result()
+                except Exception as e:
+                    failed[f"{component}/{part}"] = f"{type(e).__name__}: {e}"
+                    print(f"Failed {component}/{part}: {failed[f'{component}/{part}']}", flush=True)
+                    continue
+                written[(component, part)] = {}
+                for name, frame in results.items():
+                    os.makedirs(os.path.join(staging, name), exist_ok=True)
+                    written[(component, part)][name] = f"{name}/{part}.parquet"
+                    frame.to_parquet(os.path.join(staging, name, f"{part}.parquet"))
+                print(f"Built {component}/{part} in {seconds[f'{component}/{part}']:.1f}s", flush=True)
+
+        entries = {}
+        # Parts listed in the order of the tasks, not in the order the workers finished them
+        for component, part, *_ in tasks:
+            for name, file in written.get((component, part), {}).items():
+                entries.setdefault(name, {"axis": AXES[name], "parts": {}})["parts"][part] = file
+        versions = _versions(components)
+        fingerprint = frame_fingerprint(data)
+        manifest = {
+            "format_version": BUNDLE_FORMAT_VERSION,
+            "bundle_id": hashlib.sha256(json.dumps([fingerprint, versions]).encode("utf-8")).hexdigest()[:16],
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "source": os.path.abspath(source) if os.path.exists(source) else source,
+            "source_fingerprint": fingerprint,
+            "rows": len(data),
+            "code_versions": versions,
+            "components": entries,
+            "failed": failed,
+            "seconds": {"total": round(time.perf_counter() - started, 3),
+                        **{task: round(value, 3) for task, value in sorted(seconds.items())}},
+        }
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        _swap(staging, output)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", required=True, help="Excel, CSV or Parquet export of the survey")
+    parser.add_argument("--output", default="bundles/survey", help="Directory of the bundle")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes, one per CPU by default")
+    parser.add_argument("--components", nargs="+", choices=COMPONENTS, default=COMPONENTS)
+    parser.add_argument("--emotion-chunk-rows", type=int, default=2000,
+                        help="Respondents whose comments one task runs through the emotion models")
+    parser.add_argument("--topics", type=int, default=8, help="Topic clusters of each free text question")
+    args = parser.parse_args()
+    manifest = build_bundle(args.source, args.output, args.workers, args.components, args.emotion_chunk_rows,
+                            args.topics)
+    print(f"Wrote bundle {manifest['bundle_id']} of {manifest['rows']} respondents to {args.output} "
+          f"in {manifest['seconds']['total']:.1f}s")
+    if manifest["failed"]:
+        print(f"{len(manifest['failed'])} parts could not be built, see the failed entry of {MANIFEST}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import uuid
+import weakref
+import functools
+import threading
+import contextvars
+import tracemalloc
+from contextlib import contextmanager
+
+import streamlit as st
+import plotly.graph_objects as go
+
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_LOG_ENV = "DASHBOARD_PROFILE_LOG"
+PROFILE_BUDGET_ENV = "DASHBOARD_PROFILE_BUDGET_MS"
+# Allocations are only measured when the server enables it, tracemalloc slows down every session of the process
+PROFILE_MEMORY_ENV = "DASHBOARD_PROFILE_MEMORY"
+PROFILE_QUERY_PARAM = "profile"
+DEFAULT_LOG_PATH = "profiles/render_profile.jsonl"
+
+# tracemalloc is global to the process and shared by the sessions: the first profiled rerun starts it and
+# the last one to finish stops it. The memory it reports is that of the whole process, the profiler only
+# records it for the stages during which no other profiled rerun ran, and only such a rerun resets the peak
+_tracing_lock = threading.Lock()
+# Whether the profiler started tracemalloc, tracing started by someone else is left running
+_tracing_started = False
+# Profiled reruns in progress in any session, dropped by finish or once their rerun is gone
+_active_profilers = weakref.WeakSet()
+# Profiled reruns started so far, a stage overlapped by another profiled rerun records no memory
+_profiles_started = 0
+
+# Profiler of the rerun executing in the current script thread
+_current_profiler = contextvars.ContextVar("current_profiler", default=None)
+
+
+def _enabled(value):
+    return value.lower() in ("1", "true", "yes")
+
+
+def profiling_requested():
+    """
+    Profiling is on when DASHBOARD_PROFILE is set or the page is opened with ?profile=1
+    """
+    if _enabled(os.environ.get(PROFILE_ENV, "")):
+        return True
+    return any(_enabled(value) for value in st.experimental_get_query_params().get(PROFILE_QUERY_PARAM, []))
+
+
+class RenderProfiler:
+    """
+    Times the named stages and charts of one rerun of the dashboard, along with the memory the
+    process allocates meanwhile when DASHBOARD_PROFILE_MEMORY is set, then shows them as a waterfall
+    in the sidebar and appends them to a JSONL log. The memory is only recorded while no other session
+    is profiling
+    """
+
+    def __init__(self, enabled=False, log_path=DEFAULT_LOG_PATH, budget_ms=None, track_allocations=False):
+        """
+        :param enabled: When False every method is a no-op so the profiler can stay in the code
+        :param log_path: JSONL file receiving one record per stage, None to keep the records in memory only
+        :param budget_ms: Duration of the whole rerun above which the sidebar shows a warning
+        :param track_allocations: Whether to measure allocations with tracemalloc
+        """
+        global _profiles_started, _tracing_started
+        self.enabled = enabled
+        self.log_path = log_path
+        self.budget_ms = budget_ms
+        self.track_allocations = enabled and track_allocations
+        self.run_id = uuid.uuid4().hex
+        self.records = []
+        self._depth = 0
+        # Running peak of each open stage, tracemalloc keeps a single peak that nested stages reset
+        self._peaks = []
+        self._started = time.perf_counter()
+        if enabled:
+            with _tracing_lock:
+                _profiles_started += 1
+                _active_profilers.add(self)
+                if self.track_allocations and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing_started = True
+
+    def _alone(self):
+        # Whether this is the only profiled rerun in progress, with the number of profiled reruns started so far
+        with _tracing_lock:
+            return len(_active_profilers) == 1 and self in _active_profilers, _profiles_started
+
+    @classmethod
+    def from_request(cls):
+        budget = os.environ.get(PROFILE_BUDGET_ENV)
+        return cls(enabled=profiling_requested(), log_path=os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG_PATH),
+                   budget_ms=float(budget) if budget else None,
+                   track_allocations=_enabled(os.environ.get(PROFILE_MEMORY_ENV, "")))
+
+    @contextmanager
+    def stage(self, name, kind="stage"):
+        """
+        Times the enclosed block under the given name, kind is "stage" or "chart"
+        """
+        if not self.enabled:
+            yield
+            return
+        measured, epoch = self._alone() if self.track_allocations else (False, None)
+        if measured:
+            allocated_before, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(allocated_before)
+        started = time.perf_counter()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record = {
+                "name": name,
+                "kind": kind,
+                "depth": depth,
+                "start_ms": (started - self._started) * 1000,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+            }
+            if measured:
+                allocated, peak = tracemalloc.get_traced_memory()
+                peak = max(self._peaks.pop(), peak)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                # Left out when another profiled rerun overlapped the stage, its allocations would be counted
+                if self._alone() == (True, epoch):
+                    record["process_allocated_kb"] = (allocated - allocated_before) / 1024
+                    record["process_peak_kb"] = (peak - allocated_before) / 1024
+            self.records.append(record)
+
+    def total_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def waterfall(self):
+        records = sorted(self.records, key=lambda record: record["start_ms"])
+        labels = [f"{'  ' * record['depth']}{record['name']} ({i})" for i, record in enumerate(records)]
+        fig = go.Figure(go.Bar(
+            y=labels,
+            x=[record["duration_ms"] for record in records],
+            base=[record["start_ms"] for record in records],
+            orientation='h',
+            marker_color=['#5ec962' if record["kind"] == "chart" else '#3b528b' for record in records],
+            hovertext=[f"{record['duration_ms']:.1f} ms" + _peak_text(record) for record in records],
+        ))
+        fig.update_layout(height=max(200, 22 * len(records)), margin=dict(l=0, r=0, t=10, b=0), showlegend=False,
+                          xaxis_title='ms')
+        fig.update_yaxes(autorange='reversed')
+        return fig
+
+    def write_log(self, label):
+        if not self.log_path:
+            return
+        directory = os.path.dirname(self.log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        timestamp = time.time()
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps({"run_id": self.run_id, "timestamp": timestamp, "label": label, **record}) + "\n")
+
+    def finish(self, label):
+        """
+        Closes the profile of the rerun: logs it and shows the waterfall in the sidebar
+        :param label: Name of the rendered dashboard, recorded with every stage
+        """
+        global _tracing_started
+        if not self.enabled:
+            return
+        with _tracing_lock:
+            _active_profilers.discard(self)
+            # A rerun that never finishes drops out of the set once collected, the next one to finish stops tracing
+            if _tracing_started and not _active_profilers:
+                tracemalloc.stop()
+                _tracing_started = False
+        total = self.total_ms()
+        self.records.append({"name": "total", "kind": "run", "depth": 0, "start_ms": 0.0, "duration_ms": total})
+        self.write_log(label)
+        with st.sidebar.expander(f"Render profile: {total:.0f} ms", expanded=False):
+            if self.budget_ms is not None and total > self.budget_ms:
+                st.warning(f"Over the {self.budget_ms:.0f} ms budget by {total - self.budget_ms:.0f} ms")
+            st.plotly_chart(self.waterfall(), use_container_width=True)
+            slowest = sorted((record for record in self.records if record["kind"] != "run"),
+                             key=lambda record: record["duration_ms"], reverse=True)[:5]
+            for record in slowest:
+                st.caption(f"{record['name']}: {record['duration_ms']:.1f} ms{_peak_text(record)}")
+
+
+def _peak_text(record):
+    if "process_peak_kb" not in record:
+        return ""
+    return f", {record['process_peak_kb']:.0f} KB process peak"
+
+
+_disabled_profiler = RenderProfiler(enabled=False)
+
+
+def start_profile():
+    """
+    Starts the profile of the current rerun, to be called once at the top of every page
+    """
+    profiler = RenderProfiler.from_request()
+    _current_profiler.set(profiler)
+    return profiler
+
+
+def current_profiler():
+    return _current_profiler.get() or _disabled_profiler
+
+
+def stage(name, kind="stage"):
+    """
+    Times the enclosed block with the profiler of the current rerun
+    """
+    return current_profiler().stage(name, kind=kind)
+
+
+def timed(name=None, kind="stage"):
+    """
+    Decorator timing every call of a function with the profiler of the rerun it is called from,
+    so functions of shared modules can be decorated once at import time
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name or fn.__name__, kind=kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,208 @@
+"""
+Local stand-in for a Redis server, implementing the subset of commands used by RedisStore
+
+Keeps the values in memory with their expiry and evicts the least recently used ones above
+a size budget, like a Redis server configured with maxmemory-policy allkeys-lru. Meant to
+run the replicas of the dashboard on a single machine, or in benchmarks, without Redis.
+
+Usage:
+    python -m modules.resp_server --port 6379 --max-mb 512
+"""
+import time
+import fnmatch
+import argparse
+import threading
+import socketserver
+from collections import OrderedDict
+
+
+class MemoryKeyspace:
+    """
+    Values and expiry times of the stand-in, in least recently used order
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._values = OrderedDict()
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._delete(key)
+        return key in self._values
+
+    def _delete(self, key):
+        value = self._values.pop(key, None)
+        self._expires.pop(key, None)
+        if value is None:
+            return False
+        self.size -= len(key) + len(value)
+        return True
+
+    def get(self, key):
+        with self._lock:
+            if not self._alive(key):
+                return None
+            self._values.move_to_end(key)
+            return self._values[key]
+
+    def set(self, key, value, px=None, nx=False):
+        with self._lock:
+            if nx and self._alive(key):
+                return False
+            self._delete(key)
+            self._values[key] = value
+            self.size += len(key) + len(value)
+            if px is not None:
+                self._expires[key] = time.monotonic() + px / 1000
+            while self.size > self.max_bytes and len(self._values) > 1:
+                self._delete(next(iter(self._values)))
+            return True
+
+    def delete(self, keys):
+        with self._lock:
+            return sum(self._delete(key) for key in keys)
+
+    def exists(self, keys):
+        with self._lock:
+            return sum(self._alive(key) for key in keys)
+
+    def scan(self, cursor, pattern, count):
+        # The cursor is a position in the key list, keys added or removed during a scan may be missed
+        with self._lock:
+            keys = [key for key in list(self._values) if self._alive(key)]
+        page = keys[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        return next_cursor, [key for key in page if fnmatch.fnmatchcase(key.decode("latin-1"), pattern)]
+
+    def __len__(self):
+        return len(self._values)
+
+    def flush(self):
+        with self._lock:
+            self._values.clear()
+            self._expires.clear()
+            self.size = 0
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """
+    Reads RESP command arrays and answers them from the keyspace of the server
+    """
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, as sent by telnet or redis-cli --no-raw
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _write(self, reply):
+        if reply is None:
+            data = b"$-1\r\n"
+        elif isinstance(reply, Exception):
+            data = f"-ERR {reply}\r\n".encode()
+        elif isinstance(reply, bool):
+            data = b"+OK\r\n" if reply else b"$-1\r\n"
+        elif isinstance(reply, int):
+            data = f":{reply}\r\n".encode()
+        elif isinstance(reply, str):
+            data = f"+{reply}\r\n".encode()
+        elif isinstance(reply, bytes):
+            data = f"${len(reply)}\r\n".encode() + reply + b"\r\n"
+        else:
+            self.wfile.write(f"*{len(reply)}\r\n".encode())
+            for item in reply:
+                self._write(item)
+            return
+        self.wfile.write(data)
+
+    def handle(self):
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+            try:
+                reply = self.server.dispatch(args[0].decode().upper(), args[1:])
+            except Exception as e:
+                reply = e
+            self._write(reply)
+            self.wfile.flush()
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=("127.0.0.1", 6379), max_bytes=512 * 1024 * 1024):
+        self.keyspace = MemoryKeyspace(max_bytes)
+        super().__init__(address, RespHandler)
+
+    def dispatch(self, command, args):
+        keyspace = self.keyspace
+        if command == "PING":
+            return args[0] if args else "PONG"
+        if command in ("SELECT", "AUTH"):
+            return "OK"
+        if command == "GET":
+            return keyspace.get(args[0])
+        if command == "SET":
+            options = [arg.decode().upper() for arg in args[2:]]
+            px = None
+            if "PX" in options:
+                px = int(options[options.index("PX") + 1])
+            elif "EX" in options:
+                px = int(options[options.index("EX") + 1]) * 1000
+            return keyspace.set(args[0], args[1], px=px, nx="NX" in options)
+        if command == "DEL":
+            return keyspace.delete(args)
+        if command == "EXISTS":
+            return keyspace.exists(args)
+        if command == "SCAN":
+            options = [arg.decode() for arg in args[1:]]
+            pattern = options[options.index("MATCH") + 1] if "MATCH" in options else "*"
+            count = int(options[options.index("COUNT") + 1]) if "COUNT" in options else 10
+            cursor, keys = keyspace.scan(int(args[0]), pattern, count)
+            return [str(cursor).encode(), keys]
+        if command == "DBSIZE":
+            return len(keyspace)
+        if command == "FLUSHDB":
+            keyspace.flush()
+            return "OK"
+        raise ValueError(f"unknown command '{command}'")
+
+
+def serve_in_thread(port=0, max_bytes=512 * 1024 * 1024):
+    """
+    Starts a stand-in server on a background thread, port 0 picks a free port
+    :return: The server, its port is server.server_address[1]
+    """
+    server = RespServer(("127.0.0.1", port), max_bytes)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--max-mb", type=int, default=512, help="Memory budget before evicting entries")
+    args = parser.parse_args()
+    with RespServer((args.host, args.port), args.max_mb * 1024 * 1024) as server:
+        print(f"Listening on {args.host}:{server.server_address[1]}")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class AgentResponseCache:
+    """
+    In-memory cache of PandasAI answers keyed by the table fingerprint,
+    the normalized question and the model parameters
+    """
+
+    def __init__(self, ttl_seconds=3600, max_entries=256):
+        """
+        :param ttl_seconds: Lifetime of an entry, None keeps entries until they are evicted by size
+        :param max_entries: Maximum number of answers kept, the least recently used are evicted first
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+
+    @staticmethod
+    def fingerprint(df):
+        """
+        Hashes the schema and the content of a DataFrame
+        """
+        digest = hashlib.sha256()
+        schema = [(str(column), str(dtype)) for column, dtype in df.dtypes.items()]
+        digest.update(json.dumps(schema).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def normalize_prompt(prompt):
+        prompt = re.sub(r"\s+", " ", prompt.strip().lower())
+        return prompt.rstrip(" ?.!")
+
+    def table_fingerprint(self, df):
+        # Hashing a large table is not free, remember the fingerprint of the last table seen
+        cached = self._fingerprints.get(id(df))
+        if cached is None or cached[0] is not df:
+            cached = (df, self.fingerprint(df))
+            self._fingerprints = {id(df): cached}
+        return cached[1]
+
+    def make_key(self, df, prompt, model_params):
+        payload = json.dumps([self.table_fingerprint(df), self.normalize_prompt(prompt), model_params],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Returns (response, thoughts, plot_png) or None when the answer is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, response, thoughts, plot_png=None):
+        with self._lock:
+            self._entries[key] = (time.time(), (response, thoughts, plot_png))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
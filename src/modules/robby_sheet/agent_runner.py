@@ -0,0 +1,169 @@
+import sys
+import time
+import queue
+import threading
+import contextvars
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+# Output buffer and figures of the query running in the current worker, unset outside of a worker
+_captured_output = contextvars.ContextVar("captured_output", default=None)
+_figures = contextvars.ContextVar("figures", default=None)
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+class _ContextLocalStdout:
+    """
+    Stands in for sys.stdout and sends writes to the buffer of the current worker,
+    or to the real stdout when no query is running in this context
+    """
+
+    def __init__(self, default):
+        self._default = default
+
+    def _target(self):
+        captured = _captured_output.get()
+        return captured if captured is not None else self._default
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+def _install_hooks():
+    """
+    Installs the context-local stdout and the pyplot hooks once per process
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        sys.stdout = _ContextLocalStdout(sys.stdout)
+
+        # pyplot keeps a single current figure per process, inside a worker the current
+        # figure is the last one created by that worker instead
+        original_figure = plt.figure
+        original_gcf = plt.gcf
+
+        def figure(*args, **kwargs):
+            fig = original_figure(*args, **kwargs)
+            figures = _figures.get()
+            if figures is not None:
+                figures.append(fig)
+            return fig
+
+        def gcf():
+            figures = _figures.get()
+            if figures:
+                return figures[-1]
+            if figures is not None:
+                return figure()
+            return original_gcf()
+
+        plt.figure = figure
+        plt.gcf = gcf
+        _installed = True
+
+
+def _run_captured(fn, args, status):
+    # Runs in a worker thread, inside a fresh context owned by this query only
+    output = StringIO()
+    figures = []
+    _captured_output.set(output)
+    _figures.set(figures)
+    status.put("running")
+    try:
+        result = fn(*args)
+    finally:
+        for fig in figures:
+            # Drop the figure from pyplot, the object stays usable for savefig
+            plt.close(fig)
+    plotted = [fig for fig in figures if fig.get_axes()]
+    return result, output.getvalue(), plotted[-1] if plotted else None
+
+
+class AgentJob:
+    """
+    Handle on a query submitted to the AgentRunner
+    """
+
+    def __init__(self, future, status, cancel_event):
+        self.future = future
+        self.status = status
+        self.cancel_event = cancel_event
+        self.submitted_at = time.time()
+
+    def cancel(self):
+        """
+        Cancels the query, a query already waiting on the LLM finishes in the background and is discarded
+        """
+        self.cancel_event.set()
+        self.future.cancel()
+
+
+class AgentRunner:
+    """
+    Runs agent queries in a thread pool so each one gets its own output capture,
+    its own figures and a deadline, while the script thread streams its status
+    """
+
+    def __init__(self, max_workers=4, timeout=120, poll_interval=0.2):
+        """
+        :param max_workers: Number of queries running at the same time across all sessions
+        :param timeout: Default number of seconds before a query is abandoned
+        :param poll_interval: Number of seconds between two status updates
+        """
+        _install_hooks()
+        matplotlib.use("Agg")
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
+
+    def submit(self, fn, *args):
+        status = queue.Queue()
+        status.put("queued")
+        context = contextvars.Context()
+        future = self._executor.submit(context.run, _run_captured, fn, args, status)
+        return AgentJob(future, status, threading.Event())
+
+    def wait(self, job, status_callback=None, timeout=None):
+        """
+        Waits for a query, reporting its status from the calling thread
+        :param status_callback: Called with a short status message while the query runs
+        :param timeout: Number of seconds before TimeoutError is raised, defaults to the runner timeout
+        :return: Tuple of (result, captured output, last figure with axes or None)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = job.submitted_at + timeout
+        state = "queued"
+        try:
+            while True:
+                if job.cancel_event.is_set():
+                    raise CancelledError()
+                while not job.status.empty():
+                    state = job.status.get_nowait()
+                if status_callback is not None:
+                    status_callback(f"Agent {state}... {time.time() - job.submitted_at:.1f}s")
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"The agent did not answer within {timeout} seconds")
+                done, _ = wait([job.future], timeout=min(self.poll_interval, remaining))
+                if done:
+                    return job.future.result()
+        except BaseException:
+            # Also covers Streamlit stopping the script when the user interacts with the page
+            job.cancel()
+            raise
+
+    def run(self, fn, *args, status_callback=None, timeout=None):
+        return self.wait(self.submit(fn, *args), status_callback=status_callback, timeout=timeout)
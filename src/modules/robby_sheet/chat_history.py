@@ -0,0 +1,111 @@
+import os
+import json
+import uuid
+import tempfile
+
+import streamlit as st
+
+
+class ChatHistoryStore:
+    """
+    Chat history of a session that keeps only the recent messages in session state,
+    spills older ones to a per-session JSONL file and renders a window of the last turns
+    """
+
+    def __init__(self, window_turns=10, max_memory_turns=50, max_memory_bytes=256 * 1024, spill_dir=None,
+                 state=None):
+        """
+        :param window_turns: Number of (question, answer) turns rendered before the user asks for more
+        :param max_memory_turns: Number of turns kept in session state before spilling to disk
+        :param max_memory_bytes: Approximate size of the in-memory history before spilling to disk
+        :param spill_dir: Directory of the per-session logs, defaults to a folder in the system temp directory
+        :param state: Mapping holding the history, defaults to st.session_state
+        """
+        self.window_turns = window_turns
+        self.max_memory_turns = max(max_memory_turns, window_turns)
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = spill_dir or os.path.join(tempfile.gettempdir(), "chat_history")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.state = st.session_state if state is None else state
+
+    def _init_state(self):
+        if "chat_history" not in self.state:
+            self.state["chat_history"] = []
+        if "chat_history_id" not in self.state:
+            self.state["chat_history_id"] = uuid.uuid4().hex
+            self.state["chat_history_spilled"] = 0
+            self.state["chat_history_pages"] = 0
+        if not self.state["chat_history"] and self.state["chat_history_spilled"]:
+            # The history was reset elsewhere, forget the older messages as well
+            self._remove_log()
+
+    def _log_path(self):
+        return os.path.join(self.spill_dir, f"{self.state['chat_history_id']}.jsonl")
+
+    def _remove_log(self):
+        if os.path.isfile(self._log_path()):
+            os.remove(self._log_path())
+        self.state["chat_history_spilled"] = 0
+        self.state["chat_history_pages"] = 0
+
+    def memory_bytes(self):
+        return sum(len(str(text).encode("utf-8")) for _, text in self.state["chat_history"])
+
+    def append(self, sender, text):
+        self._init_state()
+        self.state["chat_history"].append((sender, text))
+        self._spill()
+
+    def _spill(self):
+        history = self.state["chat_history"]
+        keep = 2 * self.window_turns
+        over_turns = len(history) - 2 * self.max_memory_turns
+        to_spill = max(over_turns, 0)
+        # Spill the oldest messages until the size budget is met, the rendered window always stays in memory
+        while (len(history) - to_spill > keep
+               and sum(len(str(text).encode("utf-8")) for _, text in history[to_spill:]) > self.max_memory_bytes):
+            to_spill += 2
+        to_spill = min(to_spill, max(len(history) - keep, 0))
+        if to_spill <= 0:
+            return
+        with open(self._log_path(), "a", encoding="utf-8") as f:
+            for sender, text in history[:to_spill]:
+                f.write(json.dumps({"sender": sender, "text": str(text)}) + "\n")
+        del history[:to_spill]
+        self.state["chat_history_spilled"] += to_spill
+
+    def _load_spilled(self, start):
+        # Messages from position start up to the first message still in memory
+        messages = []
+        with open(self._log_path(), encoding="utf-8") as f:
+            for position, line in enumerate(f):
+                if position >= start:
+                    entry = json.loads(line)
+                    messages.append((entry["sender"], entry["text"]))
+        return messages
+
+    def render(self, message_fn):
+        """
+        Renders the last turns with message_fn(text, is_user, key), with a button to page through older turns
+        """
+        self._init_state()
+        spilled = self.state["chat_history_spilled"]
+        in_memory = self.state["chat_history"]
+        total = spilled + len(in_memory)
+        shown = min(2 * self.window_turns * (1 + self.state["chat_history_pages"]), total)
+        first = total - shown
+
+        if first > 0 and st.button(f"Show older messages ({first // 2} more turns)", key="chat_history_older"):
+            self.state["chat_history_pages"] += 1
+            shown = min(shown + 2 * self.window_turns, total)
+            first = total - shown
+
+        messages = in_memory[max(first - spilled, 0):]
+        if first < spilled:
+            messages = self._load_spilled(first) + messages
+        for offset, (sender, message_text) in enumerate(messages):
+            i = first + offset
+            message_fn(message_text, sender == "user", f"{i}_user" if sender == "user" else f"{i}")
+
+        st.caption(f"Chat history: {total // 2} turns, {self.memory_bytes() / 1024:.1f} KB in memory, "
+                   f"{spilled // 2} turns on disk")
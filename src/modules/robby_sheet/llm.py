@@ -0,0 +1,61 @@
+import time
+import threading
+
+from pandasai.llm.base import LLM
+from pandasai.llm.openai import OpenAI
+
+from modules.robby_sheet.table_digest import estimate_tokens
+
+
+def openai_llm(**model_params):
+    """
+    Default LLM factory of the PandasAgent
+    """
+    return OpenAI(**model_params)
+
+
+class LocalLLM(LLM):
+    """
+    Deterministic stand-in for the OpenAI LLM, answering scripted code after a configurable
+    delay so the PandasAgent path can be exercised and timed without a live endpoint
+    """
+
+    def __init__(self, responses=None, default_code="df.shape[0]", answer="This is a scripted answer.",
+                 latency=0.0, completion_tokens=None):
+        """
+        :param responses: Dict mapping a lower-case substring of the question to the code returned for it
+        :param default_code: Code returned when no scripted response matches
+        :param answer: Text returned for the conversational answer calls
+        :param latency: Number of seconds each call takes
+        :param completion_tokens: Fixed completion size per call, defaults to the estimated size of the response
+        """
+        self.responses = responses or {}
+        self.default_code = default_code
+        self.answer = answer
+        self.latency = latency
+        self.completion_tokens = completion_tokens
+        self.calls = 0
+        self.prompt_tokens_used = 0
+        self.completion_tokens_used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def type(self):
+        return "local"
+
+    def call(self, instruction, value="", suffix=""):
+        prompt = str(instruction) + str(value) + suffix
+        self.last_prompt = prompt
+        if "Code:" in suffix:
+            question = str(value).lower()
+            response = next((code for key, code in self.responses.items() if key in question), self.default_code)
+        else:
+            # PandasAI asks for a conversational answer without a code suffix
+            response = self.answer
+        time.sleep(self.latency)
+        completion = self.completion_tokens if self.completion_tokens is not None else estimate_tokens(response)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens_used += estimate_tokens(prompt)
+            self.completion_tokens_used += completion
+        return response
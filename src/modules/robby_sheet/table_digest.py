@@ -0,0 +1,122 @@
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Words that never identify a column on their own
+_STOPWORDS = {
+    "the", "and", "for", "with", "what", "which", "how", "many", "much", "are", "is", "of", "per", "by",
+    "show", "plot", "give", "list", "from", "that", "this", "have", "has", "all", "each", "average", "mean",
+    "total", "number", "count", "top", "most", "least", "between", "over", "chart", "table",
+}
+
+
+def estimate_tokens(text, model="gpt-3.5-turbo"):
+    """
+    Estimates the number of tokens of a prompt with the local tokenizer when it is installed
+    """
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return len(encoding.encode(text))
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+
+def _words(text):
+    return {word for word in re.findall(r"[a-z0-9]+", str(text).lower()) if len(word) > 2 and word not in _STOPWORDS}
+
+
+class TableDigest:
+    """
+    Compact and anonymous description of a table: column types, cardinalities and numeric summaries.
+    The most frequent values of the text columns are only kept to match the question against, no value
+    nor row of the table is ever rendered into the prompt
+    """
+
+    def __init__(self, df, top_values=5):
+        """
+        :param df: Uploaded DataFrame
+        :param top_values: Number of most frequent values of the text columns matched against the question
+        """
+        self.num_rows, self.num_columns = df.shape
+        self.columns = OrderedDict()
+        for column in df.columns:
+            series = df[column]
+            info = {"dtype": str(series.dtype), "missing": int(series.isna().sum()), "unique": int(series.nunique())}
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                described = series.describe()
+                info["summary"] = {stat: float(described[stat]) for stat in ("min", "mean", "50%", "max")
+                                   if stat in described and pd.notna(described[stat])}
+            else:
+                info["top"] = [str(value) for value in series.value_counts().head(top_values).index]
+            self.columns[column] = info
+
+    def relevant_columns(self, query, max_categories=50):
+        """
+        Returns the columns whose name or categories are mentioned in the query,
+        or every column when nothing matches
+        :param max_categories: Values of columns with more distinct values are free text and are not matched
+        """
+        query_words = _words(query)
+        matches = []
+        for column, info in self.columns.items():
+            column_words = _words(column)
+            if info["unique"] <= max_categories:
+                for value in info.get("top", []):
+                    column_words |= _words(value)
+            if query_words & column_words:
+                matches.append(column)
+        return matches or list(self.columns)
+
+    def to_text(self, columns=None):
+        """
+        Renders the schema and the summaries of the given columns as plain text for the prompt, the other
+        columns are only named
+        """
+        columns = list(self.columns) if columns is None else columns
+        lines = []
+        others = [str(column) for column in self.columns if column not in columns]
+        for column in columns:
+            info = self.columns[column]
+            line = f"- {column} ({info['dtype']}, {info['unique']} unique, {info['missing']} missing)"
+            if "summary" in info:
+                line += ": " + ", ".join(f"{stat}={value:g}" for stat, value in info["summary"].items())
+            lines.append(line)
+        if others:
+            lines.append("Other columns: " + ", ".join(others))
+        return "\n".join(lines)
+
+
+class DigestStore:
+    """
+    Keeps the digests of the last uploaded tables so they are computed once per upload
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint, df):
+        with self._lock:
+            digest = self._digests.get(fingerprint)
+            if digest is not None:
+                self._digests.move_to_end(fingerprint)
+                return digest
+        # Built outside of the lock, two sessions uploading the same table at once both build its digest
+        digest = TableDigest(df)
+        with self._lock:
+            self._digests[fingerprint] = digest
+            self._digests.move_to_end(fingerprint)
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return digest
@@ -1,13 +1,48 @@
+import os
 import re
-import sys
+import time
 from io import StringIO, BytesIO
-import matplotlib.pyplot as plt
+from concurrent.futures import CancelledError
 import streamlit as st
 from langchain.callbacks import get_openai_callback
 from streamlit_chat import message
 
 from pandasai import PandasAI
-from pandasai.llm.openai import OpenAI
+from pandasai.prompts.generate_python_code import GeneratePythonCodePrompt
+
+from modules.robby_sheet.llm import openai_llm
+from modules.robby_sheet.agent_cache import AgentResponseCache
+from modules.robby_sheet.table_digest import DigestStore, estimate_tokens
+from modules.robby_sheet.agent_runner import AgentRunner
+from modules.robby_sheet.chat_history import ChatHistoryStore
+
+
+@st.cache_resource
+def get_response_cache():
+    # Shared by every session, repeated questions on the same table never reach the LLM twice
+    return AgentResponseCache()
+
+
+@st.cache_resource
+def get_digest_store():
+    return DigestStore()
+
+
+@st.cache_resource
+def get_agent_runner():
+    # One pool for the whole process, bounding the number of concurrent LLM calls
+    return AgentRunner(max_workers=int(os.environ.get("AGENT_MAX_WORKERS", 4)))
+
+
+def digest_prompt(digest_text):
+    """
+    Code generation prompt of PandasAI describing the table with its digest instead of its first rows
+    """
+    class DigestPrompt(GeneratePythonCodePrompt):
+        def __init__(self, **kwargs):
+            super().__init__(**dict(kwargs, df_head=digest_text))
+
+    return DigestPrompt
 
 class PandasAgent :
 
@@ -22,30 +57,96 @@ class PandasAgent :
 
         return result
     
-    def __init__(self):
-        pass
+    def __init__(self, model_params=None, timeout=120, history_window=10, llm_factory=openai_llm):
+        # Extra arguments of the LLM, they are part of the response cache key
+        self.model_params = model_params or {}
+        # Callable building the LLM from the model parameters, e.g. a LocalLLM for benchmarks
+        self.llm_factory = llm_factory
+        # Number of seconds before a query is abandoned
+        self.timeout = timeout
+        # Only the last turns are rendered, older ones are paged in on demand
+        self.chat_history = ChatHistoryStore(window_turns=history_window)
+        # Duration in seconds of each stage of the last get_agent_response call
+        self.last_timings = {}
+        # Process-wide helpers, held on the instance so a benchmark can run outside of the Streamlit runtime
+        self.response_cache = get_response_cache()
+        self.digest_store = get_digest_store()
+        self.runner = get_agent_runner()
+
+    def run_query(self, data_frame, prompt, digest_text=None):
+        """
+        Runs PandasAI on a worker thread of the AgentRunner
+        :param digest_text: Description of the table sent instead of the first rows PandasAI sends by default
+        """
+        llm = self.llm_factory(**self.model_params)
+        prompts = {"generate_python_code": digest_prompt(digest_text)} if digest_text is not None else None
+        # Answers are cached by AgentResponseCache, whose key also covers the table unlike the PandasAI cache
+        pandas_ai = PandasAI(llm, verbose=True, enable_cache=False, non_default_prompts=prompts)
+        return pandas_ai.run(data_frame=data_frame, prompt=prompt)
 
     def get_agent_response(self, uploaded_file_content, query):
-        llm = OpenAI()
-        pandas_ai = PandasAI(llm, verbose=True)
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = StringIO()
-        
-        response = pandas_ai.run(data_frame = uploaded_file_content, prompt=query)
-        fig = plt.gcf()
-        if fig.get_axes():
-                    # Adjust the figure size
+        self.last_timings = {}
+        started = stage_started = time.perf_counter()
+
+        def end_stage(name):
+            nonlocal stage_started
+            now = time.perf_counter()
+            self.last_timings[name] = now - stage_started
+            self.last_timings["total"] = now - started
+            stage_started = now
+
+        cache = self.response_cache
+        model_key = dict(self.model_params, llm=getattr(self.llm_factory, "__qualname__", repr(self.llm_factory)))
+        cache_key = cache.make_key(uploaded_file_content, query, model_key)
+        cached = cache.get(cache_key)
+        end_stage("cache_lookup")
+        if cached is not None:
+            response, thoughts, plot_png = cached
+            if plot_png is not None:
+                st.image(BytesIO(plot_png), caption="Generated Plot")
+            end_stage("plot_capture")
+            return response, StringIO(thoughts)
+
+        # The prompt describes the columns the question refers to with the digest built once per upload, in place
+        # of the first rows of the table, so no answer of the table is sent to the LLM. The agent still gets the
+        # whole table: a question may need columns it doesn't name, e.g. to group by
+        digest = self.digest_store.get(cache.table_fingerprint(uploaded_file_content), uploaded_file_content)
+        digest_text = digest.to_text(digest.relevant_columns(query))
+        data_frame = uploaded_file_content
+        instruction = digest_prompt(digest_text)(num_rows=data_frame.shape[0], num_columns=data_frame.shape[1])
+        estimated_tokens = estimate_tokens(str(instruction) + query, self.model_params.get("model", "gpt-3.5-turbo"))
+        st.caption(f"Estimated prompt size: ~{estimated_tokens} tokens")
+        end_stage("prompt")
+
+        # The query runs on a worker with its own stdout capture and figures, this thread only reports progress
+        status = st.empty()
+        try:
+            response, thoughts, fig = self.runner.run(
+                self.run_query, data_frame, query, digest_text, status_callback=status.caption, timeout=self.timeout
+            )
+        except (TimeoutError, CancelledError):
+            status.empty()
+            end_stage("agent")
+            return f"The agent did not answer within {self.timeout} seconds, please try again.", StringIO()
+        status.empty()
+        end_stage("agent")
+
+        plot_png = None
+        if fig is not None:
+            # Adjust the figure size
             fig.set_size_inches(12, 6)
 
             # Adjust the layout tightness
-            plt.tight_layout()
+            fig.tight_layout()
             buf = BytesIO()
             fig.savefig(buf, format="png")
+            plot_png = buf.getvalue()
             buf.seek(0)
             st.image(buf, caption="Generated Plot")
-        
-        sys.stdout = old_stdout
-        return response, captured_output
+
+        cache.put(cache_key, response, thoughts, plot_png)
+        end_stage("plot_capture")
+        return response, StringIO(thoughts)
 
     def process_agent_thoughts(self,captured_output):
         thoughts = captured_output.getvalue()
@@ -58,12 +159,8 @@ class PandasAgent :
             st.write(cleaned_thoughts)
 
     def update_chat_history(self,query, result):
-        st.session_state.chat_history.append(("user", query))
-        st.session_state.chat_history.append(("agent", result))
+        self.chat_history.append("user", query)
+        self.chat_history.append("agent", result)
 
     def display_chat_history(self):
-        for i, (sender, message_text) in enumerate(st.session_state.chat_history):
-            if sender == "user":
-                message(message_text, is_user=True, key=f"{i}_user")
-            else:
-                message(message_text, key=f"{i}")
\ No newline at end of file
+        self.chat_history.render(lambda message_text, is_user, key: message(message_text, is_user=is_user, key=key))
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+SQL backend answering the survey aggregations with an embedded DuckDB database
+
+The survey export is registered as the survey view, read straight from its Parquet or CSV file, and
+each multi-select question as a view of one row per option picked. The counts behind the rating,
+Yes/No, drilldown and multi-select charts are parameterized queries over these views, so DuckDB runs
+them multi-threaded and only reads the columns and row groups they need. CSV exports are parsed again
+by every query, Parquet exports are much faster to query.
+
+The dashboard uses it for exports of at least SURVEY_SQL_MIN_ROWS respondents when SURVEY_SQL_ENGINE
+is duckdb, smaller exports keep the pandas path. DuckDB is an optional dependency: pip install duckdb
+"""
+import os
+import threading
+
+import pandas as pd
+
+from modules.analysis_bundle import FILTER_COLUMNS, LIKERT_COLUMNS
+from modules.count_cube import DIMENSIONS, LIKERT_SCORES
+
+DEFAULT_MIN_ROWS = 100_000
+
+
+def sql_engine():
+    """
+    :return: Name of the SQL engine from SURVEY_SQL_ENGINE, None when the pandas path is used
+    """
+    engine = os.environ.get('SURVEY_SQL_ENGINE', '').lower() or None
+    if engine not in (None, 'duckdb'):
+        raise ValueError(f"Unknown SURVEY_SQL_ENGINE {engine}, the supported engine is duckdb")
+    return engine
+
+
+def sql_min_rows():
+    return int(os.environ.get('SURVEY_SQL_MIN_ROWS', DEFAULT_MIN_ROWS))
+
+
+def _identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+class DuckDbBackend:
+    """
+    Survey queries of one DuckDB database, shared by the sessions of the process. Each query runs
+    on its own cursor, DuckDB connections are not meant to be used by several threads at once
+    """
+
+    def __init__(self, connection):
+        """
+        :param connection: DuckDB connection where the survey view is registered, see from_source and from_frame
+        """
+        self.connection = connection
+        self.columns = [row[0] for row in connection.execute("DESCRIBE survey").fetchall()]
+        self._filters = [_identifier(column) for column in FILTER_COLUMNS]
+        self._option_views = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _connect(threads=None):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("The SQL backend needs DuckDB, install it with pip install duckdb") from e
+        connection = duckdb.connect(database=':memory:')
+        if threads:
+            connection.execute(f"SET threads TO {int(threads)}")
+        return connection
+
+    @classmethod
+    def from_source(cls, source, threads=None):
+        """
+        :param source: Parquet or CSV export of the survey, read by the queries and never loaded whole
+        :param threads: Threads of the queries, one per CPU by default
+        """
+        if source.endswith('.parquet'):
+            reader = f"read_parquet({_literal(source)})"
+        elif source.endswith('.csv'):
+            # Column names as pandas reads them, DuckDB would trim the spaces ending some questions. Without
+            # BOOLEAN among the candidate types, which would turn the Yes/No answers into true/false
+            names = ', '.join(_literal(column) for column in pd.read_csv(source, nrows=0).columns)
+            reader = (f"read_csv({_literal(source)}, header = true, names = [{names}], "
+                      f"auto_type_candidates = ['BIGINT', 'DOUBLE', 'TIMESTAMP', 'VARCHAR'])")
+        else:
+            raise ValueError(f"{source} can't be queried with SQL, only CSV and Parquet exports can")
+        connection = cls._connect(threads)
+        connection.execute(f"CREATE VIEW survey AS SELECT * FROM {reader}")
+        return cls(connection)
+
+    @classmethod
+    def from_frame(cls, data, threads=None):
+        """
+        Backend over a copy of a DataFrame already in memory. The registered frame itself is only
+        visible to the connection registering it, not to the cursors the queries run on
+        """
+        connection = cls._connect(threads)
+        connection.register('survey_frame', data)
+        connection.execute("CREATE TABLE survey AS SELECT * FROM survey_frame")
+        connection.unregister('survey_frame')
+        return cls(connection)
+
+    def _query(self, sql, parameters=()):
+        return self.connection.cursor().execute(sql, list(parameters)).df()
+
+    def _where(self, roles, functions, locations, conditions=()):
+        # Values are parameters, an empty selection of a filter matches every respondent like apply_filters
+        clauses, parameters = list(conditions), []
+        for column, values in zip(self._filters, (roles, functions, locations)):
+            if len(values):
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                parameters.extend(values)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), parameters
+
+    def _column(self, column_index):
+        return _identifier(self.columns[column_index])
+
+    def rows(self):
+        return int(self.connection.cursor().execute("SELECT count(*) FROM survey").fetchone()[0])
+
+    def values(self, dimension):
+        """
+        :return: Sorted values of a filter column, the options of its sidebar filter
+        """
+        column = self._filters[DIMENSIONS.index(dimension)]
+        return self._query(f"SELECT DISTINCT {column} AS value FROM survey WHERE {column} IS NOT NULL "
+                           f"ORDER BY 1")['value'].to_numpy()
+
+    def sample(self, rows, seed=0):
+        """
+        :return: Uniform sample of the respondents, in the order of the export
+        """
+        return self._query(f"SELECT * FROM (SELECT *, row_number() OVER () AS _row FROM survey) "
+                           f"USING SAMPLE reservoir({int(rows)} ROWS) REPEATABLE ({int(seed)}) "
+                           f"ORDER BY _row").drop(columns='_row')
+
+    def respondents(self, roles=(), functions=(), locations=()):
+        where, parameters = self._where(roles, functions, locations)
+        return int(self.connection.cursor().execute(f"SELECT count(*) FROM survey {where}", parameters).fetchone()[0])
+
+    def _answers(self, column_index, counts):
+        # Answers in the order of CountCube: the five scores of a rating, the sorted answers of a choice
+        if column_index in LIKERT_COLUMNS:
+            return counts.reindex(LIKERT_SCORES, fill_value=0)
+        return counts.sort_index()
+
+    def answers(self, column_index, roles=(), functions=(), locations=()):
+        """
+        CountCube.answers of the respondents of the segment
+        """
+        column = self._column(column_index)
+        where, parameters = self._where(roles, functions, locations, [f"{column} IS NOT NULL"])
+        counts = self._query(f"SELECT {column} AS answer, count(*) AS count FROM survey {where} GROUP BY 1",
+                             parameters)
+        return self._answers(column_index, counts.set_index('answer')['count'].astype('int64'))
+
+    def breakdown(self, dimension, column_index=None, answer=None, roles=(), functions=(), locations=()):
+        """
+        CountCube.breakdown of the respondents of the segment
+        """
+        column = self._filters[DIMENSIONS.index(dimension)]
+        conditions, extra = [f"{column} IS NOT NULL"], []
+        if column_index is not None:
+            conditions.append(f"{self._column(column_index)} = ?")
+            extra.append(answer)
+        where, parameters = self._where(roles, functions, locations, conditions)
+        counts = self._query(f"SELECT {column} AS value, count(*) AS count FROM survey {where} "
+                             f"GROUP BY 1 ORDER BY 2 DESC, 1", extra + parameters)
+        return counts.set_index('value')['count'].astype('int64').rename_axis(None).rename(None)
+
+    def drilldown(self, column_index, roles=(), functions=(), locations=()):
+        """
+        CountCube.drilldown of the respondents of the segment, every dimension and answer grouped in one query
+        """
+        column = self._column(column_index)
+        where, parameters = self._where(roles, functions, locations)
+        # Respondents of each value of each filter column, in all and by answer
+        sets = ', '.join(f"({filter_column}), ({filter_column}, {column})" for filter_column in self._filters)
+        dimensions = ', '.join(f"{filter_column} AS {dimension}"
+                               for filter_column, dimension in zip(self._filters, DIMENSIONS))
+        counts = self._query(f"SELECT {dimensions}, {column} AS answer, grouping({column}) AS all_answers, "
+                             f"count(*) AS count FROM survey {where} GROUP BY GROUPING SETS ({sets})", parameters)
+        answers = list(self._answers(column_index, pd.Series(0, index=counts['answer'].dropna().unique())).index)
+        drilldown = {answer: {} for answer in [None] + answers}
+        for dimension in DIMENSIONS:
+            rows = counts[counts[dimension].notna()]
+            groups = {None: rows[rows['all_answers'] == 1]}
+            answered = rows[(rows['all_answers'] == 0) & rows['answer'].notna()]
+            groups.update((answer, group) for answer, group in answered.groupby('answer'))
+            for answer in drilldown:
+                group = groups.get(answer, rows.iloc[:0])
+                breakdown = group.sort_values([dimension]).set_index(dimension)['count'].astype('int64')
+                drilldown[answer][dimension] = breakdown.rename_axis(None).rename(None).sort_values(
+                    ascending=False, kind='stable')
+        return drilldown
+
+    def _options_view(self, column_index):
+        # One row per option picked in a multi-select question, with the filter columns of the respondent
+        view = f"options_{int(column_index)}"
+        with self._lock:
+            if view not in self._option_views:
+                self.connection.execute(
+                    f"CREATE OR REPLACE VIEW {view} AS SELECT {', '.join(self._filters)}, "
+                    f"unnest(string_split(rtrim({self._column(column_index)}, ';'), ';')) AS option "
+                    f"FROM survey WHERE {self._column(column_index)} IS NOT NULL")
+                self._option_views.add(view)
+        return view
+
+    def multiselect_counts(self, column_index, column, roles=(), functions=(), locations=()):
+        """
+        multiselect_counts of the respondents of the segment
+        """
+        where, parameters = self._where(roles, functions, locations)
+        counts = self._query(f"SELECT option, count(*) AS count FROM {self._options_view(column_index)} {where} "
+                             f"GROUP BY 1 ORDER BY 2 DESC, 1", parameters)
+        counts.columns = [column, 'count']
+        counts['count'] = counts['count'].astype('int64')
+        counts['percentage'] = counts['count'] / self.respondents(roles, functions, locations) * 100
+        return counts
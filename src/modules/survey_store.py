@@ -0,0 +1,249 @@
+"""
+Survey store: the successive exports of the survey kept side by side as waves, partitioned by wave in Parquet
+
+Each export is ingested once as a new wave with its id and date. Ingesting a wave writes its own
+partition and counts and updates the catalog, the waves already stored are left untouched. Reads only
+open the partitions of the waves asked for, and the trends across waves are answered from the counts
+of each wave, without reading any respondent.
+
+Layout:
+    waves.json                          catalog: id, date, source, rows and fingerprint of each wave
+    data/wave=<id>/part-0.parquet       typed survey of the wave
+    counts/wave=<id>/respondents.parquet  respondents of each role, function and location
+    counts/wave=<id>/answers.parquet      and of each answer to the rating and single choice questions
+
+The dashboard reads the store when SURVEY_STORE_PATH points to it, waves are added with python -m modules.ingest_wave
+"""
+import os
+import json
+import shutil
+import datetime
+import tempfile
+import threading
+
+import pandas as pd
+
+from modules.analysis_bundle import FILTER_COLUMNS, LIKERT_COLUMNS, CHOICE_COLUMNS
+from modules.count_cube import CountCube, median_of_counts
+
+CATALOG = "waves.json"
+WAVE_COLUMN = "wave"
+# Bumped when the layout of the store changes, older stores have to be ingested again
+STORE_FORMAT_VERSION = 1
+
+
+class StoreError(Exception):
+    pass
+
+
+def wave_counts(data):
+    """
+    :return: Tuple of (respondents, answers) as CountCube.from_counts takes them
+    """
+    respondents = data.groupby(FILTER_COLUMNS, dropna=False).size()
+    answers = {position: data.groupby(FILTER_COLUMNS + [data.columns[position]], dropna=False).size()
+               for position in LIKERT_COLUMNS + CHOICE_COLUMNS}
+    return respondents, answers
+
+
+def _valid_wave_id(wave_id):
+    wave_id = str(wave_id)
+    if not wave_id or not all(c.isalnum() or c in '-_.' for c in wave_id) or wave_id.startswith('.'):
+        raise StoreError(f"Invalid wave id {wave_id!r}, use letters, digits, '-', '_' and '.' e.g. 2026Q3")
+    return wave_id
+
+
+class SurveyStore:
+    """
+    Waves of one survey store. The counts of each wave are read once and kept, the catalog is read
+    again whenever another process ingested a wave
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._catalog = None
+        self._catalog_mtime = None
+        self._cubes = {}
+        self._lock = threading.Lock()
+
+    def _partition(self, kind, wave_id):
+        return os.path.join(self.path, kind, f"{WAVE_COLUMN}={wave_id}")
+
+    ############ CATALOG ############
+
+    @property
+    def catalog(self):
+        path = os.path.join(self.path, CATALOG)
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        with self._lock:
+            if self._catalog is None or mtime != self._catalog_mtime:
+                catalog = {"format_version": STORE_FORMAT_VERSION, "waves": {}}
+                if mtime is not None:
+                    with open(path) as f:
+                        catalog = json.load(f)
+                if catalog.get("format_version") != STORE_FORMAT_VERSION:
+                    raise StoreError(f"The store at {self.path} has format {catalog.get('format_version')} instead "
+                                     f"of {STORE_FORMAT_VERSION}, ingest its waves again")
+                self._catalog, self._catalog_mtime = catalog, mtime
+            return self._catalog
+
+    def _write_catalog(self, catalog):
+        # Written next to the catalog and renamed over it, readers never see a half-written catalog
+        fd, temporary = tempfile.mkstemp(prefix=".waves-", suffix=".json", dir=self.path)
+        with os.fdopen(fd, "w") as f:
+            json.dump(catalog, f, indent=2)
+        os.replace(temporary, os.path.join(self.path, CATALOG))
+
+    def waves(self):
+        """
+        :return: Catalog entries of the waves, oldest first
+        """
+        return sorted(self.catalog["waves"].values(), key=lambda wave: (wave["date"], wave["wave_id"]))
+
+    def wave_ids(self):
+        return [wave["wave_id"] for wave in self.waves()]
+
+    def latest(self):
+        wave_ids = self.wave_ids()
+        return wave_ids[-1] if wave_ids else None
+
+    def wave(self, wave_id):
+        if wave_id not in self.catalog["waves"]:
+            raise StoreError(f"The store at {self.path} has no wave {wave_id}, it has {', '.join(self.wave_ids())}")
+        return self.catalog["waves"][wave_id]
+
+    ############ INGEST ############
+
+    def ingest(self, data, wave_id, date, source=None, fingerprint=None):
+        """
+        Adds the export of a wave, or replaces it when the wave was already ingested
+        :param data: Typed survey of the wave
+        :param date: Date the wave closed, orders the waves
+        :return: Catalog entry of the wave
+        """
+        wave_id = _valid_wave_id(wave_id)
+        os.makedirs(self.path, exist_ok=True)
+        data = data.reset_index(drop=True)
+        respondents, answers = wave_counts(data)
+        respondents = respondents.rename('count').reset_index()
+        # Answers as text so the ratings and the choices share a column, read back as numbers for the ratings
+        answers = pd.concat([counts.rename_axis(FILTER_COLUMNS + ['answer']).rename('count').reset_index()
+                             .assign(question=position) for position, counts in answers.items()], ignore_index=True)
+        answers['answer'] = answers['answer'].astype(str).where(answers['answer'].notna())
+        staging = tempfile.mkdtemp(prefix=f".wave-{wave_id}-", dir=self.path)
+        try:
+            # The partitions are written apart and moved into the store once complete
+            for kind, frames in (("data", {"part-0": data}),
+                                 ("counts", {"respondents": respondents, "answers": answers})):
+                os.makedirs(os.path.join(staging, kind))
+                for name, frame in frames.items():
+                    frame.to_parquet(os.path.join(staging, kind, f"{name}.parquet"), index=False)
+                _swap(os.path.join(staging, kind), self._partition(kind, wave_id))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        entry = {
+            "wave_id": wave_id,
+            "date": pd.Timestamp(date).date().isoformat(),
+            "source": source,
+            "source_fingerprint": fingerprint,
+            "rows": len(data),
+            "ingested": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="microseconds"),
+        }
+        catalog = self.catalog
+        catalog = {**catalog, "waves": {**catalog["waves"], wave_id: entry}}
+        self._write_catalog(catalog)
+        return entry
+
+    ############ QUERIES ############
+
+    def load(self, wave_ids=None, columns=None):
+        """
+        Respondents of some waves, only the partitions of these waves are read
+        :param wave_ids: Waves to read, all of them when None
+        :param columns: Columns to read, all of them when None
+        :return: DataFrame of the respondents of the waves in date order, with their wave in a last wave column
+        """
+        wave_ids = self.wave_ids() if wave_ids is None else [self.wave(wave_id)["wave_id"] for wave_id in wave_ids]
+        wave_ids = [wave_id for wave_id in self.wave_ids() if wave_id in wave_ids]
+        # Read one partition at a time, a wave may have gained or lost columns since the previous one
+        frames = [self.load_wave(wave_id, columns).assign(**{WAVE_COLUMN: wave_id}) for wave_id in wave_ids]
+        if not frames:
+            raise StoreError(f"The store at {self.path} has no waves, add one with python -m modules.ingest_wave")
+        return pd.concat(frames, ignore_index=True)
+
+    def load_wave(self, wave_id, columns=None):
+        """
+        :return: Typed survey of one wave, as it was ingested
+        """
+        self.wave(wave_id)
+        return pd.read_parquet(os.path.join(self._partition("data", wave_id), "part-0.parquet"), columns=columns)
+
+    def cube(self, wave_id):
+        """
+        :return: CountCube of the wave, built from its stored counts the first time it is asked for
+        """
+        ingested = self.wave(wave_id)["ingested"]
+        with self._lock:
+            cached = self._cubes.get(wave_id)
+        if cached is not None and cached[0] == ingested:
+            return cached[1]
+        counts = self._partition("counts", wave_id)
+        respondents = pd.read_parquet(os.path.join(counts, "respondents.parquet"))
+        respondents = respondents.set_index(FILTER_COLUMNS)['count']
+        answers = {}
+        for position, rows in pd.read_parquet(os.path.join(counts, "answers.parquet")).groupby('question', sort=False):
+            if position in LIKERT_COLUMNS:
+                rows = rows.assign(answer=pd.to_numeric(rows['answer']))
+            answers[position] = rows.set_index(FILTER_COLUMNS + ['answer'])['count']
+        cube = CountCube.from_counts(respondents, answers)
+        with self._lock:
+            self._cubes[wave_id] = (ingested, cube)
+        return cube
+
+    def trend(self, column_index, roles=(), functions=(), locations=(), wave_ids=None):
+        """
+        Answers to a rating or single choice question in each wave, for the respondents of a segment
+        :return: DataFrame of one row per wave and answer: wave, date, respondents of the wave, answer,
+                 count and percentage of the respondents who answered
+        """
+        rows = []
+        for wave in self.waves():
+            if wave_ids is not None and wave["wave_id"] not in wave_ids:
+                continue
+            cube = self.cube(wave["wave_id"])
+            respondents = cube.respondents(roles, functions, locations)
+            counts = cube.answers(column_index, roles, functions, locations)
+            total = counts.sum()
+            for answer, count in counts.items():
+                rows.append((wave["wave_id"], wave["date"], respondents, answer, int(count),
+                             count / total * 100 if total else 0.0))
+        return pd.DataFrame(rows, columns=[WAVE_COLUMN, 'date', 'respondents', 'answer', 'count', 'percentage'])
+
+    def score_trend(self, column_index, roles=(), functions=(), locations=(), wave_ids=None):
+        """
+        Median, mean and share of scores 4 and 5 of a rating question in each wave, for the respondents of a segment
+        """
+        rows = []
+        for (wave_id, date, respondents), counts in self.trend(column_index, roles, functions, locations,
+                                                               wave_ids).groupby([WAVE_COLUMN, 'date', 'respondents'],
+                                                                                 sort=False):
+            scores = counts.set_index('answer')['count']
+            answered = scores.sum()
+            mean = (scores * scores.index).sum() / answered if answered else float('nan')
+            satisfied = scores[scores.index >= 4].sum() / answered * 100 if answered else float('nan')
+            rows.append((wave_id, date, respondents, answered, median_of_counts(scores), mean, satisfied))
+        return pd.DataFrame(rows, columns=[WAVE_COLUMN, 'date', 'respondents', 'answered', 'median', 'mean',
+                                           'satisfied'])
+
+
+def _swap(staging, output):
+    # The previous partition of a wave ingested again is moved aside before the new one takes its place
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    previous = None
+    if os.path.exists(output):
+        previous = f"{staging}.previous"
+        os.rename(output, previous)
+    os.rename(staging, output)
+    if previous is not None:
+        shutil.rmtree(previous)
@@ -0,0 +1,486 @@
+"""
+Synthetic Voice of Customer survey for benchmarks
+
+Reproduces the 73 columns of the survey workbook, in the order the pages index them with iloc:
+the role, function and location filters, semicolon separated multi-selects, 1 to 5 ratings,
+Yes/No questions, campaign dates and free text comments. Answers are drawn per respondent from
+a latent satisfaction, so the ratings, the reasons given for them and the tone of the comments
+agree with each other, and follow-up questions are only answered when the question they depend
+on calls for it, like in the real survey.
+
+Respondents are generated in chunks, so millions of rows can be written to CSV or Parquet
+without holding them all in memory.
+
+Usage:
+    python -m modules.synthetic_survey --rows 1000000 --output data/synthetic_1m.parquet
+    python -m modules.synthetic_survey --rows 10000 --output data/synthetic_10k.xlsx
+"""
+import os
+import zlib
+import random
+import argparse
+
+import numpy as np
+import pandas as pd
+
+NBSP = "\xa0"
+EXCEL_MAX_ROWS = 1_048_575
+
+ROLES = {"Employee": 0.34, "Manager": 0.2, "Trainee": 0.1, "Head of Department": 0.1, "Local Director": 0.08,
+         "Head of Business Unit": 0.07, "Global Director": 0.06, "Vice President": 0.05}
+FUNCTIONS = {"Operations": 0.18, "Sales & Marketing": 0.14, "Finance & Accounting": 0.1, "Human Resources": 0.1,
+             "Customer Service Support": 0.1, "R&D": 0.09, "IT": 0.09, "Payroll & Time-Tracking": 0.05,
+             "Legal & Compliance": 0.05, "Procurement & Vendor Management": 0.05, "Transformation": 0.05}
+LOCATIONS = {"Europe": 0.32, "North America": 0.24, "Asia": 0.2, "South America": 0.12, "Africa": 0.07,
+             "Oceania": 0.05}
+HR_PROCESSES = {"Absences": 0.5, "Admin": 0.4, "Performance": 0.35, "Compensation": 0.25, "Payroll": 0.25,
+                "Talent" + NBSP: 0.15, "Recruiting": 0.15, "Onboading": 0.12, "Mobility": 0.08}
+
+POSITIVE_WORDS = ["intuitive", "efficient", "fast", "complete", "helpful", "modern", "reliable", "user-friendly",
+                  "empowering", "responsive", "clear", "accessible"]
+NEGATIVE_WORDS = ["complex", "slow", "not intuitive", "outdated", "confusing", "rigid", "useless", "time-consuming",
+                  "fragmented", "not very intuitive", "incomplete", "frustrating"]
+
+# Comment templates of each free text question, by tone of the rating they explain
+TEXT_TEMPLATES = {
+    "communication": {
+        "positive": [
+            "They are clear and accessible. Whether it's through {channel} or {channel2}, I always feel informed "
+            "about important HR matters that affect me.",
+            "Updates about {topic} are shared on time through {channel}, which helps me stay up-to-date.",
+            "I like that {channel} gives a single place to find information about {topic}.",
+        ],
+        "negative": [
+            "Updates are often communicated sporadically or inconsistently, which makes it difficult to stay "
+            "informed about {topic}.",
+            "There is no centralized platform, information about {topic} is scattered between {channel} and "
+            "{channel2}.",
+            "I usually learn about changes to {topic} from colleagues before HR communicates on {channel}.",
+        ],
+    },
+    "performance": {
+        "positive": [
+            "The process provides me with clear expectations and constructive feedback on my {aspect}.",
+            "I find the process effective because it allows open discussions with my manager about my {aspect}.",
+            "It allows me to assess my {aspect} and set relevant objectives for the year.",
+        ],
+        "negative": [
+            "The evaluation happens once a year and feedback on my {aspect} comes too late to be useful.",
+            "Objectives are not followed up and the review of my {aspect} feels like a formality.",
+            "The process is too long and the forms do not reflect my {aspect}.",
+        ],
+    },
+    "career": {
+        "negative": ["Lacks action plan", "Overly critical", "No time allocated to discuss {aspect}",
+                     "My manager does not know the career paths available in {function}"],
+    },
+    "learning": {
+        "neutral": [
+            "Would like to have more {format} options.",
+            "Offer a variety of learning formats such as {format} and {format2}.",
+            "Personalized learning paths based on my role in {function} and my career goals.",
+            "Shorter {format} sessions that fit in a working day.",
+        ],
+    },
+    "compensation_data": {
+        "neutral": ["{data}", "{data} and {data2}", "none", "i don't know", "Market benchmarking data ; {data}"],
+    },
+    "payroll_features": {
+        "neutral": ["{feature}", "{feature}, {feature2}", "the fact that it covers {feature} made us choose it"],
+    },
+    "time_missing": {
+        "neutral": ["{feature}", "{feature} and {feature2}", "better {feature}"],
+    },
+    "valuable": {
+        "neutral": ["{activity}", "{activity} and {activity2}", "{activity}, {activity2}, communication"],
+    },
+    "fail": {
+        "neutral": ["{gap}", "{gap} and {gap2}", "not intuitive to {activity}", "lack of customization for {gap}"],
+    },
+}
+
+TEXT_SLOTS = {
+    "channel": ["email updates", "company-wide meetings", "the intranet", "the HR portal", "team meetings",
+                "the newsletter", "the mobile app"],
+    "topic": ["benefits", "payroll", "policies", "trainings", "the compensation campaign", "absences",
+              "organizational changes", "the performance review"],
+    "aspect": ["work", "performance", "development", "objectives", "growth", "career goals"],
+    "function": list(FUNCTIONS),
+    "format": ["coaching", "e-learning", "micro-learning", "on site", "mentorship", "workshops", "seminars"],
+    "data": ["salary progression", "history from the previous years", "external benchmark",
+             "performance details", "compa-ratio", "peer comparison"],
+    "feature": ["security", "integration with our HRIS", "legal updates", "strong reporting capabilities",
+                "self-service for employees", "shift scheduling", "mass entries"],
+    "activity": ["take paid leaves", "access to trainings", "performance reviews", "time management",
+                 "following my team's day-to-day activity", "payroll activities", "resource management"],
+    "gap": ["performance / career development planning", "time management", "attendance", "my needs",
+            "administrative / personal information", "training and development", "compensation & bonus processes"],
+}
+
+
+def _render_pool(templates, size, rng):
+    """
+    Distinct comments rendered from the templates, the respondents then draw from this pool
+    """
+    pool = []
+    for i in range(size):
+        template = templates[i % len(templates)]
+        values = {}
+        for slot, options in TEXT_SLOTS.items():
+            first, second = rng.sample(options, 2)
+            values[slot] = first
+            values[f"{slot}2"] = second
+        pool.append(template.format(**values))
+    return np.array(pool, dtype=object)
+
+
+class SurveyGenerator:
+    """
+    Draws synthetic respondents with the column layout of the survey workbook
+    """
+
+    def __init__(self, seed=0, start="2024-02-20", days=28, text_pool_size=500):
+        """
+        :param seed: Seed of every random draw, the same seed gives the same survey
+        :param start: First day of the survey
+        :param days: Number of days the survey is open
+        :param text_pool_size: Number of distinct comments per question and tone
+        """
+        self.seed = seed
+        self.start = pd.Timestamp(start)
+        self.days = days
+        text_rng = random.Random(seed)
+        self.text_pools = {
+            question: {tone: _render_pool(templates, text_pool_size, text_rng) for tone, templates in tones.items()}
+            for question, tones in TEXT_TEMPLATES.items()
+        }
+        self._multi_tables = {}
+
+    # Draws of the different kinds of answers
+
+    @staticmethod
+    def _choice(rng, options, rows):
+        labels = list(options)
+        weights = np.array(list(options.values()), dtype=float)
+        return np.array(labels, dtype=object)[rng.choice(len(labels), rows, p=weights / weights.sum())]
+
+    @staticmethod
+    def _rating(rng, latent, rows, mean=3.5, spread=1.0, weight=0.8):
+        # Ordered rating around a shared latent satisfaction plus an answer specific noise
+        score = mean + weight * latent + rng.normal(0, spread, rows)
+        return np.clip(np.rint(score), 1, 5).astype(np.int64)
+
+    @staticmethod
+    def _yes_no(rng, latent, rows, p_yes, weight=0.0, labels=("Yes", "No")):
+        p = 1 / (1 + np.exp(-(np.log(p_yes / (1 - p_yes)) + weight * latent)))
+        return np.where(rng.random(rows) < p, labels[0], labels[1]).astype(object)
+
+    def _multi_select(self, rng, options, rows, exclusive=None, shift=None):
+        """
+        Semicolon separated answers, each option chosen with its own probability, at least one per respondent.
+        shift is a per respondent factor making every option more likely
+        """
+        labels = list(options)
+        p = np.array(list(options.values()))
+        if shift is not None:
+            p = np.clip(p[None, :] * shift[:, None], 0, 0.95)
+        chosen = rng.random((rows, len(labels))) < p
+        empty = ~chosen.any(axis=1)
+        chosen[empty, rng.integers(0, len(labels), empty.sum())] = True
+        codes = chosen.astype(np.int64) @ (1 << np.arange(len(labels)))
+        if exclusive is not None:
+            # Respondents answering "None" answer nothing else
+            codes = np.where(rng.random(rows) < exclusive[1], -1, codes)
+        table = self._multi_table(tuple(labels), exclusive[0] if exclusive else None)
+        return table[codes]
+
+    def _multi_table(self, labels, exclusive):
+        # Text of every combination of options, indexed by its bit mask, the last entry being the exclusive answer
+        key = (labels, exclusive)
+        if key not in self._multi_tables:
+            order_rng = random.Random(zlib.crc32(repr(key).encode("utf-8")) ^ self.seed)
+            table = []
+            for code in range(1 << len(labels)):
+                picked = [label for i, label in enumerate(labels) if code >> i & 1]
+                order_rng.shuffle(picked)
+                table.append("".join(f"{label};" for label in picked) if picked else None)
+            table.append(f"{exclusive};" if exclusive else None)
+            self._multi_tables[key] = np.array(table, dtype=object)
+        return self._multi_tables[key]
+
+    def _text(self, rng, question, tone, rows):
+        pool = self.text_pools[question][tone]
+        return pool[rng.integers(0, len(pool), rows)]
+
+    def _tone_text(self, rng, question, scores):
+        positive = self._text(rng, question, "positive", len(scores))
+        negative = self._text(rng, question, "negative", len(scores))
+        return np.where(scores >= 4, positive, negative)
+
+    @staticmethod
+    def _only(answers, answered):
+        # Follow-up questions are left empty for the respondents they do not apply to
+        if answers.dtype == object:
+            return np.where(answered, answers, None)
+        return np.where(answered, answers.astype(float), np.nan)
+
+    def chunk(self, start_id, rows, chunk_index=0):
+        """
+        :return: DataFrame of rows respondents with ids from start_id
+        """
+        rng = np.random.default_rng([self.seed, chunk_index])
+        latent = rng.normal(0, 1, rows)
+        columns = {}
+
+        started = self.start + pd.to_timedelta(rng.uniform(0, self.days * 86400, rows), unit="s")
+        columns["ID"] = np.arange(start_id, start_id + rows, dtype=np.int64)
+        columns["Start time"] = started.floor("s")
+        columns["Completion time"] = (started + pd.to_timedelta(rng.lognormal(6, 0.5, rows), unit="s")).floor("s")
+        columns["Email"] = np.full(rows, "anonymous", dtype=object)
+        columns["Name"] = np.full(rows, np.nan)
+        columns["Last modified time"] = np.full(rows, np.nan)
+        columns["What is your role at the company ?"] = self._choice(rng, ROLES, rows)
+        function = self._choice(rng, FUNCTIONS, rows)
+        columns["What function are you part of ?"] = function
+        columns["Where are you located ?"] = self._choice(rng, LOCATIONS, rows)
+        columns["What HR processes do you interact with the most in your day-to-day work ?"] = self._multi_select(
+            rng, HR_PROCESSES, rows, exclusive=("None", 0.03))
+        columns["In what areas do you think HR could improve its capabilities to enhance how they deliver services "
+                "and support you ?"] = self._multi_select(
+            rng, HR_PROCESSES, rows, exclusive=("None", 0.05), shift=np.exp(-0.4 * latent))
+
+        overall = self._rating(rng, latent, rows)
+        columns["From 1 to 5, how satisfied are you with the overall HR services and support provided by the "
+                "company?" + NBSP] = overall
+        columns["How do you access HR Information ?"] = self._multi_select(
+            rng, {"Computer": 0.85, "Mobile": 0.45, "Tablet": 0.1}, rows)
+        communication = self._rating(rng, latent, rows, mean=3.4)
+        columns["From 1 to 5, how satisfied are you with the communication channels used to relay important HR "
+                "information to employees?"] = communication
+        columns["Which reason(s) drive that score ?"] = self._tone_text(rng, "communication", communication)
+        columns["Do you find the HR department responsive to your inquiries and concerns?" + NBSP] = self._yes_no(
+            rng, latent, rows, 0.65, weight=1.0)
+        newcomer = rng.random(rows) < 0.3
+        columns["How long have you been part of the company ?"] = np.where(
+            newcomer, "Less than a year", "More than a year").astype(object)
+
+        # Recruiting and onboarding are only asked to the employees who joined during the year
+        recruiting = self._rating(rng, latent, rows, mean=3.4)
+        columns["How would rate the recruiting process ?"] = self._only(recruiting, newcomer)
+        columns["What reason(s) drive that score ?"] = self._only(self._multi_select(
+            rng, {"Globally too long": 0.7, "Bad communication": 0.45, "Lack of feedback": 0.35,
+                  "Not Intuitive": 0.2, "Globally too short": 0.05}, rows), newcomer & (recruiting <= 3))
+        columns["What reason(s) drive that score ?2"] = self._only(self._multi_select(
+            rng, {"Good communication": 0.7, "Intuitive": 0.45, "Good length": 0.4, "Enough feedback": 0.3,
+                  "Great transparency": 0.15}, rows), newcomer & (recruiting >= 4))
+        columns["What aspect of the recruiting process took the most time and requires improvements ?"] = self._only(
+            self._multi_select(rng, {"Filling my information (contact, resume, ...)": 0.55, "Technical interview": 0.3,
+                                     "Phone interview": 0.3, "Personality tests": 0.25}, rows), newcomer)
+        onboarding = self._rating(rng, latent, rows, mean=3.6)
+        columns["From 1 to 5, how would you rate the onboarding process ?"] = self._only(onboarding, newcomer)
+        columns["What reason(s) drive that score ?3"] = self._only(self._multi_select(
+            rng, {"Too long": 0.55, "Difficult paperwork": 0.45, "Lack of / too long training": 0.3,
+                  "Lack of information": 0.3, "Too short": 0.1}, rows), newcomer & (onboarding <= 3))
+        columns["What reason(s) drive that score ?4"] = self._only(self._multi_select(
+            rng, {"Good level of information": 0.6, "Digitalized paperwork": 0.5, "Good Length": 0.45,
+                  "Great training": 0.3}, rows), newcomer & (onboarding >= 4))
+        onboarding_parts = {"Orientation & training": 0.55, "Access to work materials & applications": 0.4,
+                            "Paperwork": 0.25, "Setting objectives": 0.25}
+        columns["What part of the Onboarding process was particulary helpful ?"] = self._only(
+            self._multi_select(rng, onboarding_parts, rows), newcomer)
+        columns["What part of the Onboarding process could be improved ?"] = self._only(
+            self._multi_select(rng, onboarding_parts, rows, exclusive=("nothing", 0.1)), newcomer)
+
+        performance = self._rating(rng, latent, rows, mean=3.3)
+        columns["From 1 to 5, how satisfied are you with the company's performance evaluation and feedback process "
+                "?"] = performance
+        columns["Which reason(s) drive that score ?2"] = self._tone_text(rng, "performance", performance)
+        comfort = self._rating(rng, latent, rows, mean=3.9, weight=0.6)
+        columns["From 1 to 5, how comfortable do you feel discussing your career goals and development with your "
+                "manager?" + NBSP] = comfort
+        columns["Which reason drive that score ?"] = self._only(
+            self._text(rng, "career", "negative", rows), comfort <= 3)
+        columns["Are you able to identify and tag your skills within your HRIS" + NBSP + "?"] = self._yes_no(
+            rng, latent, rows, 0.4, weight=0.5)
+
+        # Learning questions follow the participation in a training
+        trained = rng.random(rows) < 0.55
+        columns["From 1 to 5, how satisfied are you with your current learning management system ?"] = self._only(
+            self._rating(rng, latent, rows, mean=3.5), trained)
+        columns["What are the learning format that you prefer ?"] = self._only(self._choice(
+            rng, {"E-Learning": 0.35, "On site": 0.25, "Coaching": 0.25, "Micro-Learning": 0.15}, rows), trained)
+        columns["Have you participated in any training or development programs provided by HR?"] = np.where(
+            trained, "Yes", "No").astype(object)
+        columns["Have you received any recommendations on training (either by the HR team or directly on your "
+                "Learning System) ?"] = self._yes_no(rng, latent, rows, 0.45, weight=0.5)
+        columns["What could be improved or what kind of format is missing today ?"] = self._only(
+            self._text(rng, "learning", "neutral", rows), trained)
+
+        # Compensation and bonus questions are only asked to the participants of the campaigns
+        compensation = rng.random(rows) < 0.65
+        columns["Do you participate in the Compensation Campaign ?"] = np.where(
+            compensation, "Yes", "No").astype(object)
+        columns["Do you think that the data available in the Compensation form enables you to make a fair decision "
+                "regarding a promotion, a bonus or a raise ? (e.g : compa-ratio, variation between years, "
+                "historica..."] = self._only(self._choice(
+                    rng, {"Yes": 0.45, "No": 0.35, "Not concerned": 0.2}, rows), compensation)
+        columns["What data is missing according to you ?"] = self._only(
+            self._text(rng, "compensation_data", "neutral", rows), compensation)
+        columns["Do you manage/launch your compensation campaigns nationally or in another way?\n"] = self._only(
+            self._choice(rng, {"National Campaign": 0.45, "Regional Campaign": 0.25, "International Campaign": 0.2,
+                               "Not concernced": 0.1}, rows), compensation)
+        columns["How would you rate the overall satisfaction regarding the compensation campaign ?\n\n"] = self._only(
+            self._rating(rng, latent, rows, mean=3.2), compensation)
+        campaign_start = (pd.Timestamp("2023-11-01")
+                          + pd.to_timedelta(rng.integers(0, 6, rows) * 30 + rng.integers(0, 2, rows) * 4, unit="D"))
+        campaign_end = campaign_start + pd.to_timedelta(rng.integers(30, 120, rows), unit="D")
+        columns["When does your compensation campaign starts ?"] = campaign_start.where(compensation)
+        columns["When does your compensation campaign ends ? (new salary is effective)"] = campaign_end.where(
+            compensation)
+        columns["Do you have retroactivity on salary payments ? (e.g. New salary announced in March but payed from "
+                "January)"] = self._only(self._choice(
+                    rng, {"Yes": 0.4, "No": 0.45, "I don't have the answer": 0.15}, rows), compensation)
+        bonus = compensation & (rng.random(rows) < 0.75)
+        columns["Do you participate in the variable pay/bonus campaign ?"] = self._only(
+            np.where(bonus, "Yes", "No").astype(object), compensation)
+        columns["How would you rate the overall satisfaction regarding the Variable Pay/Bonus campaign" + NBSP
+                + " ?\n"] = self._only(self._rating(rng, latent, rows, mean=3.2), bonus)
+        columns["Do you manage/launch your bonus/variable pay campaigns nationally or in another way?\n"] = self._only(
+            self._choice(rng, {"National Campaign": 0.45, "Regional Campaign": 0.25, "International Campaign": 0.2,
+                               "Not concerned": 0.1}, rows), bonus)
+        columns["Are the dates of your Variable Pay campaign different from the one for the Compensation Campaign "
+                "?"] = self._only(self._yes_no(rng, latent, rows, 0.4), bonus)
+
+        # Payroll and time management questions are only asked to the members of these teams
+        payroll = (function == "Payroll & Time-Tracking") | (rng.random(rows) < 0.08)
+        columns["Are you part of the payroll team ?"] = np.where(payroll, "Yes", "No").astype(object)
+        columns["How satisfied are you with your current payroll system ?"] = self._only(
+            self._rating(rng, latent, rows, mean=3.8), payroll)
+        columns["Do you realize your payroll activities internally or is it outsourced ?"] = self._only(
+            self._choice(rng, {"Internal": 0.7, "Outsourced": 0.3}, rows), payroll)
+        columns["Does your system cover legal updates ?"] = self._only(self._yes_no(rng, latent, rows, 0.8), payroll)
+        columns["Are you autonomous when it comes to updating simple data, or do you systematically rely on outside "
+                "firms for updates?"] = self._only(self._choice(
+                    rng, {"Autonomous": 0.6, "Outsourced": 0.4}, rows), payroll)
+        columns["Can you share any specific features of your current system that you like/that made you choose it?"] = (
+            self._only(self._text(rng, "payroll_features", "neutral", rows), payroll))
+        columns["If your payroll system is used in several countries, do you have a global platform for "
+                "consolidating all your employees' country data?"] = self._only(
+                    self._yes_no(rng, latent, rows, 0.5), payroll)
+        columns["If so, does this platform automatically generate KPIs relating to your payroll (M/F headcount, "
+                "salaries paid, contributions paid, etc.)?"] = self._only(
+                    self._yes_no(rng, latent, rows, 0.55, labels=("Yes", "Not concerned")), payroll)
+        columns["Can mass entries be made in the tool?"] = self._only(self._yes_no(rng, latent, rows, 0.8), payroll)
+        columns["Is your payroll connected with your time management system ?"] = self._only(
+            self._yes_no(rng, latent, rows, 0.5), payroll)
+        columns["Is your payroll connected with a CORE HR/Administrative solution ?"] = self._only(
+            self._yes_no(rng, latent, rows, 0.75), payroll)
+        time_team = (function == "Payroll & Time-Tracking") | (rng.random(rows) < 0.08)
+        columns["Are you part of the Time Management Team ?"] = np.where(time_team, "Yes", "No").astype(object)
+        columns["Do you currently have a time management system ?"] = self._only(
+            self._yes_no(rng, latent, rows, 0.9), time_team)
+        columns["How satisfied are you with your current time management system ?"] = self._only(
+            self._rating(rng, latent, rows, mean=3.6), time_team)
+        for question, p_yes in [
+                ("Do you have a self-service for your employees ?", 0.6),
+                ("Does the system allow employees to view their vacation counters (entitlement / taken / balance)?",
+                 0.75),
+                ("Does your system cover all the shift scheduling functions you need?", 0.4),
+                ("Do you have the capability to run all the report needed ?", 0.45)]:
+            columns[question] = self._only(self._yes_no(rng, latent, rows, p_yes, weight=0.5), time_team)
+        columns["According to you, what functionalities are missing from your current system ?"] = self._only(
+            self._text(rng, "time_missing", "neutral", rows), time_team)
+        columns["Does the system allow employees to take their own leave, with workflow validation by their manager "
+                "or HR?"] = self._only(self._yes_no(rng, latent, rows, 0.65), time_team)
+        columns["Does your system automatically take retroactive items into account (e.g. application to April "
+                "payroll of a salary increase with an effective date of January 1)?"] = self._only(
+                    self._yes_no(rng, latent, rows, 0.45), time_team)
+
+        columns["In the context of your job, what are the most valuable activities your current HRIS enable you to "
+                "do?"] = self._text(rng, "valuable", "neutral", rows)
+        columns["In the context of your job, what do your current HRIS fail to address?"] = self._only(
+            self._text(rng, "fail", "neutral", rows), rng.random(rows) > 0.05)
+        columns["Do you consider the time you spend on your HRIS to be time well spent?"] = self._yes_no(
+            rng, latent, rows, 0.55, weight=1.0)
+        columns["In 3 words, how would you describe your current user-experience with the HRIS" + NBSP + "?"] = (
+            self._three_words(rng, latent, rows))
+
+        data = pd.DataFrame(columns)
+        assert data.shape[1] == 73, "The synthetic survey must keep the 73 columns of the workbook"
+        return data
+
+    def _three_words(self, rng, latent, rows):
+        # Each word is positive or negative depending on the satisfaction of the respondent
+        positive = rng.random((rows, 3)) < 1 / (1 + np.exp(-1.5 * latent))[:, None]
+        words = np.where(positive,
+                         np.array(POSITIVE_WORDS, dtype=object)[rng.integers(0, len(POSITIVE_WORDS), (rows, 3))],
+                         np.array(NEGATIVE_WORDS, dtype=object)[rng.integers(0, len(NEGATIVE_WORDS), (rows, 3))])
+        return words[:, 0] + ", " + words[:, 1] + ", " + words[:, 2]
+
+    def chunks(self, rows, chunk_rows=250_000):
+        """
+        Yields the survey in DataFrames of at most chunk_rows respondents
+        """
+        for index, start in enumerate(range(0, rows, chunk_rows)):
+            yield self.chunk(start + 1, min(chunk_rows, rows - start), index)
+
+
+def make_survey(rows, seed=0, chunk_rows=250_000):
+    """
+    Synthetic survey of rows respondents in a single DataFrame
+    """
+    return pd.concat(SurveyGenerator(seed).chunks(rows, chunk_rows), ignore_index=True)
+
+
+def write_survey(path, rows, seed=0, chunk_rows=250_000):
+    """
+    Writes a synthetic survey to an .xlsx, .csv, .parquet or .feather file, chunk by chunk for CSV and Parquet
+    """
+    generator = SurveyGenerator(seed)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        for i, chunk in enumerate(generator.chunks(rows, chunk_rows)):
+            chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    elif extension == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in generator.chunks(rows, chunk_rows):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    # A follow-up question nobody answered in the first chunk is typed as text rather than null
+                    schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                        for field in table.schema])
+                    writer = pq.ParquetWriter(path, schema)
+                # Conditional columns may be empty in a chunk, cast to the schema of the first one
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+    elif extension == ".xlsx":
+        if rows > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS} rows, write {rows} rows as CSV or Parquet")
+        make_survey(rows, seed, chunk_rows).to_excel(path, index=False)
+    elif extension == ".feather":
+        make_survey(rows, seed, chunk_rows).to_feather(path)
+    else:
+        raise ValueError(f"Unsupported output format {extension}, use .xlsx, .csv, .parquet or .feather")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=250_000)
+    parser.add_argument("--output", required=True, help="File to write, the format follows its extension")
+    args = parser.parse_args()
+    write_survey(args.output, args.rows, args.seed, args.chunk_rows)
+    print(f"Wrote {args.rows} respondents to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import re
+from collections import Counter
+
+import numpy as np
+from wordcloud import STOPWORDS
+
+_TOKEN = re.compile(r"[a-z][a-z'-]+")
+
+
+class TopicClusterer:
+    """
+    Clusters free-text answers into topics with TF-IDF vectors and spherical k-means,
+    and describes each topic by the terms weighing most in its centroid
+    """
+
+    def __init__(self, topics=8, max_terms=2000, min_count=2, sample_size=5000, iterations=25, top_terms=6,
+                 seed=42, stopwords=STOPWORDS):
+        """
+        :param topics: Number of clusters, fewer when there are fewer distinct answers
+        :param max_terms: Size of the vocabulary, the most frequent terms are kept
+        :param min_count: Number of distinct answers a term must appear in to be part of the vocabulary
+        :param sample_size: Distinct answers the centroids are fitted on, the others are only assigned
+        :param iterations: Maximum number of k-means iterations
+        :param top_terms: Number of terms describing each topic
+        """
+        self.topics = topics
+        self.max_terms = max_terms
+        self.min_count = min_count
+        self.sample_size = sample_size
+        self.iterations = iterations
+        self.top_terms = top_terms
+        self.seed = seed
+        self.stopwords = {word.lower() for word in stopwords}
+
+    def tokens(self, text):
+        return [token for token in _TOKEN.findall(text.lower()) if token not in self.stopwords]
+
+    def _vectors(self, documents, vocabulary, idf):
+        # Rows of L2 normalized TF-IDF weights, computed in batches by the callers to bound memory
+        matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+        for row, tokens in enumerate(documents):
+            for token, count in Counter(tokens).items():
+                column = vocabulary.get(token)
+                if column is not None:
+                    matrix[row, column] = count
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def fit(self, texts, batch_size=5000):
+        """
+        :param texts: Iterable of answers, missing and empty answers get no topic
+        :return: Tuple of (array with the topic of each answer or -1, list of the terms of each topic)
+        """
+        texts = ["" if not isinstance(text, str) else text for text in texts]
+        # Identical answers are vectorized once
+        unique, inverse = np.unique(texts, return_inverse=True)
+        documents = [self.tokens(text) for text in unique]
+
+        document_counts = Counter(token for tokens in documents for token in set(tokens))
+        terms = [term for term, count in document_counts.most_common(self.max_terms) if count >= self.min_count]
+        if not terms:
+            return np.full(len(texts), -1), []
+        vocabulary = {term: i for i, term in enumerate(terms)}
+        idf = np.log((1 + len(documents)) / (1 + np.array([document_counts[term] for term in terms]))) + 1
+        idf = idf.astype(np.float32)
+
+        rng = np.random.default_rng(self.seed)
+        candidates = np.array([i for i, tokens in enumerate(documents) if any(t in vocabulary for t in tokens)])
+        if len(candidates) == 0:
+            return np.full(len(texts), -1), []
+        sample = candidates if len(candidates) <= self.sample_size else \
+            rng.choice(candidates, self.sample_size, replace=False)
+        vectors = self._vectors([documents[i] for i in sample], vocabulary, idf)
+        k = min(self.topics, len(sample))
+        centroids = vectors[rng.choice(len(sample), k, replace=False)]
+
+        assignment = None
+        for _ in range(self.iterations):
+            similarity = vectors @ centroids.T
+            new_assignment = similarity.argmax(axis=1)
+            if assignment is not None and np.array_equal(assignment, new_assignment):
+                break
+            assignment = new_assignment
+            for topic in range(k):
+                members = vectors[assignment == topic]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                else:
+                    # Restart an empty topic from the answer its centroid describes worst
+                    centroid = vectors[similarity.max(axis=1).argmin()]
+                centroids[topic] = centroid / (np.linalg.norm(centroid) or 1)
+
+        labels = np.full(len(unique), -1)
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start:start + batch_size]
+            labels[batch] = (self._vectors([documents[i] for i in batch], vocabulary, idf) @ centroids.T).argmax(axis=1)
+        descriptions = [[terms[i] for i in np.argsort(centroid)[::-1][:self.top_terms] if centroid[i] > 0]
+                        for centroid in centroids]
+        return labels[inverse], descriptions
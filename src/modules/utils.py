@@ -1,10 +1,31 @@
 import os
-import pandas as pd
 import streamlit as st
-import pdfplumber
 
 from modules.chatbot import Chatbot
 from modules.embedder import Embedder
+from modules.embedding_cache import EmbeddingCache, embedding_model_id
+from modules.pdf_extractor import PdfExtractor
+from modules.csv_ingest import CsvIngestor
+
+# Number of PDF pages rendered in the upload preview
+PDF_PREVIEW_PAGES = 5
+
+
+@st.cache_resource
+def get_embedding_cache():
+    # Shared by every session so a document embedded once is reused by everyone
+    return EmbeddingCache()
+
+
+@st.cache_resource
+def get_pdf_extractor():
+    return PdfExtractor()
+
+
+@st.cache_resource
+def get_csv_ingestor():
+    return CsvIngestor()
+
 
 class Utilities:
 
@@ -45,17 +66,19 @@ class Utilities:
 
             def show_csv_file(uploaded_file):
                 file_container = st.expander("Your CSV file :")
-                uploaded_file.seek(0)
-                shows = pd.read_csv(uploaded_file)
-                file_container.write(shows)
+                # Only the head and the column statistics are sent to the browser, the table stays in Parquet
+                _, head, stats = get_csv_ingestor().ingest(uploaded_file)
+                file_container.write(head)
+                file_container.write(stats)
 
             def show_pdf_file(uploaded_file):
                 file_container = st.expander("Your PDF file :")
-                with pdfplumber.open(uploaded_file) as pdf:
-                    pdf_text = ""
-                    for page in pdf.pages:
-                        pdf_text += page.extract_text() + "\n\n"
-                file_container.write(pdf_text)
+                uploaded_file.seek(0)
+                # Stream the first pages into the preview as soon as they are parsed
+                pages = get_pdf_extractor().iter_pages(uploaded_file.read(), max_pages=PDF_PREVIEW_PAGES)
+                for page_number, page_text in pages:
+                    file_container.write(page_text)
+                file_container.caption(f"Preview limited to the first {PDF_PREVIEW_PAGES} pages")
             
             def show_txt_file(uploaded_file):
                 file_container = st.expander("Your TXT file:")
@@ -69,9 +92,9 @@ class Utilities:
             file_extension = get_file_extension(uploaded_file.name)
 
             # Show the contents of the file based on its extension
-            #if file_extension == ".csv" :
-            #    show_csv_file(uploaded_file)
-            if file_extension== ".pdf" : 
+            if file_extension == ".csv" :
+                show_csv_file(uploaded_file)
+            elif file_extension== ".pdf" : 
                 show_pdf_file(uploaded_file)
             elif file_extension== ".txt" : 
                 show_txt_file(uploaded_file)
@@ -82,18 +105,31 @@ class Utilities:
         #print(uploaded_file)
         return uploaded_file
 
+    @staticmethod
+    def embedding_document(file, file_name):
+        """
+        Returns the content and the name of the document given to the embedder. The text of a PDF comes from
+        the page extractor, parsed in parallel and shared with the preview, and is embedded as a text file
+        """
+        if os.path.splitext(file_name)[1].lower() != ".pdf":
+            return file, file_name
+        return get_pdf_extractor().extract_text(file).encode("utf-8"), f"{file_name}.txt"
+
     @staticmethod
     def setup_chatbot(uploaded_file, model, temperature):
         """
         Sets up the chatbot with the uploaded file, model, and temperature
         """
-        embeds = Embedder()
-
         with st.spinner("Processing..."):
             uploaded_file.seek(0)
             file = uploaded_file.read()
-            # Get the document embeddings for the uploaded file
-            vectors = embeds.getDocEmbeds(file, uploaded_file.name)
+            # Get the document embeddings for the uploaded file, only embedding documents never seen before
+            # by the model of this embedder
+            embedder = Embedder()
+            vectors = get_embedding_cache().get_or_create(
+                file, lambda: embedder.getDocEmbeds(*Utilities.embedding_document(file, uploaded_file.name)),
+                embedding_model_id(embedder)
+            )
 
             # Create a Chatbot instance with the specified model and temperature
             chatbot = Chatbot(model, temperature,vectors)
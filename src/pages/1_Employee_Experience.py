@@ -0,0 +1,293 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, lazy_block, segment_score_distribution, segment_answer_count,
+    satisfaction_summaries, segment_wordclouds, plotly_chart_cached, build_summary_bar, build_percentage_bar,
+    build_hr_process_chart, build_device_chart, satisfaction_colors
+)
+from modules.profiler import timed
+from modules.nlp_models import load_summarizer, summarize
+
+
+data, filtered_data = setup_page('Section 1: Employee Experience', 'Employee Experience: General HR Services Evaluation')
+
+q6ValuesCount, q6MedianScore = segment_score_distribution(11, filtered=False)
+q11ValuesCount, q11MedianScore = segment_score_distribution(13, filtered=False)
+
+# Question 4: What HR processes do you interact with the most in your day-to-day work ?
+q4_data = pd.DataFrame({
+    'ID': filtered_data['ID'],
+    'HR_Process': filtered_data['What HR processes do you interact with the most in your day-to-day work ?']
+})
+# Remove the last semicolon from each HR_Process value
+q4_data['HR_Process'] = q4_data['HR_Process'].str.rstrip(';')
+# Splitting the HR_Process values into separate lists of processes
+q4_data['HR_Process'] = q4_data['HR_Process'].str.split(';')
+# Explode the lists into separate rows while maintaining the corresponding ID
+q4_processed = q4_data.explode('HR_Process')
+# Reset index to maintain the original ID
+q4_processed.reset_index(drop=True, inplace=True)
+q4_count = q4_processed.groupby('HR_Process').size().reset_index(name='Count')
+
+# Question 5: In what areas do you think HR could improve its capabilities to enhance how they deliver services and support you ?
+q5_data = pd.DataFrame({
+    'ID': filtered_data['ID'],
+    'Improve_Area': filtered_data[
+        'In what areas do you think HR could improve its capabilities to enhance how they deliver services and support you ?']
+})
+# Remove the last semicolon from each value
+q5_data['Improve_Area'] = q5_data['Improve_Area'].str.rstrip(';')
+# Splitting the values into separate lists of processes
+q5_data['Improve_Area'] = q5_data['Improve_Area'].str.split(';')
+# Explode the lists into separate rows while maintaining the corresponding ID
+q5_processed = q5_data.explode('Improve_Area')
+# Reset index to maintain the original ID
+q5_processed.reset_index(drop=True, inplace=True)
+q5_count = q5_processed.groupby('Improve_Area').size().reset_index(name='Count')
+
+# Question 4 and 5 combined
+# Merge the two dataset on function
+# Merge datasets by matching HR_Process and Improve_Area
+q4_q5_count = pd.merge(q4_count, q5_count, left_on='HR_Process', right_on='Improve_Area', how='outer')
+# Drop unnecessary columns
+q4_q5_count.drop(['Improve_Area'], axis=1, inplace=True)
+q4_q5_count.rename(
+    columns={'HR_Process': 'HR Function', 'Count_x': 'HR_Process_Interacted', 'Count_y': 'Improvement_Areas'},
+    inplace=True)
+q4_q5_count.sort_values('HR_Process_Interacted', ascending=False, inplace=True)
+# Separate 'None' row from the DataFrame
+none_row = q4_q5_count[q4_q5_count['HR Function'] == 'None']
+q4_q5_count = q4_q5_count[q4_q5_count['HR Function'] != 'None']
+
+# Sort 'HR_Process_Interacted' in descending order
+q4_q5_count.sort_values(by='HR_Process_Interacted', ascending=True, inplace=True)
+
+# Append 'None' row at the end
+q4_q5_count = pd.concat([none_row, q4_q5_count])
+# Reshape data into tidy format
+df_tidy = q4_q5_count.melt(id_vars='HR Function', var_name='Type', value_name='Count')
+
+# Question 7: How do you access HR Information ?
+q7_data = pd.DataFrame({'device': filtered_data["How do you access HR Information ?"]})
+q7_data['device'] = q7_data['device'].str.rstrip(';').str.split(';')
+q7_data = q7_data.explode('device')
+q7_data.dropna(inplace=True)
+# Count the occurrences of each device
+device_counts = q7_data['device'].value_counts().reset_index()
+device_counts.columns = ['device', 'count']
+# Calculate percentage
+device_counts['percentage'] = device_counts['count'] / device_counts['count'].sum() * 100
+
+st.markdown(
+    """
+    <style>
+    .top-bar {
+        background-color: #f0f2f6;  /* Light grey background */
+        text-align: left;
+        display: flex;
+        justify-content: flex-start;
+        align-items: center;
+        height: auto;
+    }
+    </style>
+    """, unsafe_allow_html=True
+)
+
+# Question 10: Do you find the HR department responsive to your inquiries and concerns?
+q10_responsiveness_count = segment_answer_count(15, 'Yes', filtered=False)
+q10_responsiveness_pct = q10_responsiveness_count / segment_respondents(filtered=False) * 100
+
+highest_hr_process_interacted = q4_q5_count[q4_q5_count['HR Function'] != 'None']['HR_Process_Interacted'].max()
+highest_improvement_areas = q4_q5_count[q4_q5_count['HR Function'] != 'None']['Improvement_Areas'].max()
+most_used_device = device_counts.iloc[0]['device']
+
+# Summary of all outputs in the bar container
+st.markdown(
+    f"""
+        <style>
+        .top-bar {{
+            font-weight: normal;
+            font-size: 17px;
+            padding: 10px 20px;
+            color: #333333;
+            display: block;
+            width: 100%;
+            box-sizing: border-box;
+        }}
+        .top-bar ul, .top-bar li {{
+        font-size: 17px;
+        padding-left: 20px;
+        margin: 0;
+        }}
+        </style>
+        <div class="top-bar">
+        This survey section is answered by all the <strong>{segment_respondents(filtered=False)}</strong> survey participants:
+        <ul>
+            <li>{q10_responsiveness_pct:.0f}% of the respondents, {q10_responsiveness_count} employee(s), find the HR department responsive to their inquiries and concerns.</li>
+            <li>The median satisfaction rating on overall HR services and support is {q6MedianScore}.</li>
+            <li>The median satisfaction rating on the HR communication channels is {q11MedianScore}.</li>
+            <li> Highest Process interacted with {highest_hr_process_interacted}</li>
+            <li> Highest Improvement Area: {highest_improvement_areas}</li>
+            <li> Most Device used: {most_used_device}</li>
+        </ul>
+        </div>
+        """,
+    unsafe_allow_html=True
+)
+
+st.markdown(
+    """
+    <style>
+    .text-container {
+        font-size: 15px;
+        padding: 10px 0px;
+        color: #333333;
+    }
+    </style>
+    """, unsafe_allow_html=True
+)
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q6ValuesCount, q6MedianScore = segment_score_distribution(11)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q6ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Overall Rating on HR Services and Support</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q6MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown1 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown1')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(11, satisfaction_dropdown1)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q11ValuesCount, q11MedianScore = segment_score_distribution(13)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q11ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on HR Communication Channels</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q11MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_dropdown2 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown2')
+
+    location_summary2, role_summary2, function_summary2 = satisfaction_summaries(13, satisfaction_dropdown2)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary2, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary2, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+
+
+# Define colors for each device
+colors = {'Computer': '#440154', 'Mobile': '#5ec962', 'Tablet': '#3b528b'}
+
+# Set up space for two visualizations
+fig_q4_ratio = 0.65
+fig_q7_ratio = 1 - fig_q4_ratio
+q4_col, q7_col = st.columns([fig_q4_ratio, fig_q7_ratio])
+
+with q4_col:
+    # Plot for HR Processes in the first column
+    plotly_chart_cached(build_hr_process_chart, df_tidy, use_container_width=True)
+
+# Plot for Device Usage in the second column
+with q7_col:
+    plotly_chart_cached(build_device_chart, device_counts, use_container_width=True, colors=colors)
+
+# Question 9: Which reason(s) drive that score ?
+# Display the reasons for communication channel satisfaction
+st.markdown('<h1 style="font-size:17px;font-family:Arial;color:#333333;">The Reasons for Ratings on Communication Channels</h1>', unsafe_allow_html=True)
+
+# Example usage
+communication_stopwords = ["communication", "channels", "HR", "information", "important", "informed", "stay", "communicated", "employees", "company", "help", "communicates", "need", "everyone", "makes"]
+
+# Run this code in a Streamlit app
+if __name__ == "__main__" and lazy_block('communication_wordclouds', 'Show word clouds'):
+    st.markdown("<h1 style='text-align: center; font-size: 24px; font-weight: normal;'>Word Cloud Visualization</h1>", unsafe_allow_html=True)
+    segment_wordclouds(filtered_data, 13, 14, communication_stopwords)
+
+
+@timed('summarization')
+def main():
+    st.title("Summarization with Transformers")
+    
+    # Display a message or spinner while the model is loading
+    with st.spinner("Loading summarization model..."):
+        summarizer = load_summarizer()
+    
+    if summarizer:
+        st.write("Successfully loaded the summarizer model.")
+        # Add your Streamlit app content here
+        user_input = st.text_area("Enter text for summarization")
+        if st.button("Summarize"):
+            with st.spinner("Summarizing..."):
+                st.write(summarize(summarizer, user_input))
+    else:
+        st.error("Model could not be loaded. Please check the logs for more details.")
+
+if __name__ == "__main__" and lazy_block('communication_summarization', 'Show summarization'):
+    main()
+
+finish_page()
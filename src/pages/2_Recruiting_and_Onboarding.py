@@ -0,0 +1,262 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, lazy_block, segment_score_distribution, segment_answer_count,
+    segment_multiselect_counts, satisfaction_summaries, plotly_chart_cached, build_summary_bar,
+    build_percentage_bar, build_reason_bar, build_reason_treemap, satisfaction_colors
+)
+
+
+data, filtered_data = setup_page('Section 2: Recruiting & Onboarding', 'Recruiting & Onboarding')
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+### Question11: How long have you been part of the company ?
+q11_data_available_count = segment_answer_count(16, 'Less than a year')
+q11_data_available_pct = q11_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+How long have you been part of the company?
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q11_data_available_pct:.2f}% of the respondents, {q11_data_available_count} employee(s), have been part of the company LESS THAN a year.")
+
+
+### Question12: How would rate the recruiting process ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q12ValuesCount, q12MedianScore = segment_score_distribution(17)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q12ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on the Recruiting Process</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q12MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown1 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown1')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(17, satisfaction_dropdown1)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+    
+    
+### Question13: What reason(s) drive that score ?
+### Part I: negative reasons for recruiting process
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Reasons that drive scores: 1 - Very Dissatisfied / 2 - Dissatisfied / 3 - Neutral 
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+if lazy_block('recruiting_negative_reasons', 'Show negative reasons'):
+    negative_reason_recruiting_counts = segment_multiselect_counts(filtered_data, 18, 'negative_reasons')
+
+    plotly_chart_cached(build_reason_bar, negative_reason_recruiting_counts, category='negative_reasons', color='#FFA500')
+    plotly_chart_cached(build_reason_treemap, negative_reason_recruiting_counts, category='negative_reasons')
+
+### Part II:  positive reasons for recruiting process
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Reasons that drive scores: 4 - Satisfied / 5 - Very Satisfied
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+
+if lazy_block('recruiting_positive_reasons', 'Show positive reasons'):
+    positive_reason_recruiting_counts = segment_multiselect_counts(filtered_data, 19, 'positive_reasons')
+
+    plotly_chart_cached(build_reason_bar, positive_reason_recruiting_counts, category='positive_reasons', color='#519DE9')
+    plotly_chart_cached(build_reason_treemap, positive_reason_recruiting_counts, category='positive_reasons')
+
+
+### Question14: What aspect of the recruiting process took the most time and requires improvements ?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Aspects of the Recruiting Process that Require Improvements
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+
+if lazy_block('recruiting_improvements', 'Show aspects to improve'):
+    aspect_recruiting_counts = segment_multiselect_counts(filtered_data, 20, 'recruting process that required improvement')
+
+    plotly_chart_cached(build_reason_bar, aspect_recruiting_counts, category='recruting process that required improvement', color='#FF7F7F')
+    plotly_chart_cached(build_reason_treemap, aspect_recruiting_counts, category='recruting process that required improvement')
+
+
+### Question15: From 1 to 5, how would you rate the onboarding process ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q15ValuesCount, q15MedianScore = segment_score_distribution(21)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q15ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on the Onboarding Process</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q15MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown15 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown15')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(21, satisfaction_dropdown15)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+
+
+### Question16: What reason(s) drive that score ?
+### Part I: negative reasons for onboarding process
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Reasons that drive scores: 1 - Very Dissatisfied / 2 - Dissatisfied / 3 - Neutral 
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+
+if lazy_block('onboarding_negative_reasons', 'Show negative reasons'):
+    negative_reason_recruiting_counts = segment_multiselect_counts(filtered_data, 22, 'negative_reasons')
+
+    plotly_chart_cached(build_reason_bar, negative_reason_recruiting_counts, category='negative_reasons', color='#FFA500')
+    plotly_chart_cached(build_reason_treemap, negative_reason_recruiting_counts, category='negative_reasons')
+
+
+### Part II:  positive reasons for onboarding process
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Reasons that drive scores: 4 - Satisfied / 5 - Very Satisfied
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+if lazy_block('onboarding_positive_reasons', 'Show positive reasons'):
+    positive_reason_recruiting_counts = segment_multiselect_counts(filtered_data, 23, 'positive_reasons')
+
+    plotly_chart_cached(build_reason_bar, positive_reason_recruiting_counts, category='positive_reasons', color='#519DE9')
+    plotly_chart_cached(build_reason_treemap, positive_reason_recruiting_counts, category='positive_reasons')
+
+
+### Question17: What part of the Onboarding process was particulary helpful ?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Part of the Onboarding process that is Helpful
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+if lazy_block('onboarding_helpful_parts', 'Show helpful parts'):
+    helpful_onboarding_counts = segment_multiselect_counts(filtered_data, 24, 'helpful_onboarding_process')
+
+    plotly_chart_cached(build_reason_bar, helpful_onboarding_counts, category='helpful_onboarding_process', color='#519DE9')
+    plotly_chart_cached(build_reason_treemap, helpful_onboarding_counts, category='helpful_onboarding_process')
+
+
+### Question 18: What part of the Onboarding process could be improved
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Part of the Onboarding Process Could Be Improved
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+if lazy_block('onboarding_improvements', 'Show parts to improve'):
+    # onboarding process to improve
+    aspect_onboarding_counts = segment_multiselect_counts(filtered_data, 25, 'onboarding_process_to_improve')
+
+    plotly_chart_cached(build_reason_bar, aspect_onboarding_counts, category='onboarding_process_to_improve', color='#FF7F7F')
+    plotly_chart_cached(build_reason_treemap, aspect_onboarding_counts, category='onboarding_process_to_improve')
+
+finish_page()
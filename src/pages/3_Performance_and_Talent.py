@@ -0,0 +1,135 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, segment_score_distribution, segment_answer_count,
+    satisfaction_summaries, comfort_summaries, plotly_chart_cached, build_summary_bar, build_percentage_bar,
+    satisfaction_colors, comfort_colors
+)
+
+
+data, filtered_data = setup_page('Section 3: Performance & Talent', 'Performance & Talent')
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+### Question19: From 1 to 5, how satisfied are you with the company's performance evaluation and feedback process ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q19ValuesCount, q19MedianScore = segment_score_distribution(26)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q19ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on Company's Performance Evaluation and Feedback Process</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q19MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown1 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown1')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(26, satisfaction_dropdown1)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+
+
+### Question20: Which reason(s) drive that score ?
+### Missing worcloud
+
+
+### Question21: From 1 to 5, how comfortable do you feel discussing your career goals and development with your manager? 
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Uncomfortable', 'Uncomfortable', 'Hesitant', 'Comfortable', 'Very Comfortable']
+    q21ValuesCount, q21MedianScore = segment_score_distribution(28)
+
+    ratings_df = pd.DataFrame({'Comfort Level': categories, 'Percentage': q21ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Comfort Level in Discussing Career Goals         and Development with Manager</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median comfort score is                   {q21MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Comfort Level', value='Percentage', color_map=comfort_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+with barcharts_col:
+    comfort_options = ['Select a comfort level', 'Very Uncomfortable', 'Uncomfortable', 'Hesitant',
+                            'Comfortable', 'Very Comfortable']
+    comfort_dropdown1 = st.selectbox('', comfort_options,
+                                          key='comfort_dropdown1')
+
+    location_summary1, role_summary1, function_summary1 = comfort_summaries(28, comfort_dropdown1)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+
+
+### Question22: Which reason(s) drive that score ?
+### Missing wordcloud
+
+
+### Question23: Are you able to identify and tag your skills within your HRIS ?
+q23_data_available_count = segment_answer_count(30, 'Yes')
+q23_data_available_pct = q23_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Identify and tag your skills within the HRIS
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q23_data_available_pct:.2f}% of the respondents, {q23_data_available_count} employee(s), are able to identify and tag         their skills within the HRIS.")
+   
+
+finish_page()
@@ -0,0 +1,159 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, segment_score_distribution, segment_answer_count,
+    satisfaction_summaries, plotly_chart_cached, build_summary_bar, build_percentage_bar, satisfaction_colors,
+    learning_format_colors
+)
+
+
+data, filtered_data = setup_page('Section 4: Learning', 'Learning')
+
+    
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+
+### Question24: From 1 to 5, how satisfied are you with your current learning management system ?
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q24ValuesCount, q24MedianScore = segment_score_distribution(31)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q24ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on Current Learning Management System</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q24MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown1 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown1')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(31, satisfaction_dropdown1)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+    
+
+### Question25: What are the learning format that you prefer ?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Preferred Learning Format
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+# Create a DataFrame with the learning format data
+q25_data = pd.DataFrame({'learning_format': filtered_data.iloc[:, 32]})
+q25_data['learning_format'] = q25_data['learning_format'].str.rstrip(';')
+q25_data.dropna(inplace=True)
+
+# Count the occurrences of each learning format
+learning_format_counts = q25_data['learning_format'].value_counts().reset_index()
+learning_format_counts.columns = ['learning_format', 'count']
+
+# Calculate percentage
+learning_format_counts['percentage'] = learning_format_counts['count'] / learning_format_counts['count'].sum() * 100
+
+# Define the preferred order of learning formats
+preferred_order = ['E-Learning', 'On site', 'Micro-Learning', 'Coaching']
+
+# Ensure the DataFrame respects the preferred order
+learning_format_counts['learning_format'] = pd.Categorical(
+    learning_format_counts['learning_format'],
+    categories=preferred_order,
+    ordered=True
+)
+learning_format_counts.sort_values('learning_format', inplace=True)
+
+# Create a horizontal bar chart
+plotly_chart_cached(build_percentage_bar, learning_format_counts, category='learning_format', value='percentage',
+                    color_map=learning_format_colors)
+
+
+### Question26: Have you participated in any training or development programs provided by HR?
+q26_data_available_count = segment_answer_count(33, 'Yes')
+q26_data_available_pct = q26_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Participation in any Training or Development Programs Provided by HR
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q26_data_available_pct:.2f}% of the respondents, {q26_data_available_count} employee(s), participated in training or        development programs provided by HR.")
+
+
+### Question27: Have you received any recommendations on training (either by the HR team or directly on your Learning    System) ?
+q27_data_available_count = segment_answer_count(34, 'Yes')
+q27_data_available_pct = q27_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Recommendations on Training (either by the HR team or directly on Learning System)
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q27_data_available_pct:.2f}% of the respondents, {q27_data_available_count} employee(s), received recommendations on         training.")
+
+
+### Question28: What could be improved or what kind of format is missing today ?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+What could be improved or what kind of format is missing today ?
+</h2>
+""",
+unsafe_allow_html=True
+)
+### Missing wordcloud
+
+finish_page()
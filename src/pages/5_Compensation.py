@@ -0,0 +1,288 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, segment_score_distribution, segment_answer_count,
+    satisfaction_summaries, plotly_chart_cached, build_summary_bar, build_percentage_bar, satisfaction_colors,
+    campaign_colors
+)
+
+
+data, filtered_data = setup_page('Section 5: Compensation', 'Compensation')
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+### Qustion29: Do you participate in the Compensation Campaign ?
+q29_data_available_count = segment_answer_count(36, 'Yes')
+q29_data_available_pct = q29_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Compensation Campaign Participation
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q29_data_available_pct:.2f}% of the respondents, {q29_data_available_count} employee(s), participated in the   compensation campaign.")
+
+### Qustion30: Do you think that the data available in the Compensation form enables you to make a fair decision regarding a promotion, a bonus or a raise ? (e.g : compa-ratio, variation between years, historical data on salary and bonus, …) 
+q30_data_available_count = segment_answer_count(37, 'Yes')
+q30_data_available_pct = q30_data_available_count / q29_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Data availability in the Compensation Form
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who participate the Compensation Campaign, {q30_data_available_pct:.2f}% of the respondents, {q30_data_available_count} employee(s), think that the data available in the Compensation form enables him/her to make a fair decision regarding a promotion, a bonus or a raise.")
+
+### Qustion31: What data is missing according to you ?
+st.markdown(
+    """
+    <h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+    What data is missing according to you ?
+    </h2>
+    """,
+    unsafe_allow_html=True
+)
+
+q38_data_reliable = filtered_data['What data is missing according to you ?'].dropna()
+from wordcloud import WordCloud
+import matplotlib.pyplot as plt
+
+# Replace spaces with underscores
+phrases = q38_data_reliable.str.replace(' ', '_')
+
+# Generate word cloud
+wordcloud = WordCloud(width=1000, height=500).generate(' '.join(phrases))
+
+# An explicit figure rather than the global pyplot one, which concurrent sessions would draw on together
+fig, ax = plt.subplots(figsize=(15, 8))
+ax.imshow(wordcloud)
+ax.axis("off")
+
+# Display the plot in Streamlit
+st.pyplot(fig)
+plt.close(fig)
+
+
+### Question32: Do you manage/launch your compensation campaigns nationally or in another way?
+st.markdown(
+    """
+    <h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+    Compensation Campaigns Management/Launch
+    </h2>
+    """,
+    unsafe_allow_html=True
+)
+
+# Create a DataFrame with the compensation format data
+q32_data = pd.DataFrame({'compensation_manage': filtered_data.iloc[:, 39]})
+q32_data['compensation_manage'] = q32_data['compensation_manage'].str.rstrip(';')
+q32_data.dropna(inplace=True)
+
+# Count the occurrences of each compensation format
+compensation_manage_counts = q32_data['compensation_manage'].value_counts().reset_index()
+compensation_manage_counts.columns = ['compensation_manage', 'count']
+
+# Calculate percentage
+compensation_manage_counts['percentage'] = compensation_manage_counts['count'] / compensation_manage_counts['count'].sum() * 100
+
+# Create a horizontal bar chart
+plotly_chart_cached(build_percentage_bar, compensation_manage_counts, category='compensation_manage', value='percentage',
+                    color_map=campaign_colors)
+
+
+### Question33: How would you rate the overall satisfaction regarding the compensation campaign ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q33ValuesCount, q33MedianScore = segment_score_distribution(40)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q33ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on Compensation Campaign</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q33MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown1 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown1')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(40, satisfaction_dropdown1)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+    
+    
+### Question36: Do you have retroactivity on salary payments ? (e.g. New salary announced in March but payed from January)
+q36_data_available_count = segment_answer_count(43, 'Yes')
+q36_data_available_pct = q36_data_available_count / q29_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Retroactivity on Salary Payments
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who participate the Compensation Campaign, {q36_data_available_pct:.2f}% of the respondents, {q36_data_available_count} employee(s), have retroactivity on salary payments.")
+
+
+### Question37: Do you participate in the variable pay/bonus campaign ?
+q37_data_available_count = segment_answer_count(44, 'Yes')
+q37_data_available_pct = q37_data_available_count / q29_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Participation in Variable Pay/Bonus Campaign 
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who participate the Compensation Campaign, {q37_data_available_pct:.2f}% of the respondents, {q37_data_available_count} employee(s), participated in variable pay/bonus campaign.")
+
+
+### Question38: How would you rate the overall satisfaction regarding the Variable Pay/Bonus campaign  ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q38ValuesCount, q38MedianScore = segment_score_distribution(45)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q38ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on Variable Pay/Bonus Campaign </h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q38MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown38 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown38')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(45, satisfaction_dropdown38)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+    
+    
+### Question39: Do you manage/launch your bonus/variable pay campaigns nationally or in another way?
+st.markdown(
+    """
+    <h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+   Bonus/Variable Pay Campaigns Management/Launch
+    </h2>
+    """,
+    unsafe_allow_html=True
+)
+
+# Create a DataFrame with the compensation format data
+q39_data = pd.DataFrame({'bonus_manage': filtered_data.iloc[:, 46]})
+q39_data['bonus_manage'] = q39_data['bonus_manage'].str.rstrip(';')
+q39_data.dropna(inplace=True)
+
+# Count the occurrences of each compensation format
+bonus_manage_counts = q39_data['bonus_manage'].value_counts().reset_index()
+bonus_manage_counts.columns = ['bonus_manage', 'count']
+
+# Calculate percentage
+bonus_manage_counts['percentage'] = bonus_manage_counts['count'] / bonus_manage_counts['count'].sum() * 100
+
+# Create a horizontal bar chart
+plotly_chart_cached(build_percentage_bar, bonus_manage_counts, category='bonus_manage', value='percentage',
+                    color_map=campaign_colors)
+
+
+### Question40: Are the dates of your Variable Pay campaign different from the one for the Compensation Campaign ?
+q40_data_available_count = segment_answer_count(47, 'Yes')
+q40_data_available_pct = q40_data_available_count / q29_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Variable Pay Campaign Dates Different from Compensation Campaign Dates
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who participate the Compensation Campaign, {q40_data_available_pct:.2f}% of the respondents, {q40_data_available_count} employee(s), have different dates for the Variable Pay Campaign compared to the Compensation Campaign.")
+
+finish_page()
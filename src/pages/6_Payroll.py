@@ -0,0 +1,237 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, segment_score_distribution, segment_answer_count,
+    satisfaction_summaries, plotly_chart_cached, build_summary_bar, build_percentage_bar, satisfaction_colors
+)
+
+
+data, filtered_data = setup_page('Section 6: Payroll', 'Payroll')
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+
+### Question41: Are you part of the payroll team ?
+q41_data_available_count = segment_answer_count(48, 'Yes')
+q41_data_available_pct = q41_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Payroll Team
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q41_data_available_pct:.2f}% of the respondents, {q41_data_available_count} employee(s), are part of the payroll team.")
+
+
+### Question42: How satisfied are you with your current payroll system ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q42ValuesCount, q42MedianScore = segment_score_distribution(49)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q42ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on Current Payroll System</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q42MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown38 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown38')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(49, satisfaction_dropdown38)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+    
+    
+### Question43: Do you realize your payroll activities internally or is it outsourced ?
+q43_data_available_count = segment_answer_count(50, 'Internal')
+q43_data_available_pct = q43_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Payroll Activities
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q43_data_available_pct:.2f}% of the respondents, {q43_data_available_count} employee(s), realize their payroll activities internally and others realize that it is outsourced.")
+
+
+### Question44: Does your system cover legal updates ?
+q44_data_available_count = segment_answer_count(51, 'Yes')
+q44_data_available_pct = q44_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Legal Updates
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q44_data_available_pct:.2f}% of the respondents, {q44_data_available_count} employee(s), answer that their system covers legal updates.")
+
+
+### Question45: Are you autonomous when it comes to updating simple data, or do you systematically rely on outside firms for updates?
+q45_data_available_count = segment_answer_count(52, 'Autonomous')
+q45_data_available_pct = q45_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Are you autonomous when it comes to updating simple data?
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q45_data_available_pct:.2f}% of the respondents, {q45_data_available_count} employee(s), answer that they are autonomous and others rely on outside firms for updates.")
+
+
+### Question46: Can you share any specific features of your current system that you like/that made you choose it?
+st.markdown(
+    """
+    <h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+    Can you share any specific features of your current system that you like/that made you choose it?
+    </h2>
+    """,
+    unsafe_allow_html=True
+)
+### Missing wordcloud
+
+
+### Question47: If your payroll system is used in several countries, do you have a global platform for consolidating all your employees' country data?
+q47_data_available_count = segment_answer_count(54, 'Yes')
+q47_data_available_pct = q47_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Global Platform for Multiple Countries
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q47_data_available_pct:.2f}% of the respondents, {q47_data_available_count} employee(s), answer that they have a global platform for consolidating all employees' country data.")
+
+
+### Question48: If so, does this platform automatically generate KPIs relating to your payroll (M/F headcount, salaries paid, contributions paid, etc.)?
+q48_data_available_count = segment_answer_count(55, 'Yes')
+q48_data_available_pct = q48_data_available_count / q47_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Global Platform Function: Automatically Generate KPIs
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who have a global platform, {q48_data_available_pct:.2f}% of the respondents, {q48_data_available_count} employee(s), answer that this platform automatically generate KPIs relating to the payroll (M/F headcount, salaries paid, contributions paid, etc.).")
+
+
+### Question49: Can mass entries be made in the tool?
+q49_data_available_count = segment_answer_count(56, 'Yes')
+q49_data_available_pct = q49_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Mass Entries
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q49_data_available_pct:.2f}% of the respondents, {q49_data_available_count} employee(s), answer that they have a global platform for consolidating all employees' country data.")
+
+
+### Question50: Is your payroll connected with your time management system ?
+q50_data_available_count = segment_answer_count(57, 'Yes')
+q50_data_available_pct = q50_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Payroll Connected with Time Management System
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q50_data_available_pct:.2f}% of the respondents, {q50_data_available_count} employee(s), answer that the payroll system is connected with time management system.")
+
+
+### Question51: Is your payroll connected with a CORE HR/Administrative solution ?
+q51_data_available_count = segment_answer_count(58, 'Yes')
+q51_data_available_pct = q51_data_available_count / q41_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Payroll Connected with a CORE HR/Administrative Solution
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the payroll team, {q51_data_available_pct:.2f}% of the respondents, {q51_data_available_count} employee(s), answer that the payroll system is connected with a CORE HR/Administrative solution.")
+
+finish_page()
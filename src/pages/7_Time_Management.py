@@ -0,0 +1,220 @@
+import streamlit as st
+import pandas as pd
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, segment_score_distribution, segment_answer_count,
+    satisfaction_summaries, plotly_chart_cached, build_summary_bar, build_percentage_bar, satisfaction_colors
+)
+
+
+data, filtered_data = setup_page('Section 7: Time Management', 'Time Management')
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+
+### Question52: Are you part of the Time Management Team ?
+q52_data_available_count = segment_answer_count(59, 'Yes')
+q52_data_available_pct = q52_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Time Management Team
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q52_data_available_pct:.2f}% of the respondents, {q52_data_available_count} employee(s), are part of the time management team.")
+
+
+### Question53: Do you currently have a time management system ?
+q53_data_available_count = segment_answer_count(60, 'Yes')
+q53_data_available_pct = q53_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Time Management System
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q53_data_available_pct:.2f}% of the respondents,  {q53_data_available_count} employee(s),  answer that they currently have a time management system.")
+
+
+### Question54: How satisfied are you with your current time management system ?
+satisfaction_ratio = 0.6
+barcharts_ratio = 1 - satisfaction_ratio
+satisfaction_col, barcharts_col = st.columns([satisfaction_ratio, barcharts_ratio])
+
+st.markdown("""
+    <style>
+    .chart-container {
+        padding-top: 20px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+with satisfaction_col:
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    categories = ['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied']
+    q54ValuesCount, q54MedianScore = segment_score_distribution(61)
+
+    ratings_df = pd.DataFrame({'Satisfaction Level': categories, 'Percentage': q54ValuesCount.values})
+
+    # Display title and median score
+    title_html = f"<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>Rating on Current Time Management System</h2>"
+    caption_html = f"<div style='font-size: 15px; font-family: Arial; color: #707070;'>The median satisfaction score is {q54MedianScore:.1f}</div>"
+    st.markdown(title_html, unsafe_allow_html=True)
+    st.markdown(caption_html, unsafe_allow_html=True)
+
+    plotly_chart_cached(build_percentage_bar, ratings_df, use_container_width=True,
+                        category='Satisfaction Level', value='Percentage', color_map=satisfaction_colors)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+with barcharts_col:
+    satisfaction_options = ['Select a satisfaction level', 'Very Dissatisfied', 'Dissatisfied', 'Neutral',
+                            'Satisfied', 'Very Satisfied']
+    satisfaction_dropdown38 = st.selectbox('', satisfaction_options,
+                                          key='satisfaction_dropdown38')
+
+    location_summary1, role_summary1, function_summary1 = satisfaction_summaries(61, satisfaction_dropdown38)
+    left_margin = 150
+    total_height = 310
+    role_chart_height = total_height * 0.45
+    function_chart_height = total_height * 0.55
+
+    plotly_chart_cached(build_summary_bar, role_summary1, use_container_width=True, category='Role',
+                        title="by Role", left_margin=left_margin, height=role_chart_height)
+
+    plotly_chart_cached(build_summary_bar, function_summary1, use_container_width=True, category='Function',
+                        title="by Function", left_margin=left_margin, height=function_chart_height)
+
+
+### Question55: Do you have a self-service for your employees ?
+q55_data_available_count = segment_answer_count(62, 'Yes')
+q55_data_available_pct = q55_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Self-service for the Employees
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q55_data_available_pct:.2f}% of the respondents,  {q55_data_available_count} employee(s),  answer that they have a self-service for their employees.")
+
+
+### Question56: Does the system allow employees to view their vacation counters (entitlement / taken / balance)
+q56_data_available_count = segment_answer_count(63, 'Yes')
+q56_data_available_pct = q56_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+System Function: View Vacation Counters
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q56_data_available_pct:.2f}% of the respondents,  {q56_data_available_count} employee(s),  answer that the system allow employess to view their vacation counters (entitlement / taken / balance).")
+
+
+### Question57: Does your system cover all the shift scheduling functions you need?
+q57_data_available_count = segment_answer_count(64, 'Yes')
+q57_data_available_pct = q57_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+System Function: Cover the Shift Scheduling
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q57_data_available_pct:.2f}% of the respondents,  {q57_data_available_count} employee(s),  answer that the system cover all the shift scheduling functions needed.")
+
+
+### Question58: Do you have the capability to run all the report needed ?
+q58_data_available_count = segment_answer_count(65, 'Yes')
+q58_data_available_pct = q58_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Capability: Run all the reports
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q58_data_available_pct:.2f}% of the respondents,  {q58_data_available_count} employee(s),  answer that they have the capability to run all the reports needed.")
+
+
+### Question59: According to you, what functionalities are missing from your current system ?
+st.markdown(
+    """
+    <h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+    According to you, what functionalities are missing from your current system ?
+    </h2>
+    """,
+    unsafe_allow_html=True
+)
+### Missing wordcloud
+
+
+### Question60: Does the system allow employees to take their own leave, with workflow validation by their manager or HR?
+q60_data_available_count = segment_answer_count(67, 'Yes')
+q60_data_available_pct = q60_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+System Function: Allow Employess to Take Their Own Leave
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q60_data_available_pct:.2f}% of the respondents,  {q60_data_available_count} employee(s),  answer that the system allows employees to take their own leave, with workflow validation by their manager or HR.")
+
+
+### Question61: Does your system automatically take retroactive items into account (e.g. application to April payroll of a salary increase with an effective date of January 1)?
+q61_data_available_count = segment_answer_count(68, 'Yes')
+q61_data_available_pct = q61_data_available_count / q52_data_available_count * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+System Function: Automatically Take Retroactive Items Into Account
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"Among the people who are part of the time management team, {q61_data_available_pct:.2f}% of the respondents,  {q61_data_available_count} employee(s),  answer that the system automatically take retroactive items into account (e.g. application to April payroll of a salary increase with an effective date of January 1).")
+
+finish_page()
@@ -0,0 +1,88 @@
+import streamlit as st
+
+from modules.dashboard import (
+    setup_page, finish_page, segment_respondents, lazy_block, get_survey_context, segment_answer_count
+)
+from modules.nlp_models import EMOTION_COLUMNS, predict_emotions_hybrid
+
+
+data, filtered_data = setup_page('Section 8: User Experience', 'User Experience')
+
+# A text container for filtering instructions
+st.markdown(
+    f"""
+    <div class="text-container" style="font-style: italic;">
+    Filter the data by selecting tags from the sidebar. The charts below will be updated to reflect the&nbsp;
+    <strong>{segment_respondents()}</strong>&nbsp;filtered respondents.
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+
+### Question62: In the context of your job, what are the most valuable activities your current HRIS enable you to do?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+In the context of your job, what are the most valuable activities your current HRIS enable you to do?
+</h2>
+""",
+unsafe_allow_html=True
+)
+### Missing wordcloud,emotion analysis
+
+
+### Question63: In the context of your job, what do your current HRIS fail to address?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+In the context of your job, what do your current HRIS fail to address?
+</h2>
+""",
+unsafe_allow_html=True
+)
+### Missing wordcloud,emotion analysis
+
+
+### Question64: Do you consider the time you spend on your HRIS to be time well spent?
+q64_data_available_count = segment_answer_count(71, 'Yes')
+q64_data_available_pct = q64_data_available_count / segment_respondents() * 100
+
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+Time Spend on HRIS
+</h2>
+""",
+unsafe_allow_html=True
+)
+
+st.write(
+    f"{q64_data_available_pct:.2f}% of the respondents, {q64_data_available_count} employee(s), consider the time you spend on your HRIS to be time well spent.")
+
+
+### Question65: In 3 words, how would you describe your current user-experience with the HRIS ?
+st.markdown(
+"""
+<h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+In 3 words, how would you describe your current user-experience with the HRIS ?
+</h2>
+""",
+unsafe_allow_html=True
+)
+### Missing wordcloud,emotion analysis
+
+
+if lazy_block('user_experience_emotions', 'Run emotion analysis'):
+    bundle = get_survey_context().bundle
+    if bundle is not None and bundle.has('emotions'):
+        # Emotions precomputed offline by python -m modules.precompute
+        df_with_emotions = filtered_data[EMOTION_COLUMNS].join(bundle.read('emotions'))
+    else:
+        # Run the function
+        df_with_emotions = predict_emotions_hybrid(filtered_data[EMOTION_COLUMNS].copy(), EMOTION_COLUMNS)
+
+    # Display the DataFrame with predicted emotions
+    df_with_emotions.head()
+
+finish_page()
@@ -0,0 +1,60 @@
+import streamlit as st
+
+from modules.analysis_bundle import LIKERT_COLUMNS
+from modules.dashboard import (
+    setup_page, finish_page, get_survey_store, segment_score_trend, segment_answer_trend, plotly_chart_cached,
+    build_trend_chart, build_answer_trend, satisfaction_colors
+)
+
+
+data, filtered_data = setup_page('Trends', 'Trends Across Survey Waves')
+
+store = get_survey_store()
+if store is None or len(store.wave_ids()) < 2:
+    st.info("The trends compare the waves of a survey store. Point SURVEY_STORE_PATH to a store holding at least "
+            "two waves, added with python -m modules.ingest_wave")
+else:
+    waves = store.waves()
+    # A text container for filtering instructions
+    st.markdown(
+        f"""
+        <div class="text-container" style="font-style: italic;">
+        Filter the data by selecting tags from the sidebar. The charts below follow the filtered respondents across the&nbsp;
+        <strong>{len(waves)}</strong>&nbsp;waves of the survey, from {waves[0]['date']} to {waves[-1]['date']}.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    question = st.selectbox('Select a rating question', LIKERT_COLUMNS,
+                            format_func=lambda position: data.columns[position].strip(), key='trend_question')
+    trend = segment_score_trend(question)
+
+    respondents_col, satisfied_col = st.columns(2)
+    with respondents_col:
+        plotly_chart_cached(build_trend_chart, trend[['wave', 'date', 'respondents']], use_container_width=True,
+                            value='respondents', title='Respondents', text_format='%{y:.0f}')
+    with satisfied_col:
+        plotly_chart_cached(build_trend_chart, trend[['wave', 'date', 'satisfied']], use_container_width=True,
+                            value='satisfied', title='Share of scores 4 and 5 (%)')
+
+    st.markdown(
+    """
+    <h2 style='font-size: 17px; font-family: Arial; color: #333333;'>
+    Scores in each wave
+    </h2>
+    """,
+    unsafe_allow_html=True
+    )
+    # Scores 1 to 5 in the colors of the satisfaction levels, the question may rate comfort rather than satisfaction
+    score_colors = dict(zip(['1', '2', '3', '4', '5'], satisfaction_colors.values()))
+    answers = segment_answer_trend(question)
+    answers = answers.assign(Score=answers['answer'].astype(int).astype(str))[['wave', 'Score', 'percentage']]
+    plotly_chart_cached(build_answer_trend, answers, use_container_width=True, category='Score',
+                        color_map=score_colors)
+
+    st.dataframe(trend.set_index('wave').rename_axis('Wave').rename(
+        columns={'date': 'Date', 'respondents': 'Respondents', 'answered': 'Answered', 'median': 'Median',
+                 'mean': 'Mean', 'satisfied': 'Scores 4 and 5 (%)'}).round(2), use_container_width=True)
+
+finish_page()
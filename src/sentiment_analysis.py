@@ -1,10 +1,13 @@
 import streamlit as st
 from transformers import pipeline
 
+from modules.metrics import MODEL_LOAD_SECONDS, MODEL_INFERENCE_SECONDS
+
 # Initialize sentiment analysis pipeline
 @st.cache_resource
 def load_pipeline():
-    return pipeline("sentiment-analysis")
+    with MODEL_LOAD_SECONDS.time(model='sentiment'):
+        return pipeline("sentiment-analysis")
 
 sentiment_analyzer = load_pipeline()
 
@@ -16,7 +19,8 @@ text = st.text_area("Enter your text here:")
 
 if st.button("Analyze"):
     if text:
-        results = sentiment_analyzer(text)
+        with MODEL_INFERENCE_SECONDS.time(model='sentiment'):
+            results = sentiment_analyzer(text)
         for result in results:
             st.write(f"Label: {result['label']}, Score: {result['score']:.4f}")
     else:
@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from modules.near_duplicates import NearDuplicateGrouper  # noqa: E402
+
+
+def test_exact_duplicates_are_grouped():
+    grouper = NearDuplicateGrouper()
+    assert grouper.group(["Good communication.", "good   communication", None]) == [0, 0, 2]
+
+
+def test_small_variations_are_grouped():
+    grouper = NearDuplicateGrouper()
+    texts = ["The onboarding process was far too long and quite confusing for new joiners",
+             "The onboarding process was far too long and quite confusing for new joiner"]
+    assert grouper.group(texts) == [0, 0]
+
+
+def test_negated_comments_are_not_grouped():
+    grouper = NearDuplicateGrouper()
+    pairs = [("Not good communication", "Good communication"),
+             ("The process is not helpful", "The process is helpful"),
+             ("I don't like the new HRIS at all", "I like the new HRIS at all"),
+             ("The payroll team never answers my questions", "The payroll team answers my questions")]
+    for negated, plain in pairs:
+        assert grouper.group([negated, plain]) == [0, 1], (negated, plain)
+
+
+def test_negations_are_checked_even_below_the_threshold():
+    grouper = NearDuplicateGrouper(threshold=0.5)
+    assert grouper.group(["The process is not helpful", "The process is helpful"]) == [0, 1]
+
+
+def test_groups_do_not_chain_through_members():
+    # b is close enough to a and to c, but c is not close enough to a, the representative of the group
+    grouper = NearDuplicateGrouper(threshold=0.75)
+    a = "the annual performance review takes far too much time for managers"
+    b = "the annual performance review takes far too much time for managers and staff"
+    c = "the annual performance review takes far too much time for managers and staff alike this year"
+    shingles = [grouper.shingles(grouper.normalize(text)) for text in (a, b, c)]
+
+    def jaccard(x, y):
+        return len(x & y) / len(x | y)
+    assert jaccard(shingles[0], shingles[1]) >= 0.75 and jaccard(shingles[1], shingles[2]) >= 0.75
+    assert jaccard(shingles[0], shingles[2]) < 0.75
+    groups = grouper.group([a, b, c])
+    assert groups[0] == groups[1] == 0 and groups[2] == 2
+
+
+def test_apply_scores_each_group_once():
+    grouper = NearDuplicateGrouper()
+    calls = []
+
+    def score(texts):
+        calls.append(list(texts))
+        return [len(text) for text in texts]
+    results = grouper.apply(["Good communication", "good communication!", "Not good communication"], score)
+    assert calls == [["Good communication", "Not good communication"]]
+    assert results == [18, 18, 22]